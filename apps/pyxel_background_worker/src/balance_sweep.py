@@ -0,0 +1,200 @@
+import csv
+import itertools
+import math
+import os
+import sys
+from abc import ABC, abstractmethod
+from multiprocessing import Pool
+
+try:
+    from .logic import GameLogic, Job, Building, Resource  # pylint: disable=C0413
+except ImportError:
+    from logic import GameLogic, Job, Building, Resource  # pylint: disable=C0413
+
+
+class SweepStatus:
+    CLEAR = "clear"
+    STARVE = "starve"
+    STALL = "stall"
+    TIMEOUT = "timeout"
+
+
+class IJobPolicy(ABC):
+    @abstractmethod
+    def assign(self, game_logic):
+        pass
+
+
+class GreedyJobPolicy(IJobPolicy):
+    """食料を賄える分だけFARMERに割り当て、残りを建設と伐採に回す"""
+
+    def __init__(self):
+        self.game_logic = None
+        self.assign_key = None
+
+    def assign(self, game_logic):
+        while game_logic.add_worker() is not None:
+            pass
+        worker_num = game_logic.get_worker_num()
+        can_build_house = self._can_build(game_logic, Building.HOUSE)
+        assign_key = (
+            worker_num,
+            *(game_logic.get_building_num(b) for b in Building),
+            can_build_house,
+        )
+        # id() は破棄済みのGameLogicと重なりうるので、参照そのものを比べる
+        if game_logic is self.game_logic and assign_key == self.assign_key:
+            return
+        self.game_logic = game_logic
+        self.assign_key = assign_key
+        for i in range(worker_num):
+            game_logic.set_worker_job(i, None, None)
+        capacity = game_logic.BUILDING_CAPACITY
+        farm_capacity = game_logic.get_building_num(Building.FARM) * capacity
+        woodshed_capacity = game_logic.get_building_num(Building.WOODSHED) * capacity
+        farmer_need = math.ceil(worker_num / game_logic.COLLECT_RATE)
+        job_list = [(Job.FARMER, Building.FARM)] * min(farmer_need, farm_capacity)
+        if farmer_need >= farm_capacity:
+            job_list.append((Job.BUILDER, Building.FARM))
+        job_list.append((Job.BUILDER, Building.HOUSE))
+        logger_num = min(worker_num - len(job_list), woodshed_capacity)
+        if logger_num <= 0 and not can_build_house:
+            # BUILDING_CAPACITY が小さいと伐採に回す人が残らず、木材が増えないまま止まる。
+            # 家を建て始められるまでは家の建設枠を伐採に回す
+            job_list[-1] = (Job.LOGGER, Building.WOODSHED)
+        job_list += [(Job.LOGGER, Building.WOODSHED)] * logger_num
+        if logger_num >= woodshed_capacity:
+            job_list.append((Job.BUILDER, Building.WOODSHED))
+        job_list += [(Job.BUILDER, Building.HOUSE)] * (worker_num - len(job_list))
+        for i, (job, place) in enumerate(job_list[:worker_num]):
+            game_logic.set_worker_job(i, job, place)
+
+    @staticmethod
+    def _can_build(game_logic, building):
+        """建設中か、建て始める資源が揃っているか"""
+        if game_logic.get_build_progress(building) > 0:
+            return True
+        return all(
+            game_logic.get_resoruce(resource) >= -cost
+            for resource, cost in game_logic.get_resource_change(
+                Job.BUILDER, building
+            ).items()
+        )
+
+
+def create_game_logic(params):
+    """定数を上書きしたGameLogicのサブクラスからインスタンスを生成する"""
+    logic_cls = type("SweepGameLogic", (GameLogic,), dict(params))
+    return logic_cls()
+
+
+def _get_state(game_logic):
+    return (
+        game_logic.get_worker_num(),
+        *game_logic.resource_map.values(),
+        *game_logic.building_num_map.values(),
+        *game_logic.build_workload_map.values(),
+    )
+
+
+def simulate(
+    params, policy=None, max_turns=5000, rate=GameLogic.BACKGROUND_WORK_PER_TURN
+):
+    policy = GreedyJobPolicy() if policy is None else policy
+    game_logic = create_game_logic(params)
+    status = SweepStatus.TIMEOUT
+    turn = 0
+    while turn < max_turns:
+        if game_logic.is_clear():
+            status = SweepStatus.CLEAR
+            break
+        policy.assign(game_logic)
+        before_state = _get_state(game_logic)
+        game_logic.turn(rate)
+        turn += 1
+        after_state = _get_state(game_logic)
+        if after_state[0] < before_state[0]:
+            status = SweepStatus.STARVE
+            break
+        if after_state == before_state:
+            status = SweepStatus.STALL
+            break
+    return {
+        **params,
+        "status": status,
+        "turns": turn,
+        "workers": game_logic.get_worker_num(),
+        "food": game_logic.get_resoruce(Resource.FOOD),
+        "wood": game_logic.get_resoruce(Resource.WOOD),
+    }
+
+
+def _simulate_task(task):
+    return simulate(*task)
+
+
+def run_sweep(
+    scenarios,
+    policy=None,
+    max_turns=5000,
+    rate=GameLogic.BACKGROUND_WORK_PER_TURN,
+    processes=None,
+):
+    tasks = [(params, policy, max_turns, rate) for params in scenarios]
+    if processes == 1:
+        return [_simulate_task(task) for task in tasks]
+    processes = os.cpu_count() if processes is None else processes
+    chunksize = max(1, len(tasks) // (processes * 4))
+    with Pool(processes) as pool:
+        return pool.map(_simulate_task, tasks, chunksize=chunksize)
+
+
+def make_scenarios(param_grid):
+    """{定数名: 候補値のリスト}の直積からシナリオのリストを生成する"""
+    keys = list(param_grid)
+    return [
+        dict(zip(keys, values))
+        for values in itertools.product(*(param_grid[key] for key in keys))
+    ]
+
+
+def make_cost_map(wood):
+    return {building: {Resource.WOOD: wood} for building in Building}
+
+
+def _format_value(value, separators=(("=", ";"), (":", "/"))):
+    if isinstance(value, dict):
+        (key_sep, item_sep), *inner_separators = separators
+        return item_sep.join(
+            f"{getattr(k, 'name', k)}{key_sep}{_format_value(v, inner_separators)}"
+            for k, v in value.items()
+        )
+    return getattr(value, "name", value)
+
+
+def write_report(results, file):
+    if len(results) == 0:
+        return
+    writer = csv.DictWriter(file, fieldnames=list(results[0]))
+    writer.writeheader()
+    for result in results:
+        writer.writerow({k: _format_value(v) for k, v in result.items()})
+
+
+def main():
+    scenarios = make_scenarios(
+        {
+            # COLLECT_RATE=1 では農民が自分の食料しか賄えず、全員を農民にするしかないため
+            # GreedyJobPolicy は1ターン目で必ず STALL になる。表に載せても情報がないので除く
+            "COLLECT_RATE": [2, 3, 4],
+            "BUILDING_CAPACITY": [2, 3, 4, 5, 6],
+            "BUILDING_BASE_WORKLOAD": [1, 2, 3, 4, 5],
+            "BUILDING_COST_MAP": [make_cost_map(wood) for wood in [3, 5, 8, 13]],
+            "TARGET_NUM": [30, 50, 70],
+        }
+    )
+    write_report(run_sweep(scenarios), sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ import random
 import hashlib
 import base64
 import binascii
+from array import array
 from abc import ABC, abstractmethod
 from enum import Enum
 
@@ -44,6 +45,10 @@ class IView(ABC):
     def clear(self):
         pass
 
+    def draw_image_batch(self, x_array, y_array, width, height, src_tile_list, scale):
+        for x, y, src_tile in zip(x_array, y_array, src_tile_list):
+            self.draw_image(x, y, width, height, *src_tile, scale)
+
     @classmethod
     def create(cls):
         return cls()
@@ -78,6 +83,22 @@ class PyxelView(IView):
             colkey=Color.BACK.value,
         )
 
+    def draw_image_batch(self, x_array, y_array, width, height, src_tile_list, scale):
+        blt = self.pyxel.blt
+        colkey = Color.BACK.value
+        for x, y, (src_tile_x, src_tile_y) in zip(x_array, y_array, src_tile_list):
+            blt(
+                x,
+                y,
+                0,
+                src_tile_x * 8,
+                src_tile_y * 8,
+                width,
+                height,
+                scale=scale,
+                colkey=colkey,
+            )
+
     def clear(self):
         self.pyxel.cls(0)
 
@@ -212,12 +233,14 @@ class WorkingArea(GameObject):
 
     def __init__(self, image_pos, pos, area_width, area_height):
         super().__init__()
-        self.pos_list = []
+        # 描画先の絶対座標をパックして保持する
+        self.x_array = array("h")
+        self.y_array = array("h")
         self.image_pos = image_pos
         self.pos = pos
         self.area_width = area_width
         self.area_height = area_height
-        self.selected_flg_list = []
+        self.selected_flgs = bytearray()
 
     def _get_pos(self):
         x = int(random.random() * self.area_width)
@@ -229,15 +252,14 @@ class WorkingArea(GameObject):
         self.draw_workers()
 
     def draw_workers(self, scale=1):
-        for d, selected_flg in zip(self.pos_list, self.selected_flg_list):
-            image_pos = self.SELECTED_IMAGE_POS if selected_flg else self.image_pos
-            self.view.draw_image(
-                self.pos[0] + d[0],
-                self.pos[1] + d[1],
-                *self.IMAGE_SIZE,
-                *image_pos,
-                scale,
-            )
+        image_pos_list = (self.image_pos, self.SELECTED_IMAGE_POS)
+        self.view.draw_image_batch(
+            self.x_array,
+            self.y_array,
+            *self.IMAGE_SIZE,
+            [image_pos_list[selected_flg] for selected_flg in self.selected_flgs],
+            scale,
+        )
 
     def draw_back(self):
         size = self.get_area_size()
@@ -245,32 +267,35 @@ class WorkingArea(GameObject):
         self.view.draw_rect(*frame_rect, Color.AREA_FRAME, True)
 
     def set_num(self, total, append_pos_list=None):
-        append_num = total - len(self.pos_list)
+        append_num = total - len(self.x_array)
         if append_num < 0:
-            self.pos_list = self.pos_list[:total]
-            self.selected_flg_list = self.selected_flg_list[:total]
+            del self.x_array[total:]
+            del self.y_array[total:]
+            del self.selected_flgs[total:]
         else:
             for i in range(append_num):
                 append_pos = (
                     self._get_pos() if append_pos_list is None else append_pos_list[i]
                 )
-                self.pos_list.append(append_pos)
-                self.selected_flg_list.append(False)
+                self.x_array.append(self.pos[0] + append_pos[0])
+                self.y_array.append(self.pos[1] + append_pos[1])
+            self.selected_flgs.extend(bytes(append_num))
 
     def select(self, x, y, w, h) -> bool:
-        self.selected_flg_list = [
-            (
-                x <= self.pos[0] + pos_x
-                and y <= self.pos[1] + pos_y
-                and x + w >= self.pos[0] + pos_x + self.IMAGE_SIZE[0]
-                and y + h >= self.pos[1] + pos_y + self.IMAGE_SIZE[1]
-            )
-            for pos_x, pos_y in self.pos_list
-        ]
-        return any(self.selected_flg_list)
+        # 矩形に収まるworkerの左上座標の範囲に変換して一括判定する
+        min_x, max_x = x, x + w - self.IMAGE_SIZE[0]
+        min_y, max_y = y, y + h - self.IMAGE_SIZE[1]
+        if min_x > max_x or min_y > max_y:
+            self.selected_flgs = bytearray(len(self.x_array))
+            return False
+        self.selected_flgs = bytearray(
+            min_x <= pos_x <= max_x and min_y <= pos_y <= max_y
+            for pos_x, pos_y in zip(self.x_array, self.y_array)
+        )
+        return 1 in self.selected_flgs
 
     def unselect(self):
-        self.selected_flg_list = [False for _ in self.pos_list]
+        self.selected_flgs = bytearray(len(self.x_array))
 
     def is_click(self, x, y, w, h) -> bool:
         click_point = (x + w, y + h)
@@ -281,7 +306,7 @@ class WorkingArea(GameObject):
         )
 
     def get_selected_num(self) -> int:
-        return sum(1 for selected in self.selected_flg_list if selected)
+        return self.selected_flgs.count(1)
 
     def get_area_size(self):
         return self.area_width, self.area_height
@@ -354,7 +379,7 @@ class NewWorkerArea(WorkingArea):
 
     def draw(self):
         super().draw()
-        color = Color.SELECTED_ADD if all(self.selected_flg_list) else Color.ADD
+        color = Color.SELECTED_ADD if all(self.selected_flgs) else Color.ADD
         self.view.draw_text(14, 11, "+", color)
 
     def draw_workers(self, scale=1):
@@ -0,0 +1,127 @@
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from balance_sweep import (  # pylint: disable=C0413
+    GreedyJobPolicy,
+    IJobPolicy,
+    SweepStatus,
+    create_game_logic,
+    make_cost_map,
+    make_scenarios,
+    run_sweep,
+    simulate,
+    write_report,
+)
+from logic import GameLogic, Job, Building, Resource  # pylint: disable=C0413
+
+
+class NoJobPolicy(IJobPolicy):
+    def assign(self, game_logic):
+        while game_logic.add_worker() is not None:
+            pass
+
+
+class TestBalanceSweep(unittest.TestCase):
+    def test_make_scenarios(self):
+        scenarios = make_scenarios({"COLLECT_RATE": [1, 2], "TARGET_NUM": [5, 6, 7]})
+        self.assertEqual(len(scenarios), 6)
+        self.assertEqual(scenarios[0], {"COLLECT_RATE": 1, "TARGET_NUM": 5})
+        self.assertEqual(scenarios[-1], {"COLLECT_RATE": 2, "TARGET_NUM": 7})
+
+    def test_create_game_logic(self):
+        game_logic = create_game_logic(
+            {"BUILDING_CAPACITY": 6, "TARGET_NUM": 10, "COLLECT_RATE": 3}
+        )
+        self.assertIsInstance(game_logic, GameLogic)
+        self.assertEqual(game_logic.get_target_num(), 10)
+        for _ in range(7):
+            game_logic.add_worker()
+        self.assertEqual(game_logic.get_worker_num(), 6)
+        game_logic.set_worker_job(0, Job.FARMER, Building.FARM)
+        self.assertEqual(
+            game_logic.get_resource_change(Job.FARMER, None), {Resource.FOOD: 3}
+        )
+        self.assertEqual(GameLogic.BUILDING_CAPACITY, 4)
+        self.assertEqual(GameLogic.TARGET_NUM, 50)
+
+    def test_greedy_job_policy(self):
+        game_logic = GameLogic()
+        GreedyJobPolicy().assign(game_logic)
+        self.assertEqual(game_logic.get_worker_num(), 4)
+        self.assertEqual(game_logic.get_worker_num(Job.FARMER), 2)
+        self.assertEqual(game_logic.get_worker_num(Job.BUILDER, Building.HOUSE), 1)
+        self.assertEqual(game_logic.get_worker_num(Job.LOGGER), 1)
+
+    def test_greedy_job_policy_small_capacity(self):
+        """BUILDING_CAPACITY が小さくても伐採に人を回し、木材が揃ったら家を建てる"""
+        game_logic = create_game_logic({"BUILDING_CAPACITY": 2})
+        policy = GreedyJobPolicy()
+        policy.assign(game_logic)
+        self.assertEqual(game_logic.get_worker_num(Job.FARMER), 1)
+        self.assertEqual(game_logic.get_worker_num(Job.LOGGER), 1)
+        game_logic.resource_map[Resource.WOOD] = 5
+        policy.assign(game_logic)
+        self.assertEqual(game_logic.get_worker_num(Job.LOGGER), 0)
+        self.assertEqual(game_logic.get_worker_num(Job.BUILDER, Building.HOUSE), 1)
+        result = simulate({"BUILDING_CAPACITY": 2, "TARGET_NUM": 10})
+        self.assertEqual(result["status"], SweepStatus.CLEAR)
+
+    def test_greedy_job_policy_new_game_logic(self):
+        """同じポリシーを別のGameLogicに使っても割り当てをやり直す"""
+        policy = GreedyJobPolicy()
+        policy.assign(GameLogic())
+        game_logic = GameLogic()
+        policy.assign(game_logic)
+        self.assertEqual(game_logic.get_worker_num(Job.FARMER), 2)
+        scenarios = make_scenarios({"TARGET_NUM": [10, 20], "COLLECT_RATE": [2, 3]})
+        self.assertEqual(
+            [simulate(params, policy) for params in scenarios],
+            [simulate(params) for params in scenarios],
+        )
+
+    def test_simulate(self):
+        test_cases = [
+            ("clear", {"TARGET_NUM": 10}, None, SweepStatus.CLEAR),
+            ("already clear", {"TARGET_NUM": 0}, None, SweepStatus.CLEAR),
+            (
+                "stall",
+                {"COLLECT_RATE": 1, "BUILDING_CAPACITY": 2},
+                None,
+                SweepStatus.STALL,
+            ),
+            ("starve", {"TARGET_NUM": 10}, NoJobPolicy(), SweepStatus.STARVE),
+        ]
+        for case_name, params, policy, expected in test_cases:
+            with self.subTest(case_name=case_name, params=params, expected=expected):
+                result = simulate(params, policy, rate=1)
+                self.assertEqual(result["status"], expected)
+                for key, value in params.items():
+                    self.assertEqual(result[key], value)
+        for rate in [1, GameLogic.BACKGROUND_WORK_PER_TURN]:
+            with self.subTest(rate=rate):
+                result = simulate({"TARGET_NUM": 100}, rate=rate, max_turns=3)
+                self.assertEqual(result["status"], SweepStatus.TIMEOUT)
+                self.assertEqual(result["turns"], 3)
+
+    def test_run_sweep(self):
+        scenarios = make_scenarios({"TARGET_NUM": [5, 10], "COLLECT_RATE": [2, 3]})
+        expected = [simulate(params) for params in scenarios]
+        self.assertEqual(run_sweep(scenarios, processes=1), expected)
+        self.assertEqual(run_sweep(scenarios, processes=2), expected)
+
+    def test_write_report(self):
+        results = [
+            simulate({"BUILDING_COST_MAP": make_cost_map(3), "TARGET_NUM": 10}),
+        ]
+        file = io.StringIO()
+        write_report(results, file)
+        lines = file.getvalue().splitlines()
+        self.assertEqual(
+            lines[0], "BUILDING_COST_MAP,TARGET_NUM,status,turns,workers,food,wood"
+        )
+        self.assertTrue(
+            lines[1].startswith("HOUSE=WOOD:3;FARM=WOOD:3;WOODSHED=WOOD:3,10,clear,")
+        )
@@ -402,6 +402,44 @@ class TestWorkerArea(TestParent):
                 )
                 self.mock_stop()
 
+    def test_select_many(self):
+        test_cases = [
+            ("select all", 300, (0, 0), (300 * 7, 6), 300),
+            ("select range", 300, (7 * 10, 0), (7 * 5 - 2, 6), 5),
+            ("select none by narrow", 300, (0, 0), (4, 6), 0),
+            ("select none by outside", 300, (0, 10), (300 * 7, 6), 0),
+        ]
+        for case_name, num, select_pos_diff, select_size, expected in test_cases:
+            with self.subTest(
+                case_name=case_name,
+                num=num,
+                select_pos_diff=select_pos_diff,
+                select_size=select_size,
+                expected=expected,
+            ):
+                self.reset()
+                working_area = NoJobArea()
+                working_area.set_num(
+                    num, append_pos_list=[(i * 7, 0) for i in range(num)]
+                )
+                select_pos = [
+                    p + d
+                    for p, d in zip(self.AREA_RECT_MAP[NoJobArea][:2], select_pos_diff)
+                ]
+                result = working_area.select(*select_pos, *select_size)
+                self.assertEqual(result, expected > 0)
+                self.assertEqual(working_area.get_selected_num(), expected)
+                working_area.draw_workers()
+                selected_count = sum(
+                    1
+                    for call in self.test_view.get_call_params()
+                    if call[0] == "draw_image" and call[6] == 1
+                )
+                self.assertEqual(selected_count, expected)
+                working_area.unselect()
+                self.assertEqual(working_area.get_selected_num(), 0)
+                self.mock_stop()
+
     def test_is_click(self):
         test_cases = [
             ("click left up", True, (0, 0), (0, 0), NoJobArea),
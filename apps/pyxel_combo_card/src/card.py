@@ -37,9 +37,23 @@ class Card:
     カードはシンボル（Symbol enum）を持つ。
     """
 
+    _interned_cards: dict = {}  # Symbol → 共有インスタンス
+
     def __init__(self, symbol: Symbol) -> None:
         self._symbol = symbol
 
+    @classmethod
+    def of(cls, symbol: Symbol) -> "Card":
+        """シンボルごとに 1 つだけ作る共有インスタンスを返す
+
+        カードは作成後に変化しないため、同じシンボルのカードは使い回せる。
+        """
+        card = cls._interned_cards.get(symbol)
+        if card is None:
+            card = cls(symbol)
+            cls._interned_cards[symbol] = card
+        return card
+
     @property
     def symbol(self) -> Symbol:
         """カードのシンボルを取得"""
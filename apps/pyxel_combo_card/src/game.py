@@ -113,7 +113,7 @@ class Game:
             hand: カードを配布する手札
         """
         symbol = random.choice([Symbol.B1, Symbol.B2, Symbol.B3])
-        hand.add_card(Card(symbol))
+        hand.add_card(Card.of(symbol))
 
     def get_recipe(self) -> list[tuple[list[Card], Card]]:
         """レシピ一覧を取得（source と target のペア）
@@ -228,7 +228,7 @@ class Game:
             bool: 実行可能な場合True、そうでない場合False
         """
         for combo in self.NPC_IDLE_HAND_COMBOS:
-            goal_recipe_cards = [Card(sym) for sym in combo.value[1]]
+            goal_recipe_cards = [Card.of(sym) for sym in combo.value[1]]
             ret = Recipe.can_execute(self.npc_hand.get_cards(), goal_recipe_cards)
             if ret:
                 return True
@@ -18,12 +18,19 @@ class Combo(Enum):
 
 
 class Recipe:
+    # combo_candidates ごとの退化レシピ表（source, target）。
+    # combo_candidates だけで決まるため、タプルにしたものをキーに全インスタンスで共有する
+    _devolved_table_cache: dict = {}
+
     def __init__(
         self,
         combo_candidates: list[list[Combo]] | None = None,
         devolved_flg: bool = True,
     ) -> None:
         self._combo_candidates = combo_candidates
+        self._candidates_key = tuple(
+            tuple(combo_list) for combo_list in combo_candidates or []
+        )
         self._source = []
         self._target = []
         self._devolved_flg = devolved_flg
@@ -47,8 +54,8 @@ class Recipe:
             self._add_combo_recipe(combo)
 
     def _add_devolved_recipe(self, developed_source_set, developed_target_set, i):
-        source_cards = list(random.choice(list(developed_source_set[i])))
-        target_card = random.choice(list(developed_target_set[i]))
+        source_cards = list(random.choice(developed_source_set[i]))
+        target_card = random.choice(developed_target_set[i])
         self._source.append(source_cards)
         self._target.append(target_card)
 
@@ -58,9 +65,40 @@ class Recipe:
     def get_target(self, recipe_id: int) -> Card:
         return self._target[recipe_id]
 
-    def _get_devolved_source_set(self) -> list[set[tuple[Card]]]:
+    def _get_devolved_source_set(self) -> list[tuple[tuple[Card]]]:
+        return self._get_devolved_table()[0]
+
+    def _get_devolved_target_set(self) -> list[tuple[Card]]:
+        return self._get_devolved_table()[1]
+
+    def _get_devolved_table(self) -> tuple:
+        """退化レシピ表を返す。初めての combo_candidates のときだけ作る"""
+        table = self._devolved_table_cache.get(self._candidates_key)
+        if table is None:
+            # 集合から作った順番をそのまま固定するので、乱数の引き方は毎回作り直すときと同じ
+            table = (
+                [
+                    tuple(source_set)
+                    for source_set in self._build_devolved_source_set(
+                        self._combo_candidates
+                    )
+                ],
+                [
+                    tuple(target_set)
+                    for target_set in self._build_devolved_target_set(
+                        self._combo_candidates
+                    )
+                ],
+            )
+            self._devolved_table_cache[self._candidates_key] = table
+        return table
+
+    @staticmethod
+    def _build_devolved_source_set(
+        combo_candidates: list[list[Combo]],
+    ) -> list[set[tuple[Card]]]:
         result = []
-        for combo_list in self._combo_candidates:
+        for combo_list in combo_candidates:
             source_seed_set = {
                 combo.value[0]
                 for combo in combo_list
@@ -75,15 +113,18 @@ class Recipe:
                     ):
                         source_symbol_set.add((source_seed_1, source_seed_2))
             source_set = {
-                tuple(Card(sym) for sym in source_syms)
+                tuple(Card.of(sym) for sym in source_syms)
                 for source_syms in source_symbol_set
             }
             result.append(source_set)
         return result
 
-    def _get_devolved_target_set(self) -> list[set[Card]]:
+    @staticmethod
+    def _build_devolved_target_set(
+        combo_candidates: list[list[Combo]],
+    ) -> list[set[Card]]:
         result = []
-        for combo_list in self._combo_candidates:
+        for combo_list in combo_candidates:
             target_symbols_list = [
                 list(combo.value[1])
                 for combo in combo_list
@@ -92,15 +133,15 @@ class Recipe:
             target_symbols = [
                 item for sublist in target_symbols_list for item in sublist
             ]
-            result.append({Card(sym) for sym in target_symbols})
+            result.append({Card.of(sym) for sym in target_symbols})
         return result
 
     def _add_combo_recipe(self, combo: Combo) -> None:
         """Combo から source と target を生成して追加する（内部ヘルパー関数）"""
         result_symbol, (source1, source2) = combo.value
         # シンボルでCardを作成
-        source_cards = [Card(source1), Card(source2)]
-        target_card = Card(result_symbol)
+        source_cards = [Card.of(source1), Card.of(source2)]
+        target_card = Card.of(result_symbol)
         # self._source と self._target に直接追加
         self._source.append(source_cards)
         self._target.append(target_card)
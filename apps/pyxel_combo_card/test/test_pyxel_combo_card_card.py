@@ -55,3 +55,16 @@ class TestCardHasGoalSymbol(unittest.TestCase):
                     card.has_goal_symbol(),
                     f"{symbol.name}はゴールシンボルではないのでFalseを返すべき"
                 )
+
+
+class TestCardOf(unittest.TestCase):
+    """Card.of()（シンボルごとの共有インスタンス）のテスト"""
+
+    def test_of_returns_shared_instance(self):
+        """同じシンボルなら同じインスタンスを返し、Card(symbol) と等しい"""
+        for symbol in Symbol:
+            with self.subTest(symbol=symbol.name):
+                card = Card.of(symbol)
+                self.assertIs(card, Card.of(symbol))
+                self.assertEqual(card, Card(symbol))
+                self.assertEqual(card.symbol, symbol)
@@ -1,3 +1,4 @@
+import random
 import sys
 import os
 import unittest
@@ -45,8 +46,8 @@ class TestRecipeInitialState(unittest.TestCase):
                 expected_source=expected_source,
                 expected_target=expected_target,
             ):
-                mock_devolved_source_set.return_value = [set() for _ in combo_list]
-                mock_devolved_target_set.return_value = [set() for _ in combo_list]
+                mock_devolved_source_set.return_value = [() for _ in combo_list]
+                mock_devolved_target_set.return_value = [() for _ in combo_list]
                 recipe = Recipe(combo_candidates=combo_list)
                 self.assertEqual(recipe.get_source_list(), expected_source)
                 for recipe_id, target in enumerate(expected_target):
@@ -71,24 +72,24 @@ class TestRecipeInitialState(unittest.TestCase):
             (
                 "only S1",
                 [[Combo.S1]],
-                [{(Card(Symbol.S1), Card(Symbol.S1))}],
-                [{Card(Symbol.B3)}],
+                [((Card(Symbol.S1), Card(Symbol.S1)),)],
+                [(Card(Symbol.B3),)],
                 [[Card(Symbol.S1), Card(Symbol.S1)]],
                 [[Card(Symbol.B3)]],
             ),
             (
                 "only S2",
                 [[Combo.S2]],
-                [{(Card(Symbol.S2), Card(Symbol.S2))}],
-                [{Card(Symbol.B1)}],
+                [((Card(Symbol.S2), Card(Symbol.S2)),)],
+                [(Card(Symbol.B1),)],
                 [[Card(Symbol.S2), Card(Symbol.S2)]],
                 [[Card(Symbol.B1)]],
             ),
             (
                 "only H1 and H2",
                 [[Combo.H1, Combo.H2]],
-                [{(Card(Symbol.H1), Card(Symbol.H1))}],
-                [{Card(Symbol.S1)}],
+                [((Card(Symbol.H1), Card(Symbol.H1)),)],
+                [(Card(Symbol.S1),)],
                 [[Card(Symbol.H1), Card(Symbol.H1)]],
                 [[Card(Symbol.S1)]],
             ),
@@ -96,10 +97,10 @@ class TestRecipeInitialState(unittest.TestCase):
                 "S3 and S4, H3 and H4",
                 [[Combo.S3, Combo.S4], [Combo.H3, Combo.H4]],
                 [
-                    {(Card(Symbol.S3), Card(Symbol.S4))},
-                    {(Card(Symbol.H4), Card(Symbol.H4))},
+                    ((Card(Symbol.S3), Card(Symbol.S4)),),
+                    ((Card(Symbol.H4), Card(Symbol.H4)),),
                 ],
-                [{Card(Symbol.B1)}, {Card(Symbol.S1)}],
+                [(Card(Symbol.B1),), (Card(Symbol.S1),)],
                 [
                     [Card(Symbol.S3), Card(Symbol.S4)],
                     [Card(Symbol.H4), Card(Symbol.H4)],
@@ -134,8 +135,8 @@ class TestRecipeInitialState(unittest.TestCase):
         mock_devolved_source_set,
         mock_devolved_target_set,
     ):
-        mock_devolved_source_set.return_value = [{(Card(Symbol.S1), Card(Symbol.S1))}]
-        mock_devolved_target_set.return_value = [{Card(Symbol.B3)}]
+        mock_devolved_source_set.return_value = [((Card(Symbol.S1), Card(Symbol.S1)),)]
+        mock_devolved_target_set.return_value = [(Card(Symbol.B3),)]
         mock_choice.side_effect = lambda x: x[0]
         test_cases = [
             (
@@ -372,13 +373,13 @@ class TestRecipeFromCombo(unittest.TestCase):
                     tuple(Card(sym) for sym in source_syms)
                     for source_syms in expected_source_list
                 }
-                self.assertSetEqual(source_set[0], expected_source_set)
+                self.assertSetEqual(set(source_set[0]), expected_source_set)
 
                 # 結果カードが正しい Symbol を持つ
                 result_set = recipe._get_devolved_target_set()  # pylint: disable=W0212
                 self.assertEqual(len(result_set), 1)
                 expected_result_set = {Card(sym) for sym in expected_result_list}
-                self.assertSetEqual(result_set[0], expected_result_set)
+                self.assertSetEqual(set(result_set[0]), expected_result_set)
 
     def test_generate_devolved_recipe_with_no_candidates(self):
         # Recipeコンストラクタにcombo_candidatesを渡して生成
@@ -391,3 +392,60 @@ class TestRecipeFromCombo(unittest.TestCase):
         # 結果カードが正しい Symbol を持つ
         result_set = recipe._get_devolved_target_set()  # pylint: disable=W0212
         self.assertEqual(len(result_set), 0)
+
+
+class TestRecipeDevolvedTableCache(unittest.TestCase):
+    CANDIDATES = [
+        [Combo.S1, Combo.S2, Combo.S3, Combo.S4, Combo.S5],
+        [Combo.H1, Combo.H2, Combo.H3, Combo.H4, Combo.G1, Combo.G2],
+    ]
+
+    def test_table_is_built_once(self):
+        """同じ combo_candidates の退化レシピ表は一度だけ作り、インスタンス間で共有する"""
+        Recipe._devolved_table_cache.clear()  # pylint: disable=W0212
+        with patch.object(
+            Recipe,
+            "_build_devolved_source_set",
+            wraps=Recipe._build_devolved_source_set,  # pylint: disable=W0212
+        ) as mock_build:
+            recipe = Recipe(combo_candidates=self.CANDIDATES)
+            for _ in range(10):
+                recipe.shuffle()
+            other = Recipe(combo_candidates=[list(c) for c in self.CANDIDATES])
+            self.assertEqual(mock_build.call_count, 1)
+        self.assertIs(
+            recipe._get_devolved_source_set(),  # pylint: disable=W0212
+            other._get_devolved_source_set(),  # pylint: disable=W0212
+        )
+        Recipe(combo_candidates=[[Combo.S1]])
+        self.assertEqual(len(Recipe._devolved_table_cache), 2)  # pylint: disable=W0212
+
+    def test_shuffle_matches_rebuilt_table(self):
+        """表を使い回しても、毎回作り直したときと同じレシピを引く"""
+
+        def get_recipes(is_rebuild):
+            random.seed(0)
+            recipe = Recipe(combo_candidates=self.CANDIDATES)
+            recipes = []
+            for _ in range(200):
+                if is_rebuild:
+                    Recipe._devolved_table_cache.clear()  # pylint: disable=W0212
+                recipe.shuffle()
+                recipes.append(
+                    [
+                        (source, recipe.get_target(i))
+                        for i, source in enumerate(recipe.get_source_list())
+                    ]
+                )
+            return recipes
+
+        self.assertEqual(get_recipes(True), get_recipes(False))
+
+    def test_cards_are_shared(self):
+        """レシピのカードはシンボルごとの共有インスタンスを使う"""
+        recipe = Recipe(combo_candidates=self.CANDIDATES)
+        for _ in range(20):
+            recipe.shuffle()
+            for i, source in enumerate(recipe.get_source_list()):
+                for card in source + [recipe.get_target(i)]:
+                    self.assertIs(card, Card.of(card.symbol))
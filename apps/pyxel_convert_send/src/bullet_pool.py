@@ -0,0 +1,439 @@
+from array import array
+from collections.abc import MutableMapping
+from itertools import chain
+
+try:
+    from .framework import (
+        Color,
+        Direct,
+        PyxelFieldView,
+    )  # pylint: disable=C0413
+    from .field_nodes import (
+        BulletPlayer,
+        BulletEnemy,
+    )  # pylint: disable=C0413
+except ImportError:
+    from framework import (
+        Color,
+        Direct,
+        PyxelFieldView,
+    )  # pylint: disable=C0413
+    from field_nodes import (
+        BulletPlayer,
+        BulletEnemy,
+    )  # pylint: disable=C0413
+
+
+class BulletPool(MutableMapping):
+    """フィールド上の弾の状態を項目ごとの配列で持つ
+
+    タイル座標をキーにしたdictとして扱え、取り出したBulletは配列の
+    スロットを参照するハンドルになる。毎フレームの移動と衝突判定は
+    配列とタイル単位の占有グリッドだけで行い、弾ごとのオブジェクトは作らない。
+    """
+
+    KIND_LIST = [BulletPlayer, BulletEnemy]
+    IS_ENEMY_LIST = [not issubclass(cls, BulletPlayer) for cls in KIND_LIST]
+    DIRECT_LIST = list(Direct)
+    COLOR_LIST = list(Color)
+    # フィールドの外周1タイル分まで弾が存在できる
+    GRID_WIDTH = PyxelFieldView.FIELD_TILE_WIDTH + 2
+    GRID_HEIGHT = PyxelFieldView.FIELD_TILE_HEIGHT + 2
+    INIT_CAPACITY = 256
+    QUIET_FRAMES_MAX = 1 << 30
+
+    def __init__(self):
+        self.direct_index_map = {d: i for i, d in enumerate(self.DIRECT_LIST)}
+        self.dx_list = [d.value[0] for d in self.DIRECT_LIST]
+        self.dy_list = [d.value[1] for d in self.DIRECT_LIST]
+        self.color_index_map = {c: i for i, c in enumerate(self.COLOR_LIST)}
+        self.kind_index_map = {cls: i for i, cls in enumerate(self.KIND_LIST)}
+        self.size = 0
+        self.capacity = 0
+        self._front = self._back = None
+        self._resize(self.INIT_CAPACITY)
+        grid_size = self.GRID_WIDTH * self.GRID_HEIGHT
+        # キーのタイルにいる弾のスロット
+        self.cell_slot = array("i", [-1] * grid_size)
+        # 以下はupdate中だけ使う作業領域
+        self.blocked = bytearray(grid_size)
+        self.cell_head = array("i", [-1] * grid_size)
+        self.cell_count = array("i", [0] * grid_size)
+        self.cell_removed = array("i", [-1] * grid_size)
+        self.touched = array("i", [0] * grid_size)
+
+    def _new_arrays(self, capacity):
+        return {
+            "x": array("i", bytes(4 * capacity)),
+            "y": array("i", bytes(4 * capacity)),
+            "direct": bytearray(capacity),
+            "color": bytearray(capacity),
+            "kind": bytearray(capacity),
+            "key_cell": array("i", bytes(4 * capacity)),
+            "handle": [None] * capacity,
+        }
+
+    def _resize(self, capacity):
+        front = self._new_arrays(capacity)
+        if self._front is not None:
+            for name, values in self._front.items():
+                front[name][: self.size] = values[: self.size]
+        self._front = front
+        self._back = self._new_arrays(capacity)
+        self.next_slot = array("i", bytes(4 * capacity))
+        self.new_cell = array("i", bytes(4 * capacity))
+        self.capacity = capacity
+        self._bind_front()
+
+    def _bind_front(self):
+        front = self._front
+        self.x = front["x"]
+        self.y = front["y"]
+        self.direct = front["direct"]
+        self.color = front["color"]
+        self.kind = front["kind"]
+        self.key_cell = front["key_cell"]
+        self.handle = front["handle"]
+
+    def _get_cell(self, tile_x, tile_y):
+        if not (
+            -1 <= tile_x < self.GRID_WIDTH - 1 and -1 <= tile_y < self.GRID_HEIGHT - 1
+        ):
+            return -1
+        return (tile_y + 1) * self.GRID_WIDTH + tile_x + 1
+
+    def _get_key(self, cell):
+        return cell % self.GRID_WIDTH - 1, cell // self.GRID_WIDTH - 1
+
+    def _get_slot(self, key):
+        cell = self._get_cell(*key)
+        slot = -1 if cell < 0 else self.cell_slot[cell]
+        if slot < 0:
+            raise KeyError(key)
+        return slot
+
+    # --- Bulletハンドルから使う ---
+
+    def get_direct(self, slot):
+        return self.DIRECT_LIST[self.direct[slot]]
+
+    def set_direct(self, slot, direct):
+        self.direct[slot] = self.direct_index_map[direct]
+
+    def get_color(self, slot):
+        return self.COLOR_LIST[self.color[slot]]
+
+    def set_color(self, slot, color):
+        self.color[slot] = self.color_index_map[color]
+
+    def _write(self, slot, bullet, cell):
+        self.x[slot], self.y[slot] = bullet.get_pos()
+        self.direct[slot] = self.direct_index_map[bullet.direct]
+        self.color[slot] = self.color_index_map[bullet.color]
+        self.kind[slot] = self.kind_index_map[type(bullet)]
+        self.key_cell[slot] = cell
+        bullet.detach()
+        bullet.attach(self, slot)
+        self.handle[slot] = bullet
+
+    def _detach(self, slot):
+        bullet = self.handle[slot]
+        if bullet is not None:
+            bullet.detach()
+            self.handle[slot] = None
+
+    # --- dictとしての操作 ---
+
+    def __getitem__(self, key):
+        return self._get_handle(self._get_slot(key))
+
+    def __setitem__(self, key, bullet):
+        cell = self._get_cell(*key)
+        if cell < 0:
+            raise KeyError(key)
+        slot = self.cell_slot[cell]
+        if slot < 0:
+            if self.size == self.capacity:
+                self._resize(self.capacity * 2)
+            slot = self.size
+            self.size += 1
+            self.cell_slot[cell] = slot
+        else:
+            self._detach(slot)
+        self._write(slot, bullet, cell)
+
+    def __delitem__(self, key):
+        slot = self._get_slot(key)
+        self._detach(slot)
+        self.cell_slot[self.key_cell[slot]] = -1
+        for name, values in self._front.items():
+            values[slot : self.size - 1] = values[slot + 1 : self.size]
+            if name == "handle":
+                values[self.size - 1] = None
+        self.size -= 1
+        for s in range(slot, self.size):
+            self.cell_slot[self.key_cell[s]] = s
+            if self.handle[s] is not None:
+                self.handle[s].attach(self, s)
+
+    def __iter__(self):
+        for slot in range(self.size):
+            yield self._get_key(self.key_cell[slot])
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, key):
+        cell = self._get_cell(*key)
+        return cell >= 0 and self.cell_slot[cell] >= 0
+
+    def clear(self):
+        for slot in range(self.size):
+            self._detach(slot)
+            self.cell_slot[self.key_cell[slot]] = -1
+        self.size = 0
+
+    # --- フレーム処理 ---
+
+    def get_count(self):
+        """(自弾の数, 敵弾の数)を返す"""
+        enemy_num = sum(
+            1 for slot in range(self.size) if self.IS_ENEMY_LIST[self.kind[slot]]
+        )
+        return self.size - enemy_num, enemy_num
+
+    def set_blocked(self, tile_pos_list, is_blocked=True):
+        """弾が入ると消えるタイル(ノードのあるタイル)を設定する"""
+        for tile_pos in tile_pos_list:
+            cell = self._get_cell(*tile_pos)
+            if cell >= 0:
+                self.blocked[cell] = is_blocked
+
+    def move(self, on_blocked):
+        """全弾を1ドット進め、ノードのあるタイルに入った弾でon_blockedを呼ぶ
+
+        on_blockedにはタイル座標とBulletハンドルを渡す。移動前の弾の数を返す。
+        """
+        x, y, direct = self.x, self.y, self.direct
+        dx_list, dy_list = self.dx_list, self.dy_list
+        blocked = self.blocked
+        grid_width = self.GRID_WIDTH
+        size = self.size
+        for slot in range(size):
+            d = direct[slot]
+            slot_x = x[slot] + dx_list[d]
+            slot_y = y[slot] + dy_list[d]
+            x[slot] = slot_x
+            y[slot] = slot_y
+            tile_x, tile_y = slot_x // 8, slot_y // 8
+            if -1 <= tile_x < grid_width - 1 and -1 <= tile_y < self.GRID_HEIGHT - 1:
+                if blocked[(tile_y + 1) * grid_width + tile_x + 1]:
+                    on_blocked((tile_x, tile_y), self._get_handle(slot))
+                    # on_blockedで弾が増えて配列が作り直されることがある
+                    x, y, direct = self.x, self.y, self.direct
+        return size
+
+    def get_quiet_frames(self, routing_table):
+        """どの弾もノードや画面外、他の弾に届かないまま進めるフレーム数
+
+        ノードまでのタイル数はrouting_tableから引く。弾同士がぶつかるのは
+        縦横とも8ドット以内に近づいたフレームだけなので、同じ列を進む弾は
+        隣り合う組を、縦と横に進む弾は全ての組を調べる。
+        """
+        frames = self.QUIET_FRAMES_MAX
+        x, y, direct = self.x, self.y, self.direct
+        line_map = {}
+        cross_list = ([], [])
+        for slot in range(self.size):
+            d = direct[slot]
+            slot_x, slot_y = x[slot], y[slot]
+            tile_x, tile_y = slot_x // 8, slot_y // 8
+            node_pos, distance = routing_table.get_next(
+                (tile_x, tile_y), self.DIRECT_LIST[d]
+            )
+            if self.dx_list[d] != 0:
+                pos, move, tile, line = slot_x, self.dx_list[d], tile_x, (0, tile_y)
+            else:
+                pos, move, tile, line = slot_y, self.dy_list[d], tile_y, (1, tile_x)
+            if move > 0:
+                target = (tile + distance) * 8
+            elif node_pos is None:
+                # 左端・上端はタイル-1の途中(-8)で画面外になる
+                target = -8
+            else:
+                target = (tile - distance) * 8 + 7
+            frames = min(frames, abs(target - pos) - 1)
+            line_map.setdefault(line, []).append((pos, move))
+            cross_list[line[0]].append((slot_x, slot_y, move))
+
+        for line in line_map.values():
+            line.sort()
+            for (pos, move), (next_pos, next_move) in zip(line, line[1:]):
+                gap = next_pos - pos
+                if move == next_move:
+                    if gap <= 8:
+                        return 0
+                elif move > 0:
+                    # 向かい合う弾は1フレームに2ドットずつ近づく
+                    frames = min(frames, (gap - 9) // 2)
+
+        for h_x, h_y, h_move in cross_list[0]:
+            for v_x, v_y, v_move in cross_list[1]:
+                x_start, x_end = self._get_near_range(h_x - v_x, h_move)
+                y_start, y_end = self._get_near_range(v_y - h_y, v_move)
+                start = max(x_start, y_start, 1)
+                if start <= min(x_end, y_end):
+                    frames = min(frames, start - 1)
+        return max(frames, 0)
+
+    @staticmethod
+    def _get_near_range(diff, move):
+        """差がdiffで1フレームにmoveずつ変わるとき、差が8ドット以内になる範囲"""
+        if move > 0:
+            return -8 - diff, 8 - diff
+        return diff - 8, diff + 8
+
+    def advance(self, frame_num):
+        """get_quiet_frames以内のフレーム数をまとめて進め、キーのタイルを移す"""
+        x, y, direct = self.x, self.y, self.direct
+        key_cell, cell_slot = self.key_cell, self.cell_slot
+        for slot in range(self.size):
+            d = direct[slot]
+            x[slot] += self.dx_list[d] * frame_num
+            y[slot] += self.dy_list[d] * frame_num
+            cell_slot[key_cell[slot]] = -1
+        for slot in range(self.size):
+            key_cell[slot] = self._get_cell(x[slot] // 8, y[slot] // 8)
+            cell_slot[key_cell[slot]] = slot
+
+    def _get_handle(self, slot):
+        bullet = self.handle[slot]
+        if bullet is None:
+            bullet = self.KIND_LIST[self.kind[slot]](0, 0, Direct.RIGHT)
+            bullet.attach(self, slot)
+            self.handle[slot] = bullet
+        return bullet
+
+    def append(self, bullet):
+        """move中に生まれた弾を追加する(キーの重複はregenerateで解消する)"""
+        if self.size == self.capacity:
+            self._resize(self.capacity * 2)
+        self._write(self.size, bullet, -1)
+        self.size += 1
+
+    def regenerate(self, old_size):
+        """同じタイルに入った弾同士をぶつけ、タイルごとに1発だけ残す
+
+        0からold_size-1のスロットは前フレームから居た弾で、key_cellは
+        前フレームのタイルを指す。以降のスロットはこのフレームで生まれた弾。
+        """
+        x, y, kind, color = self.x, self.y, self.kind, self.color
+        is_enemy_list = self.IS_ENEMY_LIST
+        blocked = self.blocked
+        head, count, removed = self.cell_head, self.cell_count, self.cell_removed
+        next_slot, new_cell, touched = self.next_slot, self.new_cell, self.touched
+        grid_width = self.GRID_WIDTH
+        max_x = PyxelFieldView.FIELD_WIDTH + 8
+        max_y = PyxelFieldView.FIELD_HEIGHT + 8
+
+        # 新しく生まれた弾、前から居た弾の順にタイルへ振り分ける
+        touched_num = 0
+        for slot in chain(range(old_size, self.size), range(old_size)):
+            slot_x, slot_y = x[slot], y[slot]
+            new_cell[slot] = -1
+            if not (-8 < slot_x < max_x and -8 < slot_y < max_y):
+                continue
+            cell = (slot_y // 8 + 1) * grid_width + slot_x // 8 + 1
+            if blocked[cell]:
+                continue
+            new_cell[slot] = cell
+            if count[cell] == 0:
+                touched[touched_num] = cell
+                touched_num += 1
+                head[cell] = -1
+                removed[cell] = -1
+            next_slot[slot] = head[cell]
+            head[cell] = slot
+            count[cell] += 1
+
+        # 前フレームのタイルに別の弾が入ってきた場合、すれ違いとしてぶつける
+        key_cell = self.key_cell
+        for slot in range(old_size):
+            cell = key_cell[slot]
+            if cell < 0 or count[cell] == 0 or new_cell[slot] == cell:
+                continue
+            is_collied = not is_enemy_list[kind[slot]]
+            target = head[cell]
+            while not is_collied and target >= 0:
+                is_collied = is_enemy_list[kind[target]] or color[target] == color[slot]
+                target = next_slot[target]
+            if is_collied and new_cell[slot] >= 0:
+                removed[new_cell[slot]] = slot
+
+        # タイルごとに残す弾を決めて詰め直す
+        back = self._back
+        back_handle = back["handle"]
+        for slot in range(self.size):
+            if self.handle[slot] is not None:
+                self.handle[slot].detach()
+        size = 0
+        for i in range(touched_num):
+            cell = touched[i]
+            remove_slot = removed[cell]
+            keep = -1
+            if count[cell] - (remove_slot >= 0) == 1:
+                keep = head[cell]
+                if keep == remove_slot:
+                    keep = next_slot[keep]
+            else:
+                enemy_num = 0
+                slot = head[cell]
+                while slot >= 0:
+                    if slot != remove_slot and is_enemy_list[kind[slot]]:
+                        keep = slot
+                        enemy_num += 1
+                    slot = next_slot[slot]
+                if enemy_num == 1:
+                    slot = head[cell]
+                    while slot >= 0:
+                        if slot != keep and (
+                            is_enemy_list[kind[slot]] or color[slot] == color[keep]
+                        ):
+                            keep = -1
+                            break
+                        slot = next_slot[slot]
+                else:
+                    keep = -1
+            count[cell] = 0
+            if keep >= 0:
+                back["x"][size] = x[keep]
+                back["y"][size] = y[keep]
+                back["direct"][size] = self.direct[keep]
+                back["color"][size] = color[keep]
+                back["kind"][size] = kind[keep]
+                back["key_cell"][size] = cell
+                back_handle[size] = self.handle[keep]
+                size += 1
+
+        # 消えた弾のハンドルは切り離し済みなので、残った弾だけ繋ぎ直す
+        for slot in range(old_size):
+            self.cell_slot[key_cell[slot]] = -1
+        handle = self.handle
+        for slot in range(self.size):
+            handle[slot] = None
+        self._front, self._back = back, self._front
+        self._bind_front()
+        self.size = size
+        for slot in range(size):
+            self.cell_slot[self.key_cell[slot]] = slot
+            if self.handle[slot] is not None:
+                self.handle[slot].attach(self, slot)
+
+    def draw(self, field_view):
+        for slot in range(self.size):
+            field_view.draw_object(
+                self.x[slot],
+                self.y[slot],
+                self.KIND_LIST[self.kind[slot]].image,
+                self.COLOR_LIST[self.color[slot]],
+            )
@@ -267,16 +267,81 @@ class Merge(FieldNode):
 
 
 class Bullet(FieldObject):
+    """弾1発分
+
+    Fieldに置かれている間はBulletPoolの配列のスロットを参照し、
+    取り除かれると自身の属性に状態を持ち直す。
+    """
+
+    image = None
+
     @staticmethod
     def get_start_pos(pos):
         return 8 // 2 if pos == 0 else 0 if pos > 0 else 8 - 1
 
     def __init__(self, tile_x, tile_y, d, color):
         super().__init__()
-        self.x = tile_x * 8 + self.get_start_pos(d.value[0])
-        self.y = tile_y * 8 + self.get_start_pos(d.value[1])
-        self.direct = d
-        self.color = color
+        self.pool = None
+        self.slot = -1
+        self._x = tile_x * 8 + self.get_start_pos(d.value[0])
+        self._y = tile_y * 8 + self.get_start_pos(d.value[1])
+        self._direct = d
+        self._color = color
+
+    def attach(self, pool, slot):
+        self.pool = pool
+        self.slot = slot
+
+    def detach(self):
+        if self.pool is not None:
+            self._x, self._y = self.get_pos()
+            self._direct, self._color = self.direct, self.color
+            self.pool = None
+            self.slot = -1
+
+    @property
+    def x(self):
+        return self._x if self.pool is None else self.pool.x[self.slot]
+
+    @x.setter
+    def x(self, value):
+        if self.pool is None:
+            self._x = value
+        else:
+            self.pool.x[self.slot] = value
+
+    @property
+    def y(self):
+        return self._y if self.pool is None else self.pool.y[self.slot]
+
+    @y.setter
+    def y(self, value):
+        if self.pool is None:
+            self._y = value
+        else:
+            self.pool.y[self.slot] = value
+
+    @property
+    def direct(self):
+        return self._direct if self.pool is None else self.pool.get_direct(self.slot)
+
+    @direct.setter
+    def direct(self, value):
+        if self.pool is None:
+            self._direct = value
+        else:
+            self.pool.set_direct(self.slot, value)
+
+    @property
+    def color(self):
+        return self._color if self.pool is None else self.pool.get_color(self.slot)
+
+    @color.setter
+    def color(self, value):
+        if self.pool is None:
+            self._color = value
+        else:
+            self.pool.set_color(self.slot, value)
 
     def update(self):
         self.x, self.y = self.x + self.direct.value[0], self.y + self.direct.value[1]
@@ -297,12 +362,14 @@ class Bullet(FieldObject):
 
 
 class BulletPlayer(Bullet):
+    image = Image.PLAYER_BULLET
+
     def __init__(self, tile_x, tile_y, d, color=Color.NODE_BLUE):
         super().__init__(tile_x, tile_y, d, color)
-        self.image = Image.PLAYER_BULLET
 
 
 class BulletEnemy(Bullet):
+    image = Image.ENEMY_BULLET
+
     def __init__(self, tile_x, tile_y, d, color=Color.NODE_BLUE):
         super().__init__(tile_x, tile_y, d, color)
-        self.image = Image.ENEMY_BULLET
@@ -2,6 +2,42 @@ from abc import ABC, abstractmethod
 from enum import Enum
 
 
+def get_shared_instance(cls):
+    """クラスごとに1つだけ作ったインスタンスを返す"""
+    instance = cls.__dict__.get("_instance")
+    if instance is None:
+        instance = cls()
+        cls._instance = instance
+    return instance
+
+
+class SharedService:
+    """描画・入力を使う時点でcreateから取り出して覚えておく属性
+
+    オブジェクトの生成時には描画層に触れないようにする。代入すれば
+    そのオブジェクトだけ別のインスタンスに差し替えられる。
+    """
+
+    def __init__(self, get_service_cls):
+        self.get_service_cls = get_service_cls
+        self.attr_name = None
+
+    def __set_name__(self, owner, name):
+        self.attr_name = "_" + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        service = obj.__dict__.get(self.attr_name)
+        if service is None:
+            service = self.get_service_cls().create()
+            obj.__dict__[self.attr_name] = service
+        return service
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.attr_name] = value
+
+
 class IView(ABC):
     @abstractmethod
     def draw_text(self, x, y, text):
@@ -31,19 +67,41 @@ class IView(ABC):
     def set_pal(self, params):
         pass
 
+    @abstractmethod
+    def bake_image(self, dst_tile_x, dst_tile_y, src_tile_x, src_tile_y, direct, pal):
+        pass
+
+    @abstractmethod
+    def draw_baked_image(self, x, y, tile_x, tile_y):
+        pass
+
     @classmethod
     def create(cls):
-        return cls()
+        return get_shared_instance(cls)
 
 
 class PyxelView(IView):
     TILE_MAP_WIDTH = 8 * (8 * 2)
     TILE_MAP_HEIGHT = 8 * (8 * 2 - 1)
+    BAKE_IMAGE_BANK = 2
 
     def __init__(self):
         import pyxel  # pylint: disable=W0621, C0415
 
         self.pyxel = pyxel
+        self.degree_map = {
+            Direct.RIGHT: 0,
+            Direct.UP: 270,
+            Direct.LEFT: 180,
+            Direct.DOWN: 90,
+        }
+        # 時計回りに回したとき、書き込み先(x, y)に来る元画像の座標
+        self.rotate_map = {
+            Direct.RIGHT: lambda x, y: (x, y),
+            Direct.DOWN: lambda x, y: (y, 7 - x),
+            Direct.LEFT: lambda x, y: (7 - x, 7 - y),
+            Direct.UP: lambda x, y: (7 - y, x),
+        }
 
     def draw_text(self, x, y, text):
         self.pyxel.text(x, y, text, 7)
@@ -52,12 +110,6 @@ class PyxelView(IView):
         self.pyxel.bltm(0, 0, 0, 0, 0, self.TILE_MAP_WIDTH, self.TILE_MAP_HEIGHT)
 
     def draw_image(self, x, y, src_tile_x, src_tile_y, direct):
-        degree_map = {
-            Direct.RIGHT: 0,
-            Direct.UP: 270,
-            Direct.LEFT: 180,
-            Direct.DOWN: 90,
-        }
         self.pyxel.blt(
             x,
             y,
@@ -67,7 +119,7 @@ class PyxelView(IView):
             8,
             8,
             colkey=0,
-            rotate=degree_map[direct],
+            rotate=self.degree_map[direct],
         )
 
     def draw_rect(self, x, y, width, height, color, is_fill):
@@ -89,6 +141,20 @@ class PyxelView(IView):
     def set_pal(self, params):
         self.pyxel.pal(*[col.value for col in params])
 
+    def bake_image(self, dst_tile_x, dst_tile_y, src_tile_x, src_tile_y, direct, pal):
+        src = self.pyxel.images[0]
+        dst = self.pyxel.images[self.BAKE_IMAGE_BANK]
+        pal_map = {k.value: v.value for k, v in pal.items()}
+        rotate = self.rotate_map[direct]
+        for y in range(8):
+            for x in range(8):
+                u, v = rotate(x, y)
+                col = src.pget(src_tile_x * 8 + u, src_tile_y * 8 + v)
+                dst.pset(dst_tile_x * 8 + x, dst_tile_y * 8 + y, pal_map.get(col, col))
+
+    def draw_baked_image(self, x, y, tile_x, tile_y):
+        self.pyxel.blt(x, y, self.BAKE_IMAGE_BANK, tile_x * 8, tile_y * 8, 8, 8, 0)
+
 
 class IInput(ABC):
     @abstractmethod
@@ -105,7 +171,7 @@ class IInput(ABC):
 
     @classmethod
     def create(cls):
-        return cls()
+        return get_shared_instance(cls)
 
 
 class PyxelInput(IInput):
@@ -185,7 +251,7 @@ class IFieldView(ABC):
 
     @classmethod
     def create(cls):
-        return cls()
+        return get_shared_instance(cls)
 
 
 class PyxelFieldView(IFieldView):
@@ -197,11 +263,44 @@ class PyxelFieldView(IFieldView):
     FIELD_HEIGHT = 8 * FIELD_TILE_HEIGHT
     NODE_BASE_COLOR = Color.WHITE
 
+    # 色替え・回転済みの画像を置くイメージバンクのタイル数
+    BAKE_TILE_WIDTH = 256 // 8
+    BAKE_TILE_NUM = BAKE_TILE_WIDTH * BAKE_TILE_WIDTH
+
+    view = SharedService(lambda: PyxelView)
+
     def __init__(self):
         super().__init__()
-        self.view = PyxelView.create()
+        self.baked_tile_map = {}
+
+    def bake(self, variant_list):
+        """(元画像のタイル座標, 向き, 色)の組をまとめて焼き込んでおく"""
+        for src_tile, direct, color in variant_list:
+            self._get_baked_tile(src_tile, direct, color)
+
+    def _get_baked_tile(self, src_tile, direct, color):
+        key = (src_tile, direct, color)
+        tile = self.baked_tile_map.get(key)
+        if tile is None:
+            index = len(self.baked_tile_map)
+            if index >= self.BAKE_TILE_NUM:
+                return None
+            tile = (index % self.BAKE_TILE_WIDTH, index // self.BAKE_TILE_WIDTH)
+            pal = {} if color is None else {self.NODE_BASE_COLOR: color}
+            self.view.bake_image(*tile, *src_tile, direct, pal)
+            self.baked_tile_map[key] = tile
+        return tile
 
     def _draw(self, params, color):
+        x, y, src_tile_x, src_tile_y, direct = params
+        if color is None and direct == Direct.RIGHT:
+            self.view.draw_image(*params)
+            return
+        tile = self._get_baked_tile((src_tile_x, src_tile_y), direct, color)
+        if tile is not None:
+            self.view.draw_baked_image(x, y, *tile)
+            return
+        # 焼き込む場所が足りない場合はパレットを切り替えて描く
         if color is not None:
             self.view.set_pal([self.NODE_BASE_COLOR, color])
         self.view.draw_image(*params)
@@ -239,9 +338,8 @@ class GameObject(ABC):
     MONITOR_HEIGHT = PyxelView.TILE_MAP_HEIGHT
     MONITOR_WIDTH = PyxelView.TILE_MAP_WIDTH
 
-    def __init__(self):
-        self.view = PyxelView.create()
-        self.input = PyxelInput.create()
+    view = SharedService(lambda: PyxelView)
+    input = SharedService(lambda: PyxelInput)
 
     @abstractmethod
     def draw(self):
@@ -252,6 +350,4 @@ class GameObject(ABC):
 
 
 class FieldObject(GameObject):
-    def __init__(self):
-        super().__init__()
-        self.field_view = PyxelFieldView.create()
+    field_view = SharedService(lambda: PyxelFieldView)
@@ -17,15 +17,13 @@ try:
     from .field_nodes import (
         UnitPlayer,
         UnitEnemy,
-        BulletPlayer,
-        BulletEnemy,
-        Curve,
-        Convert,
-        Split,
         Merge,
         Unit,
         FieldNode,
+        BulletPlayer,
     )  # pylint: disable=C0413
+    from .bullet_pool import BulletPool  # pylint: disable=C0413
+    from .routing import RoutingTable  # pylint: disable=C0413
 except ImportError:
     from framework import (
         PyxelFieldView,
@@ -39,15 +37,13 @@ except ImportError:
     from field_nodes import (
         UnitPlayer,
         UnitEnemy,
-        BulletPlayer,
-        BulletEnemy,
-        Curve,
-        Convert,
-        Split,
         Merge,
         Unit,
         FieldNode,
+        BulletPlayer,
     )  # pylint: disable=C0413
+    from bullet_pool import BulletPool  # pylint: disable=C0413
+    from routing import RoutingTable  # pylint: disable=C0413
 
 
 class Action(Enum):
@@ -62,8 +58,10 @@ class Action(Enum):
 
 
 class Field(FieldObject):
-    def __init__(self, enemy_split_num, enemy_color_list):
+    def __init__(self, enemy_split_num, enemy_color_list, rand=None):
         super().__init__()
+        # 配置の乱数。Randomを渡せば同じ配置を再現できる
+        self.rand = random if rand is None else rand
         self.enemy_split_num = enemy_split_num
         self.enemy_color_list = enemy_color_list
         self.enemy_y_color_map = {}
@@ -71,11 +69,13 @@ class Field(FieldObject):
         y_list = self._get_random_new_enemy_y_pos(set())
         unit_enemy = UnitEnemy(11, *self._get_enemy_param(y_list[0:1])[0])
         self.unit_list = [unit_player, unit_enemy]
-        self.bullet_map = {}
+        self.bullet_pool = BulletPool()
         self.node_map = {unit.get_tile_pos(): unit for unit in self.unit_list}
+        # ノードを置く・取り除く・整備するたびにNoneへ戻し、使うときに作り直す
+        self.routing_table = None
 
     def _get_random_new_player_y_pos(self):
-        return random.randint(0, PyxelFieldView.FIELD_TILE_HEIGHT - 1)
+        return self.rand.randint(0, PyxelFieldView.FIELD_TILE_HEIGHT - 1)
 
     def update(self):
         self._update_bullet()
@@ -114,6 +114,7 @@ class Field(FieldObject):
                 if pos in self.node_map:
                     raise KeyError(f"node_map already has key: {pos}")
                 self.node_map[pos] = unit
+                self.routing_table = None
 
     def _get_enemies_y_set(self):
         return {unit.tile_y for unit in self.unit_list if isinstance(unit, UnitEnemy)}
@@ -125,75 +126,46 @@ class Field(FieldObject):
             if i % self.enemy_split_num == 0 and i not in enemies_y_set
         ]
         if len(candidate) > 2:
-            return random.sample(
+            return self.rand.sample(
                 candidate,
                 k=2,
             )
         return candidate
 
-    def _update_bullet(self):
-        append_bullet = self._update_and_get_new_bullet()
-        append_bullet_map = self._get_new_bullet_map(append_bullet)
-        self.bullet_map = self._regenerate_bullet_map(append_bullet_map)
+    @property
+    def bullet_map(self):
+        return self.bullet_pool
 
-    def _is_collied(self, bullet, bullet_set):
-        if bullet in bullet_set:
-            return False
-        else:
-            if isinstance(bullet, BulletPlayer):
-                return True
-            for target in bullet_set:
-                if isinstance(target, BulletEnemy) or bullet.color == target.color:
-                    return True
-            return False
+    @bullet_map.setter
+    def bullet_map(self, bullet_map):
+        self.bullet_pool.clear()
+        self.bullet_pool.update(bullet_map)
 
-    def _regenerate_bullet_map(self, append_bullet_map):
-        bef_collied_map = {
-            bullet.get_tile_pos(): {bullet}
-            for pos, bullet in self.bullet_map.items()
-            if pos in append_bullet_map
-            and self._is_collied(bullet, append_bullet_map[pos])
-        }
-        ret_map = {}
-        for pos, bset in append_bullet_map.items():
-            remain_set = bset - bef_collied_map.get(pos, set())
-            if len(remain_set) == 1:
-                ret_map[pos] = next(iter(remain_set))
-            else:
-                enemy_set = {
-                    bullet for bullet in remain_set if isinstance(bullet, BulletEnemy)
-                }
-                if len(enemy_set) == 1:
-                    enemy = next(iter(enemy_set))
-                    if not self._is_collied(enemy, bset - enemy_set):
-                        ret_map[pos] = enemy
-        return ret_map
-
-    def _get_new_bullet_map(self, append_bullet):
-        append_bullet_map = {}
-        for bullet in append_bullet + list(self.bullet_map.values()):
-            pos = bullet.get_tile_pos()
-            if (
-                -8 < bullet.x < PyxelFieldView.FIELD_WIDTH + 8
-                and -8 < bullet.y < PyxelFieldView.FIELD_HEIGHT + 8
-                and pos not in self.node_map
-            ):
-                append_bullet_map[pos] = append_bullet_map.get(pos, set()) | {bullet}
-        return append_bullet_map
-
-    def _update_and_get_new_bullet(self):
-        append_bullet = []
-        for bullet in self.bullet_map.values():
-            bullet.update()
-            node = self.node_map.get(bullet.get_tile_pos())
-            if isinstance(node, (Curve, Convert, Split, Merge)):
-                new_bullet_list = node.reshot(bullet)
-                append_bullet.extend(new_bullet_list)
-            elif isinstance(node, Unit):
-                node.hit(bullet)
-                if node.is_death():
-                    del self.node_map[node.get_tile_pos()]
-        return append_bullet
+    def _update_bullet(self):
+        node_pos_list = list(self.node_map)
+        self.bullet_pool.set_blocked(node_pos_list)
+        old_size = self.bullet_pool.move(self._hit_node)
+        self.bullet_pool.regenerate(old_size)
+        self.bullet_pool.set_blocked(node_pos_list, False)
+
+    def _hit_node(self, tile_pos, bullet):
+        node = self.node_map.get(tile_pos)
+        if isinstance(node, RoutingTable.RESHOT_NODE_CLS):
+            if isinstance(bullet, BulletPlayer):
+                # 撃ち出す弾は向きと色で決まるので表から引く
+                for out_pos, direct, color in self.get_routing_table().get_output(
+                    tile_pos, bullet.direct, bullet.color
+                ):
+                    self.bullet_pool.append(BulletPlayer(*out_pos, direct, color))
+        elif isinstance(node, Merge):
+            for new_bullet in node.reshot(bullet):
+                self.bullet_pool.append(new_bullet)
+        elif isinstance(node, Unit):
+            node.hit(bullet)
+            if node.is_death():
+                del self.node_map[node.get_tile_pos()]
+                self.routing_table = None
+                self.bullet_pool.set_blocked([tile_pos], False)
 
     def _shot(self):
         for unit in self.unit_list:
@@ -206,8 +178,7 @@ class Field(FieldObject):
     def draw(self):
         self.view.draw_tilemap()
         self.view.set_clip(PyxelFieldView.get_rect())
-        for bullet in self.bullet_map.values():
-            bullet.draw()
+        self.bullet_pool.draw(self.field_view)
         for node in self.node_map.values():
             node.draw()
 
@@ -224,8 +195,26 @@ class Field(FieldObject):
         self.node_map[(tile_x, tile_y)] = FieldNode.node_factory(
             tile_x, tile_y, action_node_map[action]
         )
+        self.routing_table = None
         return True
 
+    @classmethod
+    def get_bake_variant_list(cls):
+        """フィールドに出てくるノードと弾の、向きと色の組み合わせ"""
+        color_list = [None, Color.NODE_GRAY] + list(
+            dict.fromkeys(Merge.COLOR_MAP.values())
+        )
+        return [
+            (node.value.value, direct, color)
+            for node in Node
+            for direct in Direct
+            for color in color_list
+        ] + [
+            (image.value, Direct.RIGHT, color)
+            for image in [Image.PLAYER_BULLET, Image.ENEMY_BULLET]
+            for color in color_list
+        ]
+
     def is_able_to_build(self, tile_x, tile_y):
         if tile_x >= PyxelFieldView.FIELD_TILE_WIDTH - 2:
             return False
@@ -236,23 +225,38 @@ class Field(FieldObject):
     def mainte(self, tile_x, tile_y):
         if (tile_x, tile_y) in self.node_map:
             self.node_map[(tile_x, tile_y)].mainte()
+            self.routing_table = None
 
     def delete(self, tile_x, tile_y):
         if (tile_x, tile_y) in self.node_map and not issubclass(
             self.node_map[(tile_x, tile_y)].__class__, Unit
         ):
             del self.node_map[(tile_x, tile_y)]
+            self.routing_table = None
 
     def get_bullet_count(self):
-        total = len(self.bullet_map)
-        player_num = len(
-            [
-                bullet
-                for bullet in self.bullet_map.values()
-                if isinstance(bullet, BulletPlayer)
-            ]
-        )
-        return player_num, total - player_num
+        return self.bullet_pool.get_count()
+
+    def get_routing_table(self):
+        if self.routing_table is None:
+            self.routing_table = RoutingTable(self.node_map)
+        return self.routing_table
+
+    def get_quiet_frames(self):
+        """弾がノードや他の弾に届かず、ユニットも撃たないまま進むフレーム数"""
+        if any(pos in self.bullet_pool for pos in self.node_map):
+            # ノードを建てた直後で、その下に弾が残っている
+            return 0
+        frames = self.bullet_pool.get_quiet_frames(self.get_routing_table())
+        for unit in self.unit_list:
+            frames = min(frames, unit.max_interval - unit.interval)
+        return max(frames, 0)
+
+    def skip(self, frame_num):
+        """get_quiet_frames以内のフレーム数を、判定なしにまとめて進める"""
+        self.bullet_pool.advance(frame_num)
+        for unit in self.unit_list:
+            unit.interval += frame_num
 
     def get_enemy_color(self, tile_x, tile_y):
         if (tile_x, tile_y) in self.node_map:
@@ -437,27 +441,151 @@ class GameParameter:
         (2, [Color.NODE_CYAN, Color.NODE_DEEP_BLUE]),
     ]
 
+    def __init__(self, rand=None):
+        self.rand = random if rand is None else rand
+
+    def get(self):
+        param = self.rand.randint(0, len(self.GAMA_PARAMS_LIST) - 1)
+        return self.GAMA_PARAMS_LIST[param]
+
+
+class Session:
+    """1ステージ分の操作記録
+
+    action_listは(フレーム, Action, tile_x, tile_y)で、そのフレームの
+    更新より前に行った操作。bullet_count_listは各フレーム更新後の
+    get_bullet_countの値。
+    """
+
+    def __init__(self, seed, game_parameter, action_list=(), bullet_count_list=()):
+        self.seed = seed
+        self.game_parameter = game_parameter
+        self.action_list = list(action_list)
+        self.bullet_count_list = list(bullet_count_list)
+
+    def __eq__(self, other):
+        return isinstance(other, Session) and vars(self) == vars(other)
+
+    def to_dict(self):
+        enemy_split_num, enemy_color_list = self.game_parameter
+        return {
+            "seed": self.seed,
+            "enemy_split_num": enemy_split_num,
+            "enemy_color_list": [color.name for color in enemy_color_list],
+            "action_list": [
+                [frame, action.name, tile_x, tile_y]
+                for frame, action, tile_x, tile_y in self.action_list
+            ],
+            "bullet_count_list": [list(count) for count in self.bullet_count_list],
+        }
+
+    @classmethod
+    def from_dict(cls, value):
+        return cls(
+            value["seed"],
+            (
+                value["enemy_split_num"],
+                [Color[name] for name in value["enemy_color_list"]],
+            ),
+            [
+                (frame, Action[name], tile_x, tile_y)
+                for frame, name, tile_x, tile_y in value["action_list"]
+            ],
+            [tuple(count) for count in value["bullet_count_list"]],
+        )
+
+
+class ReplayMismatchError(Exception):
+    def __init__(self, frame, expected, actual):
+        super().__init__(f"frame {frame}: expected {expected}, actual {actual}")
+        self.frame = frame
+        self.expected = expected
+        self.actual = actual
+
+
+class LockStepSimulation:
+    """乱数の種から決まるFieldを1フレームずつ進める
+
+    is_recordなら操作と各フレームの弾数をsessionに記録する。記録はフレーム数に
+    比例して増えるので、遊ぶときは記録しない。
+    """
+
+    def __init__(self, seed, game_parameter=None, is_record=False):
+        if game_parameter is None:
+            game_parameter = GameParameter(random.Random(seed)).get()
+        self.field = Field(*game_parameter, rand=random.Random(seed))
+        self.session = Session(seed, game_parameter)
+        self.is_record = is_record
+        self.frame = 0
+
+    def act(self, action, tile_x, tile_y):
+        """Action.FIELDは整備、Action.DELETEは削除、それ以外は建設"""
+        if self.is_record:
+            self.session.action_list.append((self.frame, action, tile_x, tile_y))
+        if action == Action.FIELD:
+            self.field.mainte(tile_x, tile_y)
+        elif action == Action.DELETE:
+            self.field.delete(tile_x, tile_y)
+        else:
+            self.field.build(action, tile_x, tile_y)
+
+    def step(self):
+        self.field.update()
+        self.frame += 1
+        if self.is_record:
+            self.session.bullet_count_list.append(self.field.get_bullet_count())
+
+    def run(self, frame_num, is_fast=False):
+        """frame_numフレーム進める。is_fastなら何も起きないフレームを飛ばす"""
+        end_frame = self.frame + frame_num
+        while self.frame < end_frame:
+            skip_num = 0
+            if is_fast:
+                skip_num = min(self.field.get_quiet_frames(), end_frame - self.frame)
+            if skip_num > 0:
+                self.field.skip(skip_num)
+                self.frame += skip_num
+                if self.is_record:
+                    self.session.bullet_count_list.extend(
+                        [self.field.get_bullet_count()] * skip_num
+                    )
+            else:
+                self.step()
+
     @classmethod
-    def get(cls):
-        param = random.randint(0, len(cls.GAMA_PARAMS_LIST) - 1)
-        return cls.GAMA_PARAMS_LIST[param]
+    def replay(cls, session, is_check=True, is_fast=False):
+        """記録を描画なしで再生し、各フレームの弾数が一致するか確かめる"""
+        simulation = cls(session.seed, session.game_parameter, is_record=True)
+        for frame, *action in session.action_list:
+            simulation.run(frame - simulation.frame, is_fast)
+            simulation.act(*action)
+        simulation.run(len(session.bullet_count_list) - simulation.frame, is_fast)
+        if is_check:
+            for frame, (expected, actual) in enumerate(
+                zip(session.bullet_count_list, simulation.session.bullet_count_list)
+            ):
+                if actual != expected:
+                    raise ReplayMismatchError(frame + 1, expected, actual)
+        return simulation
 
 
 class GameCore(GameObject):
     WAIT_ENABLE_NEXT_TERN = 180
 
-    def __init__(self):
+    def __init__(self, seed=None):
         super().__init__()
+        self.rand = random.Random(seed)
+        self.simulation = None
         self.field = None
         self.cursor = None
         self.stage_clear_tern = 0
         self.scout = None
-        self.parameter = GameParameter()
+        self.parameter = GameParameter(self.rand)
         self._game_reset()
 
     def update(self):
         self._action()
-        self.field.update()
+        self.simulation.step()
         self._update_stage_clear_wait_tern()
 
     def _update_stage_clear_wait_tern(self):
@@ -482,17 +610,18 @@ class GameCore(GameObject):
                 if enemy_color is not None:
                     self.scout = Scout(click_pos[1], enemy_color)
                 else:
-                    self.field.mainte(*click_pos)
-            elif bef_act == Action.DELETE:
-                self.field.delete(*click_pos)
+                    self.simulation.act(Action.FIELD, *click_pos)
             else:
-                self.field.build(bef_act, *click_pos)
+                self.simulation.act(bef_act, *click_pos)
 
     def _get_game_parameter(self):
         return self.parameter.get()
 
     def _game_reset(self):
-        self.field = Field(*self._get_game_parameter())
+        self.simulation = LockStepSimulation(
+            self.rand.getrandbits(32), self._get_game_parameter()
+        )
+        self.field = self.simulation.field
         self.cursor = Cursor()
         self.stage_clear_tern = 0
         self.scout = None
@@ -544,6 +673,7 @@ class PyxelController:
         )
         self.pyxel.load("map_tile.pyxres")
         self.pyxel.mouse(True)
+        PyxelFieldView.create().bake(Field.get_bake_variant_list())
 
         self.game_core = GameCore()
         pyxel.run(self.update, self.draw)
@@ -0,0 +1,74 @@
+import json
+import random
+import sys
+import timeit
+
+try:
+    from .main import (
+        Action,
+        LockStepSimulation,
+        Session,
+    )  # pylint: disable=C0413
+    from .framework import PyxelFieldView  # pylint: disable=C0413
+except ImportError:
+    from main import (
+        Action,
+        LockStepSimulation,
+        Session,
+    )  # pylint: disable=C0413
+    from framework import PyxelFieldView  # pylint: disable=C0413
+
+PLAY_ACTION_LIST = [
+    Action.CURVE,
+    Action.CURVE_REV,
+    Action.CONVERT,
+    Action.SPLIT,
+    Action.MERGE,
+    Action.FIELD,
+    Action.FIELD,
+    Action.DELETE,
+]
+
+
+def record_random_session(seed, frame_num, action_interval=20):
+    """ランダムに操作しながらframe_numフレーム進めた記録を作る"""
+    rand = random.Random(seed)
+    simulation = LockStepSimulation(seed, is_record=True)
+    for frame in range(frame_num):
+        if frame % action_interval == 0:
+            simulation.act(
+                rand.choice(PLAY_ACTION_LIST),
+                rand.randint(0, PyxelFieldView.FIELD_TILE_WIDTH - 1),
+                rand.randint(0, PyxelFieldView.FIELD_TILE_HEIGHT - 1),
+            )
+        simulation.step()
+    return simulation.session
+
+
+def save_session(session, file):
+    json.dump(session.to_dict(), file)
+
+
+def load_session(file):
+    return Session.from_dict(json.load(file))
+
+
+def run_benchmark(session, number=1, repeat=3):
+    """再生1フレームあたりの時間(秒)をrepeat回中の最小値で返す"""
+    frame_num = len(session.bullet_count_list)
+    elapsed = min(
+        timeit.repeat(
+            lambda: LockStepSimulation.replay(session), number=number, repeat=repeat
+        )
+    )
+    per_frame = elapsed / number / frame_num
+    return {"frames": frame_num, "per_frame": per_frame, "fps": 1 / per_frame}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "r", encoding="utf-8") as f:
+            target = load_session(f)
+    else:
+        target = record_random_session(0, 60 * 60)
+    print(run_benchmark(target))
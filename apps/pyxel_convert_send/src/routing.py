@@ -0,0 +1,127 @@
+try:
+    from .framework import (
+        Direct,
+        PyxelFieldView,
+    )  # pylint: disable=C0413
+    from .field_nodes import (
+        BulletPlayer,
+        Curve,
+        Convert,
+        Split,
+    )  # pylint: disable=C0413
+except ImportError:
+    from framework import (
+        Direct,
+        PyxelFieldView,
+    )  # pylint: disable=C0413
+    from field_nodes import (
+        BulletPlayer,
+        Curve,
+        Convert,
+        Split,
+    )  # pylint: disable=C0413
+
+
+class RoutingTable:
+    """ノードの配置から自弾の行き先を前計算した表
+
+    (タイル, 向き)ごとに次に当たるノードの位置とそこまでのタイル数を持ち、
+    (ノード, 向き, 色)ごとに撃ち出される弾をキャッシュする。
+    ノードの配置・向き・色が変わったら作り直す。
+    """
+
+    # 外周1タイル分までは弾が存在できる
+    MIN_TILE = -1
+    MAX_TILE_X = PyxelFieldView.FIELD_TILE_WIDTH
+    MAX_TILE_Y = PyxelFieldView.FIELD_TILE_HEIGHT
+    RESHOT_NODE_CLS = (Curve, Convert, Split)
+
+    def __init__(self, node_map):
+        self.node_map = dict(node_map)
+        self.next_map = {}
+        self.output_map = {}
+        for direct in Direct:
+            self._build_line(direct)
+
+    def _is_inside(self, tile_x, tile_y):
+        return (
+            self.MIN_TILE <= tile_x <= self.MAX_TILE_X
+            and self.MIN_TILE <= tile_y <= self.MAX_TILE_Y
+        )
+
+    def _build_line(self, direct):
+        """向きの逆から順に見て、各タイルから次のノードまでを埋める"""
+        dx, dy = direct.value
+        x_range = range(self.MIN_TILE, self.MAX_TILE_X + 1)
+        y_range = range(self.MIN_TILE, self.MAX_TILE_Y + 1)
+        if dx > 0 or dy > 0:
+            x_range, y_range = reversed(x_range), reversed(y_range)
+        x_list, y_list = list(x_range), list(y_range)
+        for x in x_list:
+            for y in y_list:
+                next_pos = (x + dx, y + dy)
+                if not self._is_inside(*next_pos):
+                    self.next_map[((x, y), direct)] = (None, 1)
+                elif next_pos in self.node_map:
+                    self.next_map[((x, y), direct)] = (next_pos, 1)
+                else:
+                    node_pos, distance = self.next_map[(next_pos, direct)]
+                    self.next_map[((x, y), direct)] = (node_pos, distance + 1)
+
+    def get_next(self, tile_pos, direct):
+        """次に入るノードの位置(画面外に出るならNone)と、そこまでのタイル数"""
+        return self.next_map[(tile_pos, direct)]
+
+    def get_output(self, node_pos, direct, color):
+        """ノードに入った自弾から撃ち出される弾の(タイル, 向き, 色)の一覧
+
+        状態を持つMergeとユニットはNoneを返す。
+        """
+        key = (node_pos, direct, color)
+        if key not in self.output_map:
+            node = self.node_map[node_pos]
+            if isinstance(node, self.RESHOT_NODE_CLS):
+                self.output_map[key] = [
+                    (bullet.get_tile_pos(), bullet.direct, bullet.color)
+                    for bullet in node.reshot(BulletPlayer(*node_pos, direct, color))
+                ]
+            else:
+                self.output_map[key] = None
+        return self.output_map[key]
+
+    def get(self, tile_pos, direct, color):
+        """(次のノードの位置, タイル数, 撃ち出される弾)を返す"""
+        node_pos, distance = self.get_next(tile_pos, direct)
+        if node_pos is None:
+            return None, distance, []
+        return node_pos, distance, self.get_output(node_pos, direct, color)
+
+    def trace(self, tile_pos, direct, color, segment_list=None):
+        """自弾1発が最終的に行き着くノードを(位置, 入った向き, 色, 距離)で返す
+
+        同じ(タイル, 向き, 色)に戻る経路は1度だけたどる。画面外に出た弾は
+        含めない。弾同士の衝突は考えない。segment_listを渡すと、通った直線を
+        (始点のタイル, 向き, 次のノードまでのタイル数)で追加する。
+        """
+        ret = []
+        visited = set()
+        stack = [(tile_pos, direct, color, 0)]
+        while len(stack) > 0:
+            pos, d, c, total = stack.pop()
+            if (pos, d, c) in visited:
+                continue
+            visited.add((pos, d, c))
+            node_pos, distance, output_list = self.get(pos, d, c)
+            if segment_list is not None:
+                segment_list.append((pos, d, distance))
+            if node_pos is None:
+                continue
+            if output_list is None:
+                ret.append((node_pos, d, c, total + distance))
+                continue
+            for out_pos, out_d, out_c in output_list:
+                if out_pos in self.node_map:
+                    # ノードの上に撃ち出された弾はそのまま消える
+                    continue
+                stack.append((out_pos, out_d, out_c, total + distance + 1))
+        return ret
@@ -0,0 +1,437 @@
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+try:
+    from .main import (
+        Action,
+        GameCore,
+        GameParameter,
+        LockStepSimulation,
+    )  # pylint: disable=C0413
+    from .field_nodes import (
+        Convert,
+        Curve,
+        Merge,
+        UnitEnemy,
+        UnitPlayer,
+    )  # pylint: disable=C0413
+    from .framework import Color, Direct, PyxelFieldView  # pylint: disable=C0413
+except ImportError:
+    from main import (
+        Action,
+        GameCore,
+        GameParameter,
+        LockStepSimulation,
+    )  # pylint: disable=C0413
+    from field_nodes import (
+        Convert,
+        Curve,
+        Merge,
+        UnitEnemy,
+        UnitPlayer,
+    )  # pylint: disable=C0413
+    from framework import Color, Direct, PyxelFieldView  # pylint: disable=C0413
+
+BUILD_ACTION_LIST = [
+    Action.CURVE,
+    Action.CURVE_REV,
+    Action.CONVERT,
+    Action.SPLIT,
+    Action.MERGE,
+]
+# 向きは4通り、Convertの色は3通りなので4回で一巡する
+MAX_MAINTE_NUM = 3
+
+
+def get_stage_parameter(stage):
+    return GameParameter.GAMA_PARAMS_LIST[stage]
+
+
+def _get_units(field):
+    player_list = [unit for unit in field.unit_list if isinstance(unit, UnitPlayer)]
+    enemy_list = [unit for unit in field.unit_list if isinstance(unit, UnitEnemy)]
+    return player_list, enemy_list
+
+
+class Plan:
+    """最初のフレームに行う建設と整備。{位置: (Action, 整備回数)}で持つ"""
+
+    def __init__(self, node_map=None):
+        self.node_map = dict(node_map or {})
+
+    def __eq__(self, other):
+        return isinstance(other, Plan) and self.node_map == other.node_map
+
+    def __hash__(self):
+        return hash(frozenset(self.node_map.items()))
+
+    def get_action_list(self):
+        ret = []
+        for (tile_x, tile_y), (action, mainte_num) in sorted(self.node_map.items()):
+            ret.append((action, tile_x, tile_y))
+            ret.extend([(Action.FIELD, tile_x, tile_y)] * mainte_num)
+        return ret
+
+    def apply(self, simulation):
+        """simulationに操作を適用する。建てられなかったノードはplanから取り除く"""
+        for pos, (action, mainte_num) in sorted(self.node_map.items()):
+            if not simulation.field.is_able_to_build(*pos):
+                del self.node_map[pos]
+                continue
+            simulation.act(action, *pos)
+            for _ in range(mainte_num):
+                simulation.act(Action.FIELD, *pos)
+
+    def mutate(self, rand, pos_list):
+        ret = Plan(self.node_map)
+        kind = rand.randint(0, 3) if len(ret.node_map) > 0 else 0
+        if kind == 0:
+            ret.node_map[rand.choice(pos_list)] = (
+                rand.choice(BUILD_ACTION_LIST),
+                rand.randint(0, MAX_MAINTE_NUM),
+            )
+            return ret
+        pos = rand.choice(list(ret.node_map))
+        action, mainte_num = ret.node_map[pos]
+        if kind == 1:
+            del ret.node_map[pos]
+        elif kind == 2:
+            ret.node_map[pos] = (action, (mainte_num + 1) % (MAX_MAINTE_NUM + 1))
+        else:
+            ret.node_map[pos] = (rand.choice(BUILD_ACTION_LIST), mainte_num)
+        return ret
+
+
+def _get_curve_action(in_direct, out_direct):
+    """in_directで入った弾をout_directへ曲げるCurveの(Action, 整備回数)"""
+    for action, rev in [(Action.CURVE, False), (Action.CURVE_REV, True)]:
+        curve = Curve(0, 0, rev)
+        for mainte_num in range(MAX_MAINTE_NUM + 1):
+            if curve.direct == out_direct == curve.cycle_map[in_direct]:
+                return action, mainte_num
+            curve.mainte()
+    return None
+
+
+def _get_direct(from_pos, to_pos):
+    step = tuple((t > f) - (t < f) for f, t in zip(from_pos, to_pos))
+    return next(direct for direct in Direct if direct.value == step)
+
+
+def make_block_plan(field):
+    """最初の敵を塞ぐ配置を作る
+
+    自機の弾をCurveで敵の行へ曲げ、敵の手前に置いた色の違うConvertを通して
+    撃ち込み続ける。Curve同士は隣り合えないので、行の差が1のときは一度
+    離れた行を回ってから敵の行に入る。
+    """
+    player_list, enemy_list = _get_units(field)
+    player_y = player_list[0].tile_y
+    enemy = enemy_list[0]
+    turn_x = 2
+    block_pos = (PyxelFieldView.FIELD_TILE_WIDTH - 3, enemy.tile_y)
+    if player_y == enemy.tile_y:
+        corner_list = []
+    elif abs(player_y - enemy.tile_y) >= 2:
+        corner_list = [(turn_x, player_y), (turn_x, enemy.tile_y)]
+    else:
+        detour_y = next(
+            y
+            for y in range(PyxelFieldView.FIELD_TILE_HEIGHT)
+            if abs(y - player_y) >= 2 and abs(y - enemy.tile_y) >= 2
+        )
+        corner_list = [
+            (turn_x, player_y),
+            (turn_x, detour_y),
+            (turn_x + 2, detour_y),
+            (turn_x + 2, enemy.tile_y),
+        ]
+    node_map = {}
+    in_direct = Direct.RIGHT
+    for pos, next_pos in zip(corner_list, corner_list[1:] + [block_pos]):
+        out_direct = _get_direct(pos, next_pos)
+        node_map[pos] = _get_curve_action(in_direct, out_direct)
+        in_direct = out_direct
+    convert = Convert(*block_pos)
+    mainte_num = 0
+    while convert.color == enemy.color:
+        convert.mainte()
+        mainte_num += 1
+    node_map[block_pos] = (Action.CONVERT, mainte_num)
+    return Plan(node_map)
+
+
+def get_route_result(field):
+    """自機の弾が届く先を、Mergeでの色の合成まで含めてたどる
+
+    (色を合わせて届く敵の位置の集合, 塞いでいる敵の位置の集合, 色を問わず届く敵の
+    位置の集合, 途中で作られる弾の色の集合, 両側から弾が届くMergeの数,
+    弾の通るタイルの集合)を返す。塞いでいる敵は、すぐ手前のノードから色の違う弾が
+    届き続ける敵で、撃とうとしたタイルに自弾があると撃てず、撃てた弾も手前の
+    ノードで消える。
+    Mergeには受け付ける2方向から交互に弾が来るものとし、弾同士の衝突は考えない。
+    """
+    table = field.get_routing_table()
+    hit_set = set()
+    block_set = set()
+    reach_set = set()
+    color_set = set()
+    merge_in_map = {}
+    visited = set()
+    segment_list = []
+    stack = [
+        (unit.get_tile_pos(), Direct.RIGHT, unit.color) for unit in _get_units(field)[0]
+    ]
+    while len(stack) > 0:
+        start = stack.pop()
+        if start in visited:
+            continue
+        visited.add(start)
+        color_set.add(start[2])
+        for node_pos, direct, color, _ in table.trace(*start, segment_list):
+            color_set.add(color)
+            node = field.node_map[node_pos]
+            if isinstance(node, UnitEnemy):
+                reach_set.add(node_pos)
+                if node.color == color:
+                    hit_set.add(node_pos)
+                elif (node_pos[0] - 2, node_pos[1]) in field.node_map:
+                    block_set.add(node_pos)
+                continue
+            if not isinstance(node, Merge):
+                continue
+            accept_list = Merge.ACCEPT_MAP[node.direct]
+            if direct not in accept_list:
+                continue
+            side_map = merge_in_map.setdefault(
+                node_pos, {d: set() for d in accept_list}
+            )
+            side_map[direct].add(color)
+            side_a, side_b = side_map.values()
+            if len(side_a) > 0 and len(side_b) > 0:
+                pair_list = [(a, b) for a in side_a for b in side_b]
+            else:
+                pair_list = [(c, c) for c in side_a | side_b]
+            out_pos = (
+                node_pos[0] + node.direct.value[0],
+                node_pos[1] + node.direct.value[1],
+            )
+            if out_pos in field.node_map:
+                continue
+            for pair in pair_list:
+                merge_color = Merge.COLOR_MAP.get(frozenset(pair), Color.NODE_GRAY)
+                stack.append((out_pos, node.direct, merge_color))
+    merge_num = len(
+        [
+            side_map
+            for side_map in merge_in_map.values()
+            if all(len(colors) > 0 for colors in side_map.values())
+        ]
+    )
+    path_set = set()
+    for (tile_x, tile_y), direct, distance in segment_list:
+        dx, dy = direct.value
+        path_set.update((tile_x + dx * i, tile_y + dy * i) for i in range(distance))
+    return hit_set, block_set, reach_set, color_set, merge_num, path_set
+
+
+def evaluate_plan(seed, game_parameter, plan, frame_num, is_fast=True):
+    """planを最初のフレームで実行し、frame_numフレーム進めた結果を返す"""
+    start = time.perf_counter()
+    simulation = LockStepSimulation(seed, game_parameter)
+    for action in plan:
+        simulation.act(*action)
+    field = simulation.field
+    kills = 0
+    clear_frame = None
+    # GameCoreと同じく、敵の弾がない状態が続いたフレーム数でクリアを判定する
+    clear_tern = 0
+    _, enemy_list = _get_units(field)
+    player_list = []
+    while simulation.frame < frame_num:
+        simulation.step()
+        player_list, new_enemy_list = _get_units(field)
+        kills += len(set(enemy_list) - set(new_enemy_list))
+        enemy_list = new_enemy_list
+        skip_num = 0
+        if is_fast:
+            # 弾が動くだけの区間は敵が倒れず、弾数も変わらないのでまとめて進める
+            skip_num = min(field.get_quiet_frames(), frame_num - simulation.frame)
+            simulation.run(skip_num, True)
+        if field.get_bullet_count()[1] == 0:
+            clear_tern += 1 + skip_num
+        else:
+            clear_tern = 0
+        if clear_tern > GameCore.WAIT_ENABLE_NEXT_TERN:
+            clear_frame = simulation.frame - (
+                clear_tern - GameCore.WAIT_ENABLE_NEXT_TERN - 1
+            )
+            break
+        if len(player_list) == 0:
+            break
+    return {
+        "seed": seed,
+        "plan": plan,
+        "kills": kills,
+        "clear_frame": clear_frame,
+        "player_hp": sum(unit.hp for unit in player_list),
+        "frames": simulation.frame,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def _evaluate_task(task):
+    return evaluate_plan(*task)
+
+
+def _solve_task(task):
+    stage, seed, kwargs = task
+    return StageSolver(stage, seed, **kwargs).run(processes=1)
+
+
+def _map(func, tasks, processes):
+    if processes == 1:
+        return [func(task) for task in tasks]
+    processes = os.cpu_count() if processes is None else processes
+    chunksize = max(1, len(tasks) // (processes * 4))
+    with Pool(processes) as pool:
+        return pool.map(func, tasks, chunksize=chunksize)
+
+
+class StageSolver:
+    """ステージ1つ分の配置を経路表の得点で山登りして探し、上位を全フレーム動かす"""
+
+    FRAME_NUM = 60 * 60
+    RESTART_NUM = 8
+    ITERATION_NUM = 300
+    SIMULATE_NUM = 16
+
+    def __init__(
+        self,
+        stage,
+        seed,
+        frame_num=FRAME_NUM,
+        restart_num=RESTART_NUM,
+        iteration_num=ITERATION_NUM,
+        simulate_num=SIMULATE_NUM,
+    ):
+        self.stage = stage
+        self.seed = seed
+        self.game_parameter = get_stage_parameter(stage)
+        self.frame_num = frame_num
+        self.restart_num = restart_num
+        self.iteration_num = iteration_num
+        self.simulate_num = simulate_num
+        # 右端の2列には建てられない
+        self.pos_set = {
+            (x, y)
+            for x in range(PyxelFieldView.FIELD_TILE_WIDTH - 2)
+            for y in range(PyxelFieldView.FIELD_TILE_HEIGHT)
+        }
+
+    def get_route_score(self, plan):
+        """得点と、弾の通るタイルのうち建設できる位置の一覧を返す
+
+        得点は(塞いでいる敵の数, 色を合わせて届く敵の数, 色を問わず届く敵の数,
+        作れる敵の色の数, 両側から弾が届くMergeの数, 作れる色の数, -ノード数)。
+        敵の弾が出なくなるとステージクリアなので、塞いでいる敵の数を先に見る。
+        """
+        simulation = LockStepSimulation(self.seed, self.game_parameter)
+        plan.apply(simulation)
+        hit_set, block_set, reach_set, color_set, merge_num, path_set = (
+            get_route_result(simulation.field)
+        )
+        return (
+            len(block_set),
+            len(hit_set),
+            len(reach_set),
+            len(color_set & set(self.game_parameter[1])),
+            merge_num,
+            len(color_set),
+            -len(plan.node_map),
+        ), sorted(path_set & self.pos_set)
+
+    def search(self):
+        """(得点, Plan)を得点の高い順にsimulate_num個返す"""
+        rand = random.Random(self.seed)
+        pos_list = sorted(self.pos_set)
+        score_map = {}
+        field = LockStepSimulation(self.seed, self.game_parameter).field
+        for restart in range(self.restart_num):
+            # 1回目は敵を塞ぐ配置から、残りは何もない配置から登る
+            plan = make_block_plan(field) if restart == 0 else Plan()
+            score, path_list = self.get_route_score(plan)
+            score_map.setdefault(plan, score)
+            for _ in range(self.iteration_num):
+                # 半分は弾の通り道にノードを置き、経路を伸ばしていく
+                use_path = len(path_list) > 0 and rand.random() < 0.5
+                new_plan = plan.mutate(rand, path_list if use_path else pos_list)
+                new_score, new_path_list = self.get_route_score(new_plan)
+                score_map.setdefault(new_plan, new_score)
+                # ノード数だけが増える手も受け入れて、合成の準備を進められるようにする
+                if new_score[:-1] >= score[:-1]:
+                    plan, score, path_list = new_plan, new_score, new_path_list
+        candidate_list = sorted(
+            score_map.items(), key=lambda item: item[1], reverse=True
+        )
+        return [(score, plan) for plan, score in candidate_list[: self.simulate_num]]
+
+    def get_tasks(self):
+        return [
+            (self.seed, self.game_parameter, plan.get_action_list(), self.frame_num)
+            for _, plan in self.search()
+        ]
+
+    def summarize(self, results):
+        best = max(
+            results,
+            key=lambda r: (
+                r["clear_frame"] is not None,
+                -(r["clear_frame"] or 0),
+                r["kills"],
+            ),
+        )
+        frames = sum(r["frames"] for r in results)
+        seconds = sum(r["seconds"] for r in results)
+        return {
+            "stage": self.stage,
+            "seed": self.seed,
+            "kills": best["kills"],
+            "clear_frame": best["clear_frame"],
+            "plan": best["plan"],
+            "candidates": len(results),
+            "fps": frames / seconds if seconds > 0 else 0,
+        }
+
+    def run(self, processes=None):
+        return self.summarize(_map(_evaluate_task, self.get_tasks(), processes))
+
+
+def run_stages(stages, seeds, processes=None, **kwargs):
+    """ステージとシードの組ごとに、探索から評価までを1つのプロセスで行う"""
+    tasks = [(stage, seed, kwargs) for stage in stages for seed in seeds]
+    return _map(_solve_task, tasks, processes)
+
+
+def measure_fps(seed, frame_num=60 * 60, is_fast=False):
+    """操作なしでframe_numフレーム進めたときの1秒あたりのフレーム数"""
+    simulation = LockStepSimulation(seed)
+    start = time.perf_counter()
+    simulation.run(frame_num, is_fast)
+    return frame_num / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    seed_num = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    for result in run_stages(
+        range(len(GameParameter.GAMA_PARAMS_LIST)), range(seed_num)
+    ):
+        print(
+            f"stage {result['stage']} seed {result['seed']}: "
+            f"kills {result['kills']} clear {result['clear_frame']} "
+            f"fps {result['fps']:.0f}"
+        )
+    print(f"fps: {measure_fps(0):.0f} fast: {measure_fps(0, is_fast=True):.0f}")
@@ -0,0 +1,195 @@
+import os
+import sys
+import unittest
+
+for p in ["../src/", "./"]:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), p)))
+from test_pyxel_convert_send_framework import TestFieldParent  # pylint: disable=C0413
+from framework import (  # pylint: disable=C0413
+    Image,
+    Direct,
+    Color,
+)
+from field_nodes import (  # pylint: disable=C0413
+    BulletPlayer,
+    BulletEnemy,
+    Curve,
+)
+from bullet_pool import BulletPool  # pylint: disable=C0413
+from routing import RoutingTable  # pylint: disable=C0413
+
+
+class TestBulletPool(TestFieldParent):
+    def test_mapping(self):
+        pool = BulletPool()
+        bullet = BulletPlayer(2, 3, Direct.DOWN, Color.NODE_RED)
+        pool[bullet.get_tile_pos()] = bullet
+        self.assertEqual(1, len(pool))
+        self.assertIn((2, 3), pool)
+        self.assertIs(bullet, pool[(2, 3)])
+        bullet.color = Color.NODE_GREEN
+        self.assertEqual(Color.NODE_GREEN, pool.get_color(bullet.slot))
+        self.assertEqual([(2, 3)], list(pool))
+        del pool[(2, 3)]
+        self.assertEqual(0, len(pool))
+        self.assertIsNone(bullet.pool)
+        self.assertEqual(Color.NODE_GREEN, bullet.color)
+        with self.assertRaises(KeyError):
+            _ = pool[(2, 3)]
+
+    def test_move(self):
+        pool = BulletPool()
+        bullet_list = [
+            BulletPlayer(1, 1, Direct.RIGHT),
+            BulletEnemy(3, 1, Direct.LEFT, Color.NODE_RED),
+        ]
+        for bullet in bullet_list:
+            pool[bullet.get_tile_pos()] = bullet
+        blocked_list = []
+        pool.set_blocked([(2, 1)])
+        for _ in range(8):
+            old_size = pool.move(lambda pos, b: blocked_list.append((pos, b)))
+            pool.regenerate(old_size)
+        pool.set_blocked([(2, 1)], False)
+        self.assertEqual(
+            [((2, 1), bullet_list[0]), ((2, 1), bullet_list[1])], blocked_list
+        )
+        self.assertEqual(0, len(pool))
+        self.assertEqual((16, 12), bullet_list[0].get_pos())
+        self.assertEqual((23, 12), bullet_list[1].get_pos())
+
+    def test_regenerate(self):
+        test_cases = [
+            ("player vs player", BulletPlayer, Color.NODE_BLUE, []),
+            ("enemy vs same color", BulletEnemy, Color.NODE_BLUE, []),
+            ("enemy vs other color", BulletEnemy, Color.NODE_RED, [BulletEnemy]),
+        ]
+        for case_name, cls, color, expected in test_cases:
+            with self.subTest(case_name=case_name):
+                pool = BulletPool()
+                bullet_list = [
+                    BulletPlayer(2, 1, Direct.DOWN),
+                    cls(2, 3, Direct.UP, color),
+                ]
+                for bullet in bullet_list:
+                    pool[bullet.get_tile_pos()] = bullet
+                for _ in range(8):
+                    pool.regenerate(pool.move(None))
+                self.assertEqual(expected, [type(b) for b in pool.values()])
+
+    def test_capacity(self):
+        pool = BulletPool()
+        tile_list = [(x, y) for x in range(-1, 13) for y in range(-1, 13)]
+        for num, expected in [(3, 0), (1, len(tile_list) - 14)]:
+            for pos in tile_list * num:
+                pool.append(BulletPlayer(*pos, Direct.RIGHT))
+            pool.regenerate(0)
+            self.assertEqual(expected, len(pool))
+        self.assertGreater(pool.capacity, BulletPool.INIT_CAPACITY)
+        self.assertEqual((len(pool), 0), pool.get_count())
+
+    def test_get_quiet_frames(self):
+        test_cases = [
+            ("empty", [], BulletPool.QUIET_FRAMES_MAX),
+            ("right", [BulletPlayer(1, 1, Direct.RIGHT)], 95),
+            ("left", [BulletPlayer(1, 1, Direct.LEFT)], 22),
+            ("up edge", [BulletPlayer(0, -1, Direct.UP)], 6),
+            ("node", [BulletPlayer(1, 3, Direct.RIGHT)], 31),
+            ("node left", [BulletPlayer(9, 3, Direct.LEFT)], 31),
+            (
+                "follow",
+                [BulletPlayer(1, 1, Direct.RIGHT), BulletPlayer(3, 1, Direct.RIGHT)],
+                79,
+            ),
+            (
+                "follow near",
+                [BulletPlayer(1, 1, Direct.DOWN), BulletPlayer(1, 2, Direct.DOWN)],
+                0,
+            ),
+            (
+                "face",
+                [
+                    BulletPlayer(1, 1, Direct.RIGHT),
+                    BulletEnemy(5, 1, Direct.LEFT, Color.NODE_RED),
+                ],
+                15,
+            ),
+            (
+                "other line",
+                [
+                    BulletPlayer(1, 1, Direct.RIGHT),
+                    BulletEnemy(5, 2, Direct.LEFT, Color.NODE_RED),
+                ],
+                54,
+            ),
+            (
+                "cross",
+                [BulletPlayer(1, 5, Direct.RIGHT), BulletPlayer(6, 1, Direct.DOWN)],
+                35,
+            ),
+            (
+                "cross passed",
+                [BulletPlayer(8, 5, Direct.RIGHT), BulletPlayer(6, 1, Direct.DOWN)],
+                39,
+            ),
+        ]
+        # (5, 3)にノードがある
+        table = RoutingTable({(5, 3): Curve(5, 3, False)})
+        for case_name, bullet_list, expected in test_cases:
+            with self.subTest(case_name=case_name):
+                pool = BulletPool()
+                for bullet in bullet_list:
+                    pool[bullet.get_tile_pos()] = bullet
+                self.assertEqual(expected, pool.get_quiet_frames(table))
+
+    def test_get_quiet_frames_no_hit(self):
+        # まとめて進めたあとも、1フレームずつ進めた場合と同じ弾が残る
+        bullet_list = [
+            BulletPlayer(1, 1, Direct.RIGHT),
+            BulletPlayer(3, 1, Direct.RIGHT),
+            BulletEnemy(9, 1, Direct.LEFT, Color.NODE_RED),
+            BulletPlayer(4, 6, Direct.UP),
+            BulletPlayer(0, 4, Direct.RIGHT),
+            BulletEnemy(8, 8, Direct.LEFT, Color.NODE_RED),
+        ]
+        table = RoutingTable({(5, 3): Curve(5, 3, False)})
+        pool_list = [BulletPool(), BulletPool()]
+        for pool in pool_list:
+            for bullet in bullet_list:
+                bullet = type(bullet)(
+                    *bullet.get_tile_pos(), bullet.direct, bullet.color
+                )
+                pool[bullet.get_tile_pos()] = bullet
+        frames = pool_list[0].get_quiet_frames(table)
+        self.assertGreater(frames, 8)
+        pool_list[0].advance(frames)
+        for _ in range(frames):
+            pool_list[1].regenerate(pool_list[1].move(None))
+        self.assertEqual(
+            [(pos, b.get_pos()) for pos, b in pool_list[1].items()],
+            [(pos, b.get_pos()) for pos, b in pool_list[0].items()],
+        )
+
+    def test_advance(self):
+        pool = BulletPool()
+        bullet = BulletPlayer(1, 1, Direct.DOWN)
+        pool[bullet.get_tile_pos()] = bullet
+        pool.advance(3)
+        self.assertEqual((12, 11), bullet.get_pos())
+        pool.advance(8)
+        self.assertEqual([(1, 2)], list(pool))
+        self.assertIs(bullet, pool[(1, 2)])
+
+    def test_draw(self):
+        pool = BulletPool()
+        bullet = BulletEnemy(0, 7, Direct.RIGHT, Color.NODE_YELLOW)
+        pool[bullet.get_tile_pos()] = bullet
+        pool.draw(self.test_field_view)
+        self.assertEqual(
+            [("draw_object", 0, 7 * 8 + 4, Image.ENEMY_BULLET, Color.NODE_YELLOW)],
+            self.test_field_view.get_call_params(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
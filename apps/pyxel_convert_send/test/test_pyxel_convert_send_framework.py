@@ -8,6 +8,10 @@ from framework import (  # pylint: disable=C0413
     IView,
     IFieldView,
     IInput,
+    GameObject,
+    SharedService,
+    FieldObject,
+    get_shared_instance,
 )
 
 
@@ -36,6 +40,14 @@ class TestView(IView):
     def set_pal(self, params):
         self.call_params.append(("set_pal", params))
 
+    def bake_image(self, dst_tile_x, dst_tile_y, src_tile_x, src_tile_y, direct, pal):
+        self.call_params.append(
+            ("bake_image", dst_tile_x, dst_tile_y, src_tile_x, src_tile_y, direct, pal)
+        )
+
+    def draw_baked_image(self, x, y, tile_x, tile_y):
+        self.call_params.append(("draw_baked_image", x, y, tile_x, tile_y))
+
     def get_call_params(self):
         return self.call_params
 
@@ -110,3 +122,31 @@ class TestFieldParent(TestParent):
     def tearDown(self):
         super().tearDown()
         self.patcher_view.stop()
+
+
+class TestSharedService(TestFieldParent):
+    class TestObject(FieldObject):
+        def draw(self):
+            pass
+
+    def test_get_shared_instance(self):
+        self.assertIs(get_shared_instance(TestInput), get_shared_instance(TestInput))
+        self.assertIsNot(get_shared_instance(TestInput), get_shared_instance(TestView))
+        del TestInput._instance  # pylint: disable=W0212, E1101
+        del TestView._instance  # pylint: disable=W0212, E1101
+
+    def test_lazy(self):
+        obj = self.TestObject()
+        self.assertEqual({}, vars(obj))
+        self.assertIs(self.test_view, obj.view)
+        self.assertIs(self.test_input, obj.input)
+        self.assertIs(self.test_field_view, obj.field_view)
+        self.assertIs(self.test_view, self.TestObject().view)
+        self.assertIsInstance(GameObject.view, SharedService)
+
+    def test_inject(self):
+        obj = self.TestObject()
+        view = TestView()
+        obj.view = view
+        self.assertIs(view, obj.view)
+        self.assertIs(self.test_view, self.TestObject().view)
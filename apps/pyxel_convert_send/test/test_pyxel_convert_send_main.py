@@ -24,6 +24,9 @@ from main import (  # pylint: disable=C0413
     Cursor,
     Scout,
     GameParameter,
+    LockStepSimulation,
+    ReplayMismatchError,
+    Session,
 )
 from field_nodes import (  # pylint: disable=C0413
     UnitPlayer,
@@ -51,34 +54,32 @@ class TestPyxelFieldView(TestParent):
         return super().tearDown()
 
     def append_expected(self, params, set_col):
-        if set_col is not None:
-            self.expected.append(
-                (
-                    "set_pal",
-                    [Color.WHITE, set_col],
-                )
-            )
-        self.expected.append(params)
-        if set_col is not None:
-            self.expected.append(
-                (
-                    "set_pal",
-                    [],
-                )
-            )
+        x, y, src_tile_x, src_tile_y, direct = params[1:]
+        if set_col is None and direct == Direct.RIGHT:
+            self.expected.append(params)
+            return
+        pal = {} if set_col is None else {Color.WHITE: set_col}
+        self.expected.extend(
+            [
+                ("bake_image", 0, 0, src_tile_x, src_tile_y, direct, pal),
+                ("draw_baked_image", x, y, 0, 0),
+            ]
+        )
 
     def test_draw_node(self):
         test_cases = [
-            ("no change", None),
-            ("red", Color.NODE_RED),
-            ("blue", Color.NODE_BLUE),
-            ("green", Color.NODE_GREEN),
+            ("no change", None, Direct.RIGHT),
+            ("red", Color.NODE_RED, Direct.RIGHT),
+            ("blue", Color.NODE_BLUE, Direct.RIGHT),
+            ("green", Color.NODE_GREEN, Direct.RIGHT),
+            ("rotate", None, Direct.UP),
+            ("rotate red", Color.NODE_RED, Direct.DOWN),
         ]
-        for case_name, set_col in test_cases:
-            with self.subTest(case_name=case_name, set_col=set_col):
+        for case_name, set_col, direct in test_cases:
+            with self.subTest(case_name=case_name, set_col=set_col, direct=direct):
                 self.setUp()
                 view = PyxelFieldView()
-                view.draw_node(1, 1, Node.UNIT_PLAYER, Direct.RIGHT, set_col)
+                view.draw_node(1, 1, Node.UNIT_PLAYER, direct, set_col)
                 self.append_expected(
                     (
                         "draw_image",
@@ -86,7 +87,7 @@ class TestPyxelFieldView(TestParent):
                         8 * 1 + PyxelFieldView.FIELD_OFFSET_Y,
                         4,
                         1,
-                        Direct.RIGHT,
+                        direct,
                     ),
                     set_col,
                 )
@@ -117,6 +118,36 @@ class TestPyxelFieldView(TestParent):
                 )
                 self.tearDown()
 
+    def test_bake(self):
+        view = PyxelFieldView()
+        variant_list = [
+            ((5, 0), Direct.RIGHT, Color.NODE_RED),
+            ((5, 1), Direct.UP, None),
+        ]
+        view.bake(variant_list)
+        view.bake(variant_list)
+        view.draw_object(0, 0, Image.PLAYER_BULLET, Color.NODE_RED)
+        view.draw_node(0, 0, Node.UNIT_CURVE, Direct.UP, None)
+        self.expected = [
+            ("bake_image", 0, 0, 5, 0, Direct.RIGHT, {Color.WHITE: Color.NODE_RED}),
+            ("bake_image", 1, 0, 5, 1, Direct.UP, {}),
+            ("draw_baked_image", 4, 4, 0, 0),
+            ("draw_baked_image", 8, 8, 1, 0),
+        ]
+
+    @patch.object(PyxelFieldView, "BAKE_TILE_NUM", 1)
+    def test_bake_full(self):
+        view = PyxelFieldView()
+        view.draw_object(0, 0, Image.PLAYER_BULLET, Color.NODE_RED)
+        view.draw_object(0, 0, Image.PLAYER_BULLET, Color.NODE_GREEN)
+        self.expected = [
+            ("bake_image", 0, 0, 5, 0, Direct.RIGHT, {Color.WHITE: Color.NODE_RED}),
+            ("draw_baked_image", 4, 4, 0, 0),
+            ("set_pal", [Color.WHITE, Color.NODE_GREEN]),
+            ("draw_image", 4, 4, 5, 0, Direct.RIGHT),
+            ("set_pal", []),
+        ]
+
 
 class TestField(TestFieldParent):
     def setUp(self):
@@ -427,6 +458,20 @@ class TestField(TestFieldParent):
             ]
         )
 
+    def test_get_bake_variant_list(self):
+        variant_list = Field.get_bake_variant_list()
+        self.assertEqual(len(variant_list), len(set(variant_list)))
+        self.assertLessEqual(len(variant_list), PyxelFieldView.BAKE_TILE_NUM)
+        for variant in [
+            (Image.CURVE.value, Direct.UP, None),
+            (Image.PLAYER.value, Direct.DOWN, Color.NODE_BLUE),
+            (Image.ENEMY.value, Direct.LEFT, Color.NODE_DEEP_BLUE),
+            (Image.PLAYER_BULLET.value, Direct.RIGHT, Color.NODE_GRAY),
+            (Image.ENEMY_BULLET.value, Direct.RIGHT, Color.NODE_NAVY),
+        ]:
+            with self.subTest(variant=variant):
+                self.assertIn(variant, variant_list)
+
     def test_get_random_new_player_y_pos(self):
         hgt = PyxelFieldView.FIELD_TILE_HEIGHT
         ret = self.field._get_random_new_player_y_pos()  # pylint: disable=W0212
@@ -1701,22 +1746,23 @@ class TestGameCore(TestFieldParent):
             return_value=6,
         )
         self.patcher_player_init_func.start()
+        # サブテストでsetUpを呼び直してもすべて戻す
+        self.addCleanup(self.patcher_player_init_func.stop)
         self.patcher_enemy_init_func = patch(
             "main.Field._get_random_new_enemy_y_pos",
             return_value=[6],
         )
         self.patcher_enemy_init_func.start()
+        self.addCleanup(self.patcher_enemy_init_func.stop)
         self.patcher_game_prameter_get = patch(
             "main.GameCore._get_game_parameter",
             return_value=(2, [Color.NODE_BLUE, Color.NODE_RED, Color.NODE_GREEN] * 2),
         )
         self.patcher_game_prameter_get.start()
+        self.addCleanup(self.patcher_game_prameter_get.stop)
         self.core = GameCore()
 
     def tearDown(self):
-        self.patcher_player_init_func.stop()
-        self.patcher_enemy_init_func.stop()
-        self.patcher_game_prameter_get.stop()
         self.assertEqual(
             self.expect_view_call,
             self.test_view.get_call_params(),
@@ -2222,5 +2268,143 @@ class TestGameCore(TestFieldParent):
         self.put_field_draw_result([["player_node"], ["enemy_node"]])
 
 
+class TestLockStepSimulation(TestFieldParent):
+    def _record(self, seed):
+        simulation = LockStepSimulation(seed, is_record=True)
+        player = simulation.field.unit_list[0]
+        for frame in range(200):
+            if frame == 5:
+                simulation.act(Action.SPLIT, 4, player.tile_y)
+            elif frame == 60:
+                simulation.act(Action.FIELD, 4, player.tile_y)
+            elif frame == 120:
+                simulation.act(Action.DELETE, 4, player.tile_y)
+            simulation.step()
+        return simulation
+
+    def test_seed(self):
+        def get_layout(seed):
+            field = LockStepSimulation(seed).field
+            return field.enemy_split_num, [
+                (unit.get_tile_pos(), unit.get_color()) for unit in field.unit_list
+            ]
+
+        self.assertEqual(get_layout(1), get_layout(1))
+        self.assertNotEqual(
+            [get_layout(seed) for seed in range(5)],
+            [get_layout(seed) for seed in range(5, 10)],
+        )
+
+    def test_record(self):
+        simulation = self._record(3)
+        session = simulation.session
+        self.assertEqual(200, simulation.frame)
+        self.assertEqual(
+            [Action.SPLIT, Action.FIELD, Action.DELETE],
+            [action for _, action, _, _ in session.action_list],
+        )
+        self.assertEqual([5, 60, 120], [frame for frame, *_ in session.action_list])
+        self.assertEqual(200, len(session.bullet_count_list))
+        self.assertTrue(any(count[0] > 1 for count in session.bullet_count_list))
+
+    def test_no_record(self):
+        simulation = LockStepSimulation(3)
+        simulation.act(Action.SPLIT, 4, simulation.field.unit_list[0].tile_y)
+        simulation.run(100)
+        simulation.run(100, is_fast=True)
+        self.assertEqual(200, simulation.frame)
+        self.assertEqual(
+            Session(3, simulation.session.game_parameter), simulation.session
+        )
+
+    def test_replay(self):
+        session = self._record(3).session
+        simulation = LockStepSimulation.replay(session)
+        self.assertEqual(session, simulation.session)
+        self.assertEqual(session, Session.from_dict(session.to_dict()))
+
+    def test_replay_mismatch(self):
+        session = self._record(3).session
+        session.action_list = session.action_list[1:]
+        with self.assertRaises(ReplayMismatchError) as cm:
+            LockStepSimulation.replay(session)
+        self.assertGreater(cm.exception.frame, 5)
+        simulation = LockStepSimulation.replay(session, is_check=False)
+        self.assertEqual(len(session.bullet_count_list), simulation.frame)
+
+    def test_run_fast(self):
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                normal = LockStepSimulation(seed, is_record=True)
+                fast = LockStepSimulation(seed, is_record=True)
+                normal.run(300)
+                fast.run(300, is_fast=True)
+                self.assertEqual(300, fast.frame)
+                self.assertEqual(
+                    normal.session.bullet_count_list, fast.session.bullet_count_list
+                )
+
+    def test_replay_fast(self):
+        session = self._record(3).session
+        simulation = LockStepSimulation.replay(session, is_fast=True)
+        self.assertEqual(session, simulation.session)
+
+    def test_get_quiet_frames(self):
+        simulation = LockStepSimulation(3)
+        field = simulation.field
+        frames = field.get_quiet_frames()
+        self.assertGreater(frames, 0)
+        self.assertEqual(0, len(field.bullet_map))
+        field.skip(frames)
+        self.assertEqual(0, field.get_quiet_frames())
+        simulation.step()
+        self.assertGreater(len(field.bullet_map), 0)
+        # 弾はタイルをまたいで進められ、次に撃つフレームの手前で止まる
+        self.assertEqual(
+            min(unit.max_interval - unit.interval for unit in field.unit_list),
+            field.get_quiet_frames(),
+        )
+        self.assertGreater(field.get_quiet_frames(), 7)
+
+    def test_run_fast_update_num(self):
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                simulation = LockStepSimulation(seed)
+                with patch.object(
+                    simulation.field, "update", wraps=simulation.field.update
+                ) as update:
+                    simulation.run(600, is_fast=True)
+                # 弾がタイルをまたいでも止まらず、撃つフレームの前後だけ更新する
+                self.assertLess(update.call_count, 600 // 3)
+
+    def test_routing_table(self):
+        field = LockStepSimulation(3).field
+        table = field.get_routing_table()
+        self.assertIs(table, field.get_routing_table())
+        tile_y = field.unit_list[0].tile_y
+        for case_name, func in [
+            ("build", lambda: field.build(Action.CURVE, 4, tile_y)),
+            ("mainte", lambda: field.mainte(4, tile_y)),
+            ("delete", lambda: field.delete(4, tile_y)),
+        ]:
+            with self.subTest(case_name=case_name):
+                func()
+                self.assertIsNot(table, field.get_routing_table())
+                table = field.get_routing_table()
+                self.assertEqual(field.node_map, table.node_map)
+
+    def test_game_core(self):
+        core = GameCore(seed=7)
+        self.assertEqual(core.simulation.field, core.field)
+        other = GameCore(seed=7).simulation.session
+        self.assertEqual(core.simulation.session.seed, other.seed)
+        self.assertEqual(core.simulation.session.game_parameter, other.game_parameter)
+        for _ in range(3):
+            core.update()
+        self.assertEqual(3, core.simulation.frame)
+        # 遊んでいる間は記録しない
+        self.assertEqual([], core.simulation.session.bullet_count_list)
+
+
 if __name__ == "__main__":
     unittest.main()
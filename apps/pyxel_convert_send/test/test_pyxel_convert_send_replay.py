@@ -0,0 +1,42 @@
+import io
+import os
+import sys
+import unittest
+
+for p in ["../src/", "./"]:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), p)))
+from test_pyxel_convert_send_framework import TestFieldParent  # pylint: disable=C0413
+from main import LockStepSimulation  # pylint: disable=C0413
+from replay import (  # pylint: disable=C0413
+    load_session,
+    record_random_session,
+    run_benchmark,
+    save_session,
+)
+
+
+class TestReplay(TestFieldParent):
+    def test_record_random_session(self):
+        session = record_random_session(1, 300, action_interval=10)
+        self.assertEqual(session, record_random_session(1, 300, action_interval=10))
+        self.assertNotEqual(session, record_random_session(2, 300, action_interval=10))
+        self.assertEqual(30, len(session.action_list))
+        self.assertEqual(300, len(session.bullet_count_list))
+        self.assertEqual(session, LockStepSimulation.replay(session).session)
+
+    def test_save_session(self):
+        session = record_random_session(1, 100)
+        file = io.StringIO()
+        save_session(session, file)
+        file.seek(0)
+        self.assertEqual(session, load_session(file))
+
+    def test_run_benchmark(self):
+        result = run_benchmark(record_random_session(1, 50), number=1, repeat=1)
+        self.assertEqual(50, result["frames"])
+        self.assertGreater(result["per_frame"], 0)
+        self.assertGreater(result["fps"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import sys
+import unittest
+
+for p in ["../src/", "./"]:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), p)))
+from test_pyxel_convert_send_framework import TestFieldParent  # pylint: disable=C0413
+from framework import (  # pylint: disable=C0413
+    Direct,
+    Color,
+)
+from field_nodes import (  # pylint: disable=C0413
+    UnitPlayer,
+    UnitEnemy,
+    Curve,
+    Convert,
+    Split,
+    Merge,
+)
+from routing import RoutingTable  # pylint: disable=C0413
+
+
+class TestRoutingTable(TestFieldParent):
+    def setUp(self):
+        super().setUp()
+        # (0, 6)の自機から右へ撃つと(4, 6)で分かれ、(4, 9)の変換を通って
+        # (11, 9)の敵に当たる
+        split = Split(4, 6)
+        split.direct = Direct.DOWN
+        convert = Convert(4, 9)
+        convert.color = Color.NODE_RED
+        curve = Curve(4, 10, False)
+        self.node_map = {
+            (0, 6): UnitPlayer(0, 6),
+            (11, 6): UnitEnemy(11, 6),
+            (4, 6): split,
+            (4, 9): convert,
+            (11, 9): UnitEnemy(11, 9),
+            (7, 3): Merge(7, 3),
+        }
+        self.table = RoutingTable(self.node_map)
+
+    def test_get_next(self):
+        test_cases = [
+            ("node", ((1, 6), Direct.RIGHT), ((4, 6), 3)),
+            ("unit", ((5, 6), Direct.RIGHT), ((11, 6), 6)),
+            ("out", ((5, 6), Direct.UP), (None, 8)),
+            ("out left", ((0, 0), Direct.LEFT), (None, 2)),
+            ("merge", ((7, 11), Direct.UP), ((7, 3), 8)),
+        ]
+        for case_name, (tile_pos, direct), expected in test_cases:
+            with self.subTest(case_name=case_name):
+                self.assertEqual(expected, self.table.get_next(tile_pos, direct))
+
+    def test_get(self):
+        test_cases = [
+            (
+                "split",
+                ((1, 6), Direct.RIGHT, Color.NODE_BLUE),
+                (
+                    (4, 6),
+                    3,
+                    [
+                        ((4, 7), Direct.DOWN, Color.NODE_BLUE),
+                        ((5, 6), Direct.RIGHT, Color.NODE_BLUE),
+                    ],
+                ),
+            ),
+            (
+                "split reject",
+                ((4, 8), Direct.UP, Color.NODE_BLUE),
+                ((4, 6), 2, []),
+            ),
+            (
+                "convert",
+                ((4, 7), Direct.DOWN, Color.NODE_BLUE),
+                ((4, 9), 2, [((4, 10), Direct.DOWN, Color.NODE_RED)]),
+            ),
+            ("unit", ((5, 6), Direct.RIGHT, Color.NODE_BLUE), ((11, 6), 6, None)),
+            ("merge", ((7, 11), Direct.UP, Color.NODE_BLUE), ((7, 3), 8, None)),
+            ("out", ((5, 6), Direct.UP, Color.NODE_BLUE), (None, 8, [])),
+        ]
+        for case_name, params, expected in test_cases:
+            with self.subTest(case_name=case_name):
+                self.assertEqual(expected, self.table.get(*params))
+
+    def test_trace(self):
+        segment_list = []
+        ret = self.table.trace((1, 6), Direct.RIGHT, Color.NODE_BLUE, segment_list)
+        self.assertEqual(
+            [
+                ((1, 6), Direct.RIGHT, 3),
+                ((5, 6), Direct.RIGHT, 6),
+                ((4, 7), Direct.DOWN, 2),
+                ((4, 10), Direct.DOWN, 3),
+            ],
+            segment_list,
+        )
+        self.assertEqual(
+            sorted(
+                [
+                    ((11, 6), Direct.RIGHT, Color.NODE_BLUE, 3 + 1 + 6),
+                ]
+            ),
+            sorted(ret),
+        )
+        self.node_map[(4, 10)] = Curve(4, 10, True)
+        self.node_map[(4, 10)].direct = Direct.RIGHT
+        del self.node_map[(4, 9)]
+        self.node_map[(4, 9)] = Curve(4, 9, True)
+        self.node_map[(4, 9)].direct = Direct.RIGHT
+        ret = RoutingTable(self.node_map).trace((1, 6), Direct.RIGHT, Color.NODE_BLUE)
+        self.assertEqual(
+            sorted(
+                [
+                    ((11, 6), Direct.RIGHT, Color.NODE_BLUE, 10),
+                    ((11, 9), Direct.RIGHT, Color.NODE_BLUE, 3 + 1 + 2 + 1 + 6),
+                ]
+            ),
+            sorted(ret),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+import os
+import random
+import sys
+import unittest
+from unittest.mock import patch
+
+for p in ["../src/", "./"]:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), p)))
+from test_pyxel_convert_send_framework import TestFieldParent  # pylint: disable=C0413
+from framework import Color  # pylint: disable=C0413
+from main import (
+    Action,
+    Field,
+    GameParameter,
+    LockStepSimulation,
+)  # pylint: disable=C0413
+from solver import (  # pylint: disable=C0413
+    Plan,
+    StageSolver,
+    evaluate_plan,
+    get_route_result,
+    get_stage_parameter,
+    make_block_plan,
+    measure_fps,
+    run_stages,
+)
+
+# ステージ0・シード0では自機が(0, 6)、赤い敵が(11, 6)にいる
+RED_PLAN = Plan({(4, 6): (Action.CONVERT, 1)})
+# ステージ3・シード0の紫の敵(11, 4)へ、青と赤をMergeで合わせて撃つ
+PURPLE_PLAN = Plan(
+    {
+        (3, 6): (Action.SPLIT, 1),
+        (5, 6): (Action.CONVERT, 1),
+        (7, 6): (Action.CURVE_REV, 3),
+        (7, 4): (Action.MERGE, 0),
+        (3, 9): (Action.CURVE_REV, 0),
+        (9, 9): (Action.CURVE_REV, 3),
+        (9, 2): (Action.CURVE_REV, 2),
+        (7, 2): (Action.CURVE_REV, 1),
+    }
+)
+
+
+class TestSolver(TestFieldParent):
+    def test_plan(self):
+        plan = Plan(
+            {
+                (4, 6): (Action.CONVERT, 2),
+                (4, 7): (Action.SPLIT, 0),
+                (2, 1): (Action.CURVE, 1),
+            }
+        )
+        simulation = LockStepSimulation(0, get_stage_parameter(0), is_record=True)
+        plan.apply(simulation)
+        self.assertEqual(
+            Plan({(2, 1): (Action.CURVE, 1), (4, 6): (Action.CONVERT, 2)}), plan
+        )
+        self.assertEqual(
+            [
+                (Action.CURVE, 2, 1),
+                (Action.FIELD, 2, 1),
+                (Action.CONVERT, 4, 6),
+                (Action.FIELD, 4, 6),
+                (Action.FIELD, 4, 6),
+            ],
+            plan.get_action_list(),
+        )
+        self.assertEqual(
+            plan.get_action_list(),
+            [tuple(action) for _, *action in simulation.session.action_list],
+        )
+        self.assertEqual(Color.NODE_GREEN, simulation.field.node_map[(4, 6)].color)
+
+    def test_mutate(self):
+        rand = random.Random(0)
+        plan = Plan()
+        for _ in range(20):
+            new_plan = plan.mutate(rand, [(1, 1)])
+            self.assertLessEqual(set(new_plan.node_map), {(1, 1)})
+            plan = new_plan
+        self.assertEqual({}, Plan().node_map)
+
+    def test_get_route_result(self):
+        test_cases = [
+            (
+                "no node",
+                0,
+                6,
+                Plan(),
+                (set(), set(), {(11, 6)}, {Color.NODE_BLUE}, 0),
+            ),
+            (
+                "convert",
+                0,
+                6,
+                RED_PLAN,
+                ({(11, 6)}, set(), {(11, 6)}, {Color.NODE_BLUE, Color.NODE_RED}, 0),
+            ),
+            (
+                "block",
+                0,
+                6,
+                Plan({(9, 6): (Action.CONVERT, 2)}),
+                (set(), {(11, 6)}, {(11, 6)}, {Color.NODE_BLUE, Color.NODE_GREEN}, 0),
+            ),
+            (
+                "merge",
+                3,
+                4,
+                PURPLE_PLAN,
+                (
+                    {(11, 4)},
+                    set(),
+                    {(11, 4)},
+                    {Color.NODE_BLUE, Color.NODE_RED, Color.NODE_PURPLE},
+                    1,
+                ),
+            ),
+        ]
+        for case_name, stage, enemy_y, plan, expected in test_cases:
+            with self.subTest(case_name=case_name), patch.object(
+                Field, "_get_random_new_enemy_y_pos", return_value=[enemy_y]
+            ):
+                simulation = LockStepSimulation(0, get_stage_parameter(stage))
+                Plan(plan.node_map).apply(simulation)
+                *result, path_set = get_route_result(simulation.field)
+                self.assertEqual(expected, tuple(result))
+                self.assertIn((1, 6), path_set)
+
+    def test_evaluate_plan(self):
+        action_list = RED_PLAN.get_action_list()
+        result = evaluate_plan(0, get_stage_parameter(0), action_list, 600)
+        self.assertGreaterEqual(result["kills"], 1)
+        self.assertIsNone(result["clear_frame"])
+        self.assertEqual(600, result["frames"])
+        self.assertEqual(action_list, result["plan"])
+        normal = evaluate_plan(0, get_stage_parameter(0), action_list, 600, False)
+        for key in ["kills", "clear_frame", "player_hp", "frames"]:
+            with self.subTest(key=key):
+                self.assertEqual(normal[key], result[key])
+
+    def test_make_block_plan(self):
+        for stage, _ in enumerate(GameParameter.GAMA_PARAMS_LIST):
+            with self.subTest(stage=stage):
+                parameter = get_stage_parameter(stage)
+                plan = make_block_plan(LockStepSimulation(0, parameter).field)
+                action_list = plan.get_action_list()
+                result = evaluate_plan(0, parameter, action_list, 600)
+                self.assertIsNotNone(result["clear_frame"])
+                normal = evaluate_plan(0, parameter, action_list, 600, False)
+                self.assertEqual(normal["clear_frame"], result["clear_frame"])
+                self.assertEqual(normal["frames"], normal["clear_frame"])
+
+    def test_search(self):
+        solver = StageSolver(0, 0, restart_num=2, iteration_num=50, simulate_num=4)
+        candidate_list = solver.search()
+        self.assertEqual(4, len(candidate_list))
+        score_list = [score for score, _ in candidate_list]
+        self.assertEqual(sorted(score_list, reverse=True), score_list)
+        self.assertEqual(1, score_list[0][0])
+        self.assertEqual(candidate_list, solver.search())
+
+    def test_run(self):
+        solver = StageSolver(
+            0, 0, frame_num=600, restart_num=2, iteration_num=50, simulate_num=2
+        )
+        result = solver.run(processes=1)
+        self.assertEqual(
+            (0, 0, 2), (result["stage"], result["seed"], result["candidates"])
+        )
+        self.assertIsNotNone(result["clear_frame"])
+        self.assertGreater(result["fps"], 0)
+
+    def test_run_all_stages(self):
+        # 同梱のステージはどれも、どのシードでも敵の弾を止めてクリアできる
+        params = {"restart_num": 1, "iteration_num": 10, "simulate_num": 1}
+        stages = range(len(GameParameter.GAMA_PARAMS_LIST))
+        for result in run_stages(stages, range(4), processes=1, **params):
+            with self.subTest(stage=result["stage"], seed=result["seed"]):
+                self.assertIsNotNone(result["clear_frame"])
+
+    def test_run_stages(self):
+        def drop_fps(result_list):
+            return [{k: v for k, v in r.items() if k != "fps"} for r in result_list]
+
+        params = {"frame_num": 60, "restart_num": 1, "iteration_num": 5}
+        result_list = run_stages([0, 1], [0], processes=2, **params)
+        self.assertEqual(
+            [(0, 0), (1, 0)], [(r["stage"], r["seed"]) for r in result_list]
+        )
+        self.assertEqual(
+            drop_fps(result_list),
+            drop_fps(run_stages([0, 1], [0], processes=1, **params)),
+        )
+
+    def test_measure_fps(self):
+        self.assertGreater(measure_fps(0, 60), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
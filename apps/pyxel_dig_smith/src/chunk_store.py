@@ -0,0 +1,185 @@
+from collections.abc import MutableMapping, MutableSet
+
+CHUNK_BITS = 4
+CHUNK_SIZE = 1 << CHUNK_BITS
+CHUNK_MASK = CHUNK_SIZE - 1
+CHUNK_CELLS = CHUNK_SIZE * CHUNK_SIZE
+
+
+def get_chunk_key(pos):
+    return pos[0] >> CHUNK_BITS, pos[1] >> CHUNK_BITS
+
+
+def get_chunk_index(pos):
+    return ((pos[1] & CHUNK_MASK) << CHUNK_BITS) | (pos[0] & CHUNK_MASK)
+
+
+def get_chunk_pos(chunk_key, index):
+    return (
+        (chunk_key[0] << CHUNK_BITS) | (index & CHUNK_MASK),
+        (chunk_key[1] << CHUNK_BITS) | (index >> CHUNK_BITS),
+    )
+
+
+class ChunkedCellSet(MutableSet):
+    """座標の集合を、固定サイズのチャンクごとのビット列で保持する"""
+
+    def __init__(self, pos_list=()):
+        # chunk_key -> [ビット列, セル数]
+        self.chunk_map = {}
+        self.num = 0
+        for pos in pos_list:
+            self.add(pos)
+
+    def __contains__(self, pos):
+        chunk = self.chunk_map.get((pos[0] >> CHUNK_BITS, pos[1] >> CHUNK_BITS))
+        if chunk is None:
+            return False
+        index = ((pos[1] & CHUNK_MASK) << CHUNK_BITS) | (pos[0] & CHUNK_MASK)
+        return chunk[0][index >> 3] >> (index & 7) & 1 == 1
+
+    def __iter__(self):
+        for chunk_key in list(self.chunk_map):
+            yield from self.iter_chunk(chunk_key)
+
+    def __len__(self):
+        return self.num
+
+    def __repr__(self):
+        return f"{type(self).__name__}({set(self)!r})"
+
+    def add(self, pos):
+        chunk_key = get_chunk_key(pos)
+        chunk = self.chunk_map.get(chunk_key)
+        if chunk is None:
+            chunk = self.chunk_map[chunk_key] = [bytearray(CHUNK_CELLS // 8), 0]
+        index = get_chunk_index(pos)
+        bit = 1 << (index & 7)
+        if chunk[0][index >> 3] & bit:
+            return
+        chunk[0][index >> 3] |= bit
+        chunk[1] += 1
+        self.num += 1
+
+    def discard(self, pos):
+        chunk_key = get_chunk_key(pos)
+        chunk = self.chunk_map.get(chunk_key)
+        if chunk is None:
+            return
+        index = get_chunk_index(pos)
+        bit = 1 << (index & 7)
+        if not chunk[0][index >> 3] & bit:
+            return
+        chunk[0][index >> 3] &= ~bit
+        chunk[1] -= 1
+        self.num -= 1
+        if chunk[1] == 0:
+            del self.chunk_map[chunk_key]
+
+    def iter_chunk(self, chunk_key):
+        chunk = self.chunk_map.get(chunk_key)
+        if chunk is None:
+            return
+        for byte_index, byte in enumerate(chunk[0]):
+            if byte == 0:
+                continue
+            for bit_index in range(8):
+                if byte >> bit_index & 1:
+                    yield get_chunk_pos(chunk_key, (byte_index << 3) | bit_index)
+
+    def get_chunk_keys(self):
+        return self.chunk_map.keys()
+
+    def get_chunk_bits(self, chunk_key):
+        return bytes(self.chunk_map[chunk_key][0])
+
+    def set_chunk_bits(self, chunk_key, bits):
+        chunk = self.chunk_map.pop(chunk_key, None)
+        if chunk is not None:
+            self.num -= chunk[1]
+        bits = bytearray(bits)
+        count = sum(bin(byte).count("1") for byte in bits)
+        if count == 0:
+            return
+        self.chunk_map[chunk_key] = [bits, count]
+        self.num += count
+
+
+class ChunkedValueMap(MutableMapping):
+    """座標 -> 値の対応を、チャンクごとの値IDの配列で保持する
+
+    値は生成時に渡した候補リストの要素に限られ、1セル1バイトで格納される。
+    """
+
+    def __init__(self, value_list, pos_value_map=None):
+        self.value_list = (None, *value_list)
+        self.value_id_map = {v: i for i, v in enumerate(self.value_list) if i > 0}
+        # chunk_key -> [値IDの配列, セル数]
+        self.chunk_map = {}
+        self.num = 0
+        if pos_value_map is not None:
+            self.update(pos_value_map)
+
+    def __getitem__(self, pos):
+        value = self.get(pos)
+        if value is None:
+            raise KeyError(pos)
+        return value
+
+    def get(self, pos, default=None):
+        chunk = self.chunk_map.get((pos[0] >> CHUNK_BITS, pos[1] >> CHUNK_BITS))
+        if chunk is None:
+            return default
+        value_id = chunk[0][
+            ((pos[1] & CHUNK_MASK) << CHUNK_BITS) | (pos[0] & CHUNK_MASK)
+        ]
+        return default if value_id == 0 else self.value_list[value_id]
+
+    def __contains__(self, pos):
+        return self.get(pos) is not None
+
+    def __setitem__(self, pos, value):
+        value_id = self.value_id_map[value]
+        chunk_key = get_chunk_key(pos)
+        chunk = self.chunk_map.get(chunk_key)
+        if chunk is None:
+            chunk = self.chunk_map[chunk_key] = [bytearray(CHUNK_CELLS), 0]
+        index = get_chunk_index(pos)
+        if chunk[0][index] == 0:
+            chunk[1] += 1
+            self.num += 1
+        chunk[0][index] = value_id
+
+    def __delitem__(self, pos):
+        chunk_key = get_chunk_key(pos)
+        chunk = self.chunk_map.get(chunk_key)
+        index = get_chunk_index(pos)
+        if chunk is None or chunk[0][index] == 0:
+            raise KeyError(pos)
+        chunk[0][index] = 0
+        chunk[1] -= 1
+        self.num -= 1
+        if chunk[1] == 0:
+            del self.chunk_map[chunk_key]
+
+    def __iter__(self):
+        for chunk_key in list(self.chunk_map):
+            for pos, _ in self.iter_chunk(chunk_key):
+                yield pos
+
+    def __len__(self):
+        return self.num
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    def iter_chunk(self, chunk_key):
+        chunk = self.chunk_map.get(chunk_key)
+        if chunk is None:
+            return
+        for index, value_id in enumerate(chunk[0]):
+            if value_id != 0:
+                yield get_chunk_pos(chunk_key, index), self.value_list[value_id]
+
+    def get_chunk_keys(self):
+        return self.chunk_map.keys()
@@ -2,6 +2,7 @@
 # author: masatobu
 
 from abc import ABC, abstractmethod
+from bisect import bisect_right
 from enum import Enum
 import math
 
@@ -48,57 +49,47 @@ class IFieldGenerator(ABC):
 
     @classmethod
     def get_lightest_path(cls, start_pos, rel_pos, dig_pos_set):
+        """最短距離の経路のうち、掘る必要のあるマスが最も少ない経路を返す
+
+        距離が第一優先のため、経路上のマスはゴールまでのマンハッタン距離が
+        1歩ごとに1ずつ減るものに限られる（start/goalを囲む矩形からは出ない）。
+        その条件で枝刈りしたA*(h=マンハッタン距離)を距離の層ごとに進めるため、
+        各マスは一度だけ展開される。
+        """
         start = start_pos
         goal = (start_pos[0] + rel_pos[0], start_pos[1] + rel_pos[1])
 
-        # 探索範囲制限
-        min_x = min(start[0], goal[0]) - 1
-        max_x = max(start[0], goal[0]) + 1
-        min_y = min(start[1], goal[1]) - 1
-        max_y = max(start[1], goal[1]) + 1
-
-        def in_range(p):
-            return min_x <= p[0] <= max_x and min_y <= p[1] <= max_y
-
-        # pos -> (dist, cost)
-        best = {start: (0, 0)}
+        # pos -> cost
+        best = {start: 0}
         prev = {}
 
-        queue = [start]
-        head = 0
-
-        while head < len(queue):
-            cur = queue[head]
-            head += 1
-
-            cur_dist, cur_cost = best[cur]
-
-            if cur == goal:
-                continue
-
-            for dx, dy in [(0, 1), (1, 0), (-1, 0), (0, -1)]:
-                nxt = (cur[0] + dx, cur[1] + dy)
-                if not in_range(nxt):
-                    continue
-
-                nd = cur_dist + 1
-
-                # コスト計算
-                if nxt[1] <= 1 or nxt in dig_pos_set:
-                    step_cost = 0
-                else:
-                    step_cost = 1
-
-                nc = cur_cost + step_cost
-
-                if (
-                    nxt not in best
-                    or nd < best[nxt][0]
-                    or (nd == best[nxt][0] and nc < best[nxt][1])
-                ):
-                    best[nxt] = (nd, nc)
+        layer = [start]
+        rest = abs(rel_pos[0]) + abs(rel_pos[1])
+        while rest > 0:
+            rest -= 1
+            next_layer = []
+            for cur in layer:
+                cur_cost = best[cur]
+                for dx, dy in [(0, 1), (1, 0), (-1, 0), (0, -1)]:
+                    nxt = (cur[0] + dx, cur[1] + dy)
+                    if abs(goal[0] - nxt[0]) + abs(goal[1] - nxt[1]) != rest:
+                        continue
+
+                    # コスト計算
+                    if nxt[1] <= 1 or nxt in dig_pos_set:
+                        step_cost = 0
+                    else:
+                        step_cost = 1
+
+                    nc = cur_cost + step_cost
+
+                    if nxt not in best:
+                        next_layer.append(nxt)
+                    elif nc >= best[nxt]:
+                        continue
+                    best[nxt] = nc
                     prev[nxt] = cur
-                    queue.append(nxt)
+            layer = next_layer
 
         # 経路復元
         path = [goal]
@@ -140,31 +131,94 @@ class FieldGenerator(IFieldGenerator):
     }
     # FLAT_APPEAR_RATE_MAP = {Item.COAL: 0.2}  # for test stability
 
+    # 深さごとの出現閾値を事前計算しておく範囲（範囲外は都度計算）
+    APPEAR_TABLE_DEPTH = 256
+
     def __init__(self):
         self.pickaxe_power_map = {
             p: self.LAYERS[i][0][1] if i < len(self.LAYERS) else None
             for i, p in enumerate(sorted(Pickaxe, key=lambda e: e.value[0]))
         }
+        self.appear_table = None
+        self._appear_params = None
+        self.rebuild_appear_table()
+
+    def _get_appear_params(self):
+        return (
+            self.APPEAR_PEAK_MAP,
+            self.FLAT_APPEAR_RATE_MAP,
+            self.APPEAR_TABLE_DEPTH,
+        )
+
+    def rebuild_appear_table(self):
+        """今の出現パラメータで深さごとの閾値を作り直す
+
+        定数の差し替えは次の参照時に検知して作り直すので、
+        辞書をその場で書き換えたときだけ呼べばよい。
+        """
+        self._appear_params = self._get_appear_params()
+        self.appear_table = [
+            self._make_appear_row(y) for y in range(self.APPEAR_TABLE_DEPTH)
+        ]
 
     def get_hash(self, value):
         return hash(value)
 
     def get_item(self, axis_x, axis_y):
+        threshold_list, item_list = self._get_appear_row(axis_y)
+        index = bisect_right(threshold_list, self._get_rate(axis_x, axis_y))
+        return item_list[index] if index < len(item_list) else None
+
+    def get_items(self, axis_x, axis_y, width, height):
+        """矩形領域の出現アイテムを行ごとのリストで返す"""
+        ret = []
+        for y in range(axis_y, axis_y + height):
+            threshold_list, item_list = self._get_appear_row(y)
+            item_num = len(item_list)
+            row = []
+            for x in range(axis_x, axis_x + width):
+                index = bisect_right(threshold_list, self._get_rate(x, y))
+                row.append(item_list[index] if index < item_num else None)
+            ret.append(row)
+        return ret
+
+    def _get_appear_row(self, y):
+        params = self._appear_params
+        if (
+            params[0] is not self.APPEAR_PEAK_MAP
+            or params[1] is not self.FLAT_APPEAR_RATE_MAP
+            or params[2] != self.APPEAR_TABLE_DEPTH
+        ):
+            self.rebuild_appear_table()
+        if 0 <= y < self.APPEAR_TABLE_DEPTH:
+            return self.appear_table[y]
+        return self._make_appear_row(y)
+
+    def _make_appear_row(self, y):
+        # Itemの判定順に、それより前の閾値を超えるものだけを昇順で残す
+        # rateを超える閾値を最初に持つItemがget_itemの結果になる
+        threshold_list = []
+        item_list = []
         for item in Item:
-            if self._is_appear(axis_x, axis_y, item):
-                return item
-        return None
+            threathold = self._get_threshold(y, item)
+            if len(threshold_list) == 0 or threathold > threshold_list[-1]:
+                threshold_list.append(threathold)
+                item_list.append(item)
+        return threshold_list, item_list
 
-    def _is_appear(self, x, y, item):
-        rate = (self.get_hash((x, y)) % 10000) / 10000
+    def _get_rate(self, x, y):
+        return (self.get_hash((x, y)) % 10000) / 10000
+
+    def _get_threshold(self, y, item):
         if item in self.FLAT_APPEAR_RATE_MAP:
             # FLAT_APPEAR_RATE_MAP は (threshold_y, flat_prob) タプル形式で統一
             # threshold_y以上のみ出現、未満は出現しない（確率0）
             threshold_y, flat_prob = self.FLAT_APPEAR_RATE_MAP[item]
-            threathold = flat_prob if y >= threshold_y else 0.0
-        else:
-            threathold = self._normal_pdf(y, self.APPEAR_PEAK_MAP[item])
-        return rate < threathold
+            return flat_prob if y >= threshold_y else 0.0
+        return self._normal_pdf(y, self.APPEAR_PEAK_MAP[item])
+
+    def _is_appear(self, x, y, item):
+        return self._get_rate(x, y) < self._get_threshold(y, item)
 
     def _normal_pdf(self, x, mu=0, sigma=3, amplify=1.4):
         """
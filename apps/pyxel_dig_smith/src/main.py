@@ -11,6 +11,12 @@ try:
         Pickaxe,
         PickaxeGenerator,
     )  # pylint: disable=C0413
+    from .chunk_store import ChunkedCellSet, ChunkedValueMap  # pylint: disable=C0413
+    from .report_store import (
+        RecordType,
+        ReportStore,
+        SaveRecord,
+    )  # pylint: disable=C0413
 except ImportError:
     from logic import (
         FieldGenerator,
@@ -18,6 +24,12 @@ except ImportError:
         Pickaxe,
         PickaxeGenerator,
     )  # pylint: disable=C0413
+    from chunk_store import ChunkedCellSet, ChunkedValueMap  # pylint: disable=C0413
+    from report_store import (
+        RecordType,
+        ReportStore,
+        SaveRecord,
+    )  # pylint: disable=C0413
 
 
 class IView(ABC):
@@ -293,52 +305,117 @@ def get_hash(value):
 
 class Field(GameObject):
     SKYLINE_Y = 1
+    # 画面外に出たタイルのキャッシュを捨てる閾値
+    TILE_CACHE_MAX = GameObject.TILE_SIZE**2 * 4
 
     def __init__(self, center_pos):
         super().__init__()
+        self.tile_cache = {}
         self.dig_pos_set = {(2, 3)}
         self.center_pos = center_pos
-        self.ores_map = {(2, 3): Ore((2, 3), Item.METAL_1)}
+        self.ores_map = {(2, 3): Item.METAL_1}
         self.field_generator = FieldGenerator.create()
         self.furnace = Furnace((0, 1))
+        # 前回のセーブ以降の変更
+        self.dug_list = []
+        self.ore_changed_set = set()
+
+    @property
+    def dig_pos_set(self):
+        return self._dig_pos_set
+
+    @dig_pos_set.setter
+    def dig_pos_set(self, value):
+        # 掘った位置はチャンク単位のビット列で保持する
+        self._dig_pos_set = ChunkedCellSet(value)
+        self.tile_cache.clear()
+        self._ore_diff_map = None
+
+    @property
+    def ores_map(self):
+        return self._ores_map
+
+    @ores_map.setter
+    def ores_map(self, value):
+        # 掘り出した鉱石は位置 -> Itemとしてチャンク単位で保持する
+        self._ores_map = ChunkedValueMap(tuple(Item), value)
+        self.tile_cache.clear()
+        self._ore_diff_map = None
+
+    @property
+    def field_generator(self):
+        return self._field_generator
+
+    @field_generator.setter
+    def field_generator(self, value):
+        self._field_generator = value
+        self._ore_diff_map = None
 
     def draw(self):
         clip_rect = GameObject.CAMERA_RECT
         self.view.set_clip(clip_rect)
-        ore_pos_set = self.ores_map.keys()
+        if len(self.tile_cache) > self.TILE_CACHE_MAX:
+            self.tile_cache.clear()
+        ore_list = []
         for rel_x in range(GameObject.TILE_SIZE):
             for rel_y in range(GameObject.TILE_SIZE):
                 abs_axis = self._convert_to_abs_pos((rel_x, rel_y))
-                abs_px = tuple(a * 8 for a in abs_axis)
-                if abs_axis[1] < self.SKYLINE_Y - 1:
-                    self.view.draw_rect(*abs_px, 8, 8, Color.BLUE, True)
-                    continue
-                if abs_axis[1] == self.SKYLINE_Y:
-                    self.view.draw_rect(*abs_px, 8, 8, Color.SKY_BLUE, True)
+                ore = self.ores_map.get(abs_axis)
+                if ore is not None:
+                    ore_list.append((abs_axis, ore))
+                color, image_pos, appeared_item = self._get_tile(abs_axis)
+                if color is not None:
+                    self.view.draw_rect(
+                        abs_axis[0] * 8, abs_axis[1] * 8, 8, 8, color, True
+                    )
                     continue
-                if abs_axis in self.dig_pos_set | ore_pos_set:
+                if image_pos is None:
                     continue
-                if abs_axis[1] == self.SKYLINE_Y - 1:
-                    image_pos = (4, 3)
-                elif abs_axis[1] == 2 or (
-                    (abs_axis[0], abs_axis[1] - 1) in self.dig_pos_set | ore_pos_set
-                ):
-                    image_pos = (3, 3)
-                else:
-                    image_pos = self.field_generator.get_layer_image_pos(abs_axis[1])
-                    if image_pos is None:
-                        continue
                 self.view.draw_image(*abs_axis, *image_pos, False)
-                if abs_axis[1] > self.SKYLINE_Y:
-                    appeared_item = self.field_generator.get_item(*abs_axis)
-                    if appeared_item is not None:
-                        self.view.draw_image(*abs_axis, *appeared_item.value, True)
-        for ore in self.ores_map.values():
-            ore.draw_abs(self.center_pos)
+                if appeared_item is not None:
+                    self.view.draw_image(*abs_axis, *appeared_item.value, True)
+        for abs_axis, ore in ore_list:
+            self.view.draw_image(*abs_axis, *ore.value, False)
         if self.furnace is not None:
             self.furnace.draw_abs(self.center_pos)
         self.view.set_clip(None)
 
+    def _get_tile(self, abs_axis):
+        tile = self.tile_cache.get(abs_axis)
+        if tile is None:
+            tile = self._make_tile(abs_axis)
+            self.tile_cache[abs_axis] = tile
+        return tile
+
+    def _make_tile(self, abs_axis):
+        # (塗りつぶし色, 地層画像, 埋まっている鉱石) の組を返す
+        if abs_axis[1] < self.SKYLINE_Y - 1:
+            return (Color.BLUE, None, None)
+        if abs_axis[1] == self.SKYLINE_Y:
+            return (Color.SKY_BLUE, None, None)
+        if self._is_opened(abs_axis):
+            return (None, None, None)
+        if abs_axis[1] == self.SKYLINE_Y - 1:
+            image_pos = (4, 3)
+        elif abs_axis[1] == 2 or self._is_opened((abs_axis[0], abs_axis[1] - 1)):
+            image_pos = (3, 3)
+        else:
+            image_pos = self.field_generator.get_layer_image_pos(abs_axis[1])
+            if image_pos is None:
+                return (None, None, None)
+        appeared_item = None
+        if abs_axis[1] > self.SKYLINE_Y:
+            appeared_item = self.field_generator.get_item(*abs_axis)
+        return (None, image_pos, appeared_item)
+
+    def _is_opened(self, abs_pos):
+        return abs_pos in self.dig_pos_set or abs_pos in self.ores_map
+
+    def _invalidate_tile(self, abs_pos):
+        # 掘った位置と、その下のタイル(地表画像)が変わる
+        self.tile_cache.pop(abs_pos, None)
+        self.tile_cache.pop((abs_pos[0], abs_pos[1] + 1), None)
+
     def _convert_to_abs_pos(self, screen_pos):
         diff = tuple(c - GameObject.TILE_TILT for c in self.center_pos)
         return screen_pos[0] + diff[0], screen_pos[1] + diff[1]
@@ -360,16 +437,81 @@ class Field(GameObject):
         self.dig_pos_set.add(abs_pos)
         appeared_item = self.field_generator.get_item(*abs_pos)
         if appeared_item is not None:
-            self.ores_map[abs_pos] = Ore(abs_pos, appeared_item)
+            self.ores_map[abs_pos] = appeared_item
+        self._invalidate_tile(abs_pos)
+        self.dug_list.append(abs_pos)
+        self._update_ore_diff(abs_pos)
         return True
 
     def get_ore(self, abs_pos):
-        if abs_pos in self.ores_map:
-            return self.ores_map[abs_pos].get_item()
-        return None
+        return self.ores_map.get(abs_pos)
 
     def delete_ore(self, abs_pos):
         del self.ores_map[abs_pos]
+        self._invalidate_tile(abs_pos)
+        self.ore_changed_set.add(abs_pos)
+        self._update_ore_diff(abs_pos)
+
+    def pop_changes(self):
+        """前回呼び出し以降に掘った位置と、変化した鉱石を返す"""
+        dug_list = self.dug_list
+        ore_list = [(pos, self.ores_map.get(pos)) for pos in self.ore_changed_set]
+        self.dug_list = []
+        self.ore_changed_set = set()
+        return dug_list, ore_list
+
+    def get_ore_diff(self):
+        """FieldGeneratorから再現できない鉱石の一覧を返す
+
+        掘る・拾うたびに_update_ore_diffで差分を更新しておき、全体を調べ直すのは
+        掘った位置・鉱石・FieldGeneratorを丸ごと差し替えた後だけにする。
+        """
+        if self._ore_diff_map is None:
+            self._ore_diff_map = {}
+            for pos in self.dig_pos_set:
+                self._update_ore_diff(pos)
+            for pos in self.ores_map:
+                self._update_ore_diff(pos)
+        return list(self._ore_diff_map.items())
+
+    def _update_ore_diff(self, pos):
+        if self._ore_diff_map is None:
+            return
+        item = self.ores_map.get(pos)
+        if pos in self.dig_pos_set:
+            is_diff = item != self.field_generator.get_item(*pos)
+        else:
+            is_diff = item is not None
+        if is_diff:
+            self._ore_diff_map[pos] = item
+        else:
+            self._ore_diff_map.pop(pos, None)
+
+    def restore(self, dig_chunk_list, dig_pos_list, ore_list, is_snapshot):
+        if is_snapshot:
+            dig_pos_set = ChunkedCellSet()
+            for chunk_key, bits in dig_chunk_list:
+                dig_pos_set.set_chunk_bits(chunk_key, bits)
+            self.dig_pos_set = dig_pos_set
+            self.ores_map = {}
+            # SNAPSHOTのore_listがそのままFieldGeneratorとの差分になる
+            self._ore_diff_map = {}
+            dig_pos_list = list(dig_pos_set)
+        for pos in dig_pos_list:
+            self.dig_pos_set.add(pos)
+            appeared_item = self.field_generator.get_item(*pos)
+            if appeared_item is not None:
+                self.ores_map[pos] = appeared_item
+            if not is_snapshot:
+                self._update_ore_diff(pos)
+        for pos, item in ore_list:
+            if item is None:
+                self.ores_map.pop(pos, None)
+            else:
+                self.ores_map[pos] = item
+            self._update_ore_diff(pos)
+        self.tile_cache.clear()
+        self.pop_changes()
 
     def is_hit_furnance(self, abs_pos, direct):
         to_pos = tuple(p + d for p, d in zip(abs_pos, direct.value))
@@ -388,16 +530,6 @@ class Field(GameObject):
         return ret
 
 
-class Ore(FieldObject):
-    def __init__(self, pos, item):
-        super().__init__(pos)
-        self.item = item
-        self.image_pos = item.value
-
-    def get_item(self):
-        return self.item
-
-
 class Furnace(FieldObject):
     IMAGE_POS = (2, 6)
 
@@ -735,6 +867,13 @@ class Forge(FrameOjbect):
         self.item_set = set()
         self.box_item = self._get_box_item(None)
 
+    def get_recipe_item(self):
+        return self.box_item.get(self.Tags.ITEM.value)
+
+    def restore(self, recipe_item, item_set):
+        self.box_item = self._get_box_item(recipe_item)
+        self.item_set = set(item_set)
+
     def smith(self, pos):
         rel_pos = tuple(p - t for p, t in zip(pos, self.TILE_POS))
         if rel_pos != self.Tags.SMITH.value:
@@ -886,8 +1025,10 @@ class GameCore(GameObject):
     TARGET_NUM = 3
     INIT_ITEM_MAP = {Pickaxe.METAL_1: 1}
     # INIT_ITEM_MAP = {k: 9 for k in Pickaxe}
+    # セーブデータ上のID。0はなし
+    SAVE_ITEM_LIST = (None, *Item, *Pickaxe)
 
-    def __init__(self):
+    def __init__(self, is_reset=False):
         super().__init__()
         self.player = Player()
         center = self.player.get_pos(None)
@@ -901,6 +1042,16 @@ class GameCore(GameObject):
         self.position = Position(center)
         self.flg_game_end = False
         self.avail_item_map = self.INIT_ITEM_MAP.copy()
+        self.save_item_id_map = {
+            item: i for i, item in enumerate(self.SAVE_ITEM_LIST) if item is not None
+        }
+        self.report_store = ReportStore()
+        self.flg_dirty = False
+        load_data = self.report_store.load() if not is_reset else None
+        if load_data is not None:
+            for record in load_data:
+                self._apply_save_record(record)
+        self._save(is_snapshot=True)
 
     def update(self):
         if self.flg_game_end:
@@ -913,6 +1064,78 @@ class GameCore(GameObject):
             self._cursor_action()
         self._move()
         self._set_game_end()
+        if (
+            self.flg_dirty
+            and not self.player.is_moving()
+            and len(self.direct_list) == 0
+        ):
+            self._save(is_snapshot=False)
+
+    def _save(self, is_snapshot):
+        is_snapshot = is_snapshot or self.report_store.is_compact_needed()
+        self.report_store.save(self._get_save_record(is_snapshot))
+        self.flg_dirty = False
+
+    def _get_save_record(self, is_snapshot):
+        if is_snapshot:
+            dig_pos_set = self.field.dig_pos_set
+            dig_chunk_list = [
+                (chunk_key, dig_pos_set.get_chunk_bits(chunk_key))
+                for chunk_key in dig_pos_set.get_chunk_keys()
+            ]
+            dig_pos_list = []
+            ore_list = self.field.get_ore_diff()
+            self.field.pop_changes()
+        else:
+            dig_chunk_list = []
+            dig_pos_list, ore_list = self.field.pop_changes()
+        item_ids = self.save_item_id_map
+        forge_item = self.forge.get_recipe_item()
+        return SaveRecord(
+            RecordType.SNAPSHOT if is_snapshot else RecordType.DELTA,
+            self.player.get_pos(None),
+            dig_chunk_list,
+            dig_pos_list,
+            [(pos, item_ids.get(item, 0)) for pos, item in ore_list],
+            [self.bag.get_item_count(item) for item in self.SAVE_ITEM_LIST[1:]],
+            [self.bag.strength_map[p] for p in Pickaxe],
+            item_ids.get(self.bag.get_equiped(), 0),
+            [self.avail_item_map.get(item, 0) for item in self.SAVE_ITEM_LIST[1:]],
+            (
+                item_ids.get(forge_item, 0),
+                sum(1 << item_ids[item] for item in self.forge.item_set),
+            ),
+        )
+
+    def _apply_save_record(self, record):
+        items = self.SAVE_ITEM_LIST
+        is_snapshot = record.record_type == RecordType.SNAPSHOT
+        self.field.restore(
+            record.dig_chunk_list,
+            record.dig_pos_list,
+            [(pos, items[item_id]) for pos, item_id in record.ore_list],
+            is_snapshot,
+        )
+        self.player.pos = record.player_pos
+        self.field.set_center(record.player_pos)
+        self.cursor.set_center(*record.player_pos)
+        for frame in [self.bag, self.forge, self.console, self.position]:
+            frame.set_center(*record.player_pos)
+        self.bag.item_map = {
+            item: num for item, num in zip(items[1:], record.bag_count_list) if num > 0
+        }
+        self.bag.strength_map.update(zip(Pickaxe, record.strength_list))
+        self.bag.equip_item = items[record.equip_id]
+        self.avail_item_map = {
+            item: num
+            for item, num in zip(items[1:], record.avail_count_list)
+            if num != 0
+        }
+        forge_item, forge_mask = record.forge_state
+        self.forge.restore(
+            items[forge_item],
+            {item for i, item in enumerate(items) if i > 0 and forge_mask >> i & 1},
+        )
 
     def _set_game_end(self):
         if self.is_game_clear():
@@ -928,10 +1151,29 @@ class GameCore(GameObject):
         for item in item_set:
             self.avail_item_map[item] = self.avail_item_map.get(item, 0) + num
 
+    def _get_save_state(self):
+        """フィールド以外でセーブする状態"""
+        return (
+            self.player.get_pos(None),
+            tuple(self.bag.item_map.items()),
+            tuple(self.bag.strength_map.items()),
+            self.bag.get_equiped(),
+            tuple(self.avail_item_map.items()),
+            self.forge.get_recipe_item(),
+            frozenset(self.forge.item_set),
+        )
+
     def _cursor_action(self):
         pos = self.cursor.get_select_pos()
         if pos is None:
             return
+        # 選択を変えただけのクリックではセーブしない
+        save_state = self._get_save_state()
+        self._select(pos)
+        if self._get_save_state() != save_state:
+            self.flg_dirty = True
+
+    def _select(self, pos):
         selected_item = self.bag.get_selected()
         self.bag.select_pos(*pos)
         if self._is_hit_furnance():
@@ -967,6 +1209,7 @@ class GameCore(GameObject):
         if len(self.direct_list) == 0 or self.player.is_moving():
             return
         direct = self.direct_list.pop(0)
+        self.flg_dirty = True
         next_pos = self.player.get_pos(direct)
         is_movable = self.field.is_movable(next_pos)
         self.player.move(next_pos, direct, not is_movable)
@@ -1045,7 +1288,7 @@ class PyxelController:
     def update(self):
         self.game_core.update()
         if self.game_core.is_reset():
-            self.game_core = GameCore()
+            self.game_core = GameCore(is_reset=True)
 
     def draw(self):
         self.game_core.draw()
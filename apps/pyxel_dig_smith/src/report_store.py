@@ -0,0 +1,232 @@
+import base64
+import binascii
+import hashlib
+import os
+import struct
+from enum import IntEnum
+
+
+class RecordType(IntEnum):
+    SNAPSHOT = 1
+    DELTA = 2
+
+
+class SaveRecord:
+    """1回分のセーブ内容をバイト列に詰める
+
+    SNAPSHOTは掘った位置をチャンク単位のビット列で、DELTAは前回以降に掘った
+    位置の一覧で持つ。鉱石はFieldGeneratorから再現できない差分だけを持つ。
+    """
+
+    HEADER = struct.Struct("<BiiBBH")
+    COUNT = struct.Struct("<I")
+    CHUNK_KEY = struct.Struct("<ii")
+    POS = struct.Struct("<ii")
+    ORE = struct.Struct("<iiB")
+    STRENGTH = struct.Struct("<H")
+    AVAIL = struct.Struct("<i")
+
+    def __init__(
+        self,
+        record_type,
+        player_pos,
+        dig_chunk_list=(),
+        dig_pos_list=(),
+        ore_list=(),
+        bag_count_list=(),
+        strength_list=(),
+        equip_id=0,
+        avail_count_list=(),
+        forge_state=(0, 0),
+    ):
+        self.record_type = record_type
+        self.player_pos = tuple(player_pos)
+        # [(chunk_key, ビット列)]
+        self.dig_chunk_list = list(dig_chunk_list)
+        self.dig_pos_list = list(dig_pos_list)
+        # [(pos, item_id)] item_id=0は鉱石なし
+        self.ore_list = list(ore_list)
+        self.bag_count_list = list(bag_count_list)
+        self.strength_list = list(strength_list)
+        self.equip_id = equip_id
+        self.avail_count_list = list(avail_count_list)
+        # (レシピのitem_id, 投入済みitem_idのビットマスク)
+        self.forge_state = tuple(forge_state)
+
+    def __eq__(self, other):
+        return isinstance(other, SaveRecord) and vars(self) == vars(other)
+
+    def to_bytes(self):
+        chunks = [
+            self.HEADER.pack(
+                self.record_type,
+                *self.player_pos,
+                self.equip_id,
+                *self.forge_state,
+            ),
+            self.COUNT.pack(len(self.dig_chunk_list)),
+        ]
+        for chunk_key, bits in self.dig_chunk_list:
+            chunks.append(self.CHUNK_KEY.pack(*chunk_key))
+            chunks.append(self.COUNT.pack(len(bits)))
+            chunks.append(bytes(bits))
+        chunks.append(self.COUNT.pack(len(self.dig_pos_list)))
+        chunks.extend(self.POS.pack(*pos) for pos in self.dig_pos_list)
+        chunks.append(self.COUNT.pack(len(self.ore_list)))
+        chunks.extend(self.ORE.pack(*pos, item_id) for pos, item_id in self.ore_list)
+        chunks.append(self.COUNT.pack(len(self.bag_count_list)))
+        chunks.append(bytes(self.bag_count_list))
+        chunks.append(self.COUNT.pack(len(self.strength_list)))
+        chunks.extend(self.STRENGTH.pack(s) for s in self.strength_list)
+        chunks.append(self.COUNT.pack(len(self.avail_count_list)))
+        chunks.extend(self.AVAIL.pack(a) for a in self.avail_count_list)
+        return b"".join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """壊れたデータの場合はNoneを返す"""
+        try:
+            return cls._from_bytes(data)
+        except (struct.error, ValueError):
+            return None
+
+    @classmethod
+    def _from_bytes(cls, data):
+        offset = 0
+
+        def read(fmt):
+            nonlocal offset
+            ret = fmt.unpack_from(data, offset)
+            offset += fmt.size
+            return ret
+
+        def read_count():
+            return read(cls.COUNT)[0]
+
+        record_type, x, y, equip_id, forge_item, forge_mask = read(cls.HEADER)
+        dig_chunk_list = []
+        for _ in range(read_count()):
+            chunk_key = read(cls.CHUNK_KEY)
+            size = read_count()
+            bits = data[offset : offset + size]
+            if len(bits) != size:
+                raise ValueError("broken chunk")
+            offset += size
+            dig_chunk_list.append((chunk_key, bits))
+        dig_pos_list = [read(cls.POS) for _ in range(read_count())]
+        ore_list = [
+            ((ore[0], ore[1]), ore[2])
+            for ore in (read(cls.ORE) for _ in range(read_count()))
+        ]
+        size = read_count()
+        bag_count_list = list(data[offset : offset + size])
+        if len(bag_count_list) != size:
+            raise ValueError("broken bag")
+        offset += size
+        strength_list = [read(cls.STRENGTH)[0] for _ in range(read_count())]
+        avail_count_list = [read(cls.AVAIL)[0] for _ in range(read_count())]
+        if offset != len(data):
+            raise ValueError("trailing data")
+        return cls(
+            RecordType(record_type),
+            (x, y),
+            dig_chunk_list,
+            dig_pos_list,
+            ore_list,
+            bag_count_list,
+            strength_list,
+            equip_id,
+            avail_count_list,
+            (forge_item, forge_mask),
+        )
+
+
+class ReportStore:
+    """セーブデータを1行1レコードで持つ
+
+    先頭行はSNAPSHOT、以降はDELTAで、読み込み時に順に適用する。
+    SNAPSHOTはSAVE_FILENAMEに書いて保存内容を置き換え、DELTAはSAVE_DELTA_FILENAMEに
+    1行ずつ追記する。HTML側はそれぞれをlocalStorageへ置き換え・追記したあと消す。
+    DELTAがMAX_DELTA_NUM個溜まったらSNAPSHOTにまとめ直す。
+    """
+
+    LOAD_FILENAME = "/load_data.txt"
+    SAVE_FILENAME = "/save_data.txt"
+    SAVE_DELTA_FILENAME = "/save_delta.txt"
+    SECRET = "pyxel dig smith game secret"
+    VERSION = 1
+    MAX_DELTA_NUM = 64
+
+    def __init__(self):
+        self.secret_hash = hashlib.sha256(self.SECRET.encode("utf-8")).digest()
+        self.delta_num = 0
+
+    def set_local_storage(self, value, is_append=False):
+        """is_append=Falseなら保存内容をvalueで置き換え、Trueなら末尾にvalueを足す"""
+        try:
+            if is_append:
+                with open(self.SAVE_DELTA_FILENAME, "a", encoding="utf-8") as f:
+                    f.write(value)
+                return True
+            # まだHTML側に移されていない追記分は、置き換える内容に含まれている
+            if os.path.exists(self.SAVE_DELTA_FILENAME):
+                os.remove(self.SAVE_DELTA_FILENAME)
+            with open(self.SAVE_FILENAME, "w", encoding="utf-8") as f:
+                f.write(value)
+        except OSError:
+            return False
+        return True
+
+    def _xor_bytes(self, data: bytes, key: bytes) -> bytes:
+        repeat_key = (key * (len(data) // len(key) + 1))[: len(data)]
+        xored = int.from_bytes(data, "little") ^ int.from_bytes(repeat_key, "little")
+        return xored.to_bytes(len(data), "little")
+
+    def _crypt(self, target: bytes):
+        xored = self._xor_bytes(target, self.secret_hash)
+        return base64.b64encode(xored).decode("ascii")
+
+    def get_local_storage(self):
+        try:
+            with open(self.LOAD_FILENAME, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _decrypt(self, target):
+        try:
+            xored = base64.b64decode(target.encode("ascii"), validate=True)
+        except (binascii.Error, ValueError):
+            return None
+        return self._xor_bytes(xored, self.secret_hash)
+
+    def is_compact_needed(self):
+        """DELTAが溜まり、次はSNAPSHOTで書き直すべきか"""
+        return self.delta_num >= self.MAX_DELTA_NUM
+
+    def save(self, record: SaveRecord):
+        data = bytes([self.VERSION]) + record.to_bytes()
+        line = self._crypt(data) + "\n"
+        if record.record_type == RecordType.SNAPSHOT:
+            self.delta_num = 0
+            return self.set_local_storage(line)
+        self.delta_num += 1
+        return self.set_local_storage(line, is_append=True)
+
+    def load(self):
+        storage_str = self.get_local_storage()
+        if storage_str is None:
+            return None
+        record_list = []
+        for line in storage_str.splitlines():
+            data = self._decrypt(line)
+            if data is None or len(data) == 0 or data[0] != self.VERSION:
+                break
+            record = SaveRecord.from_bytes(data[1:])
+            if record is None:
+                # 書き込み途中で壊れた行以降は捨てる
+                break
+            record_list.append(record)
+        if len(record_list) == 0 or record_list[0].record_type != RecordType.SNAPSHOT:
+            return None
+        return record_list
@@ -0,0 +1,645 @@
+import csv
+import heapq
+import itertools
+import os
+import random
+import sys
+import timeit
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from multiprocessing import Pool
+
+try:
+    from . import main  # pylint: disable=C0413
+    from .chunk_store import ChunkedCellSet  # pylint: disable=C0413
+    from .logic import (
+        FieldGenerator,
+        Item,
+        Pickaxe,
+        PickaxeGenerator,
+    )  # pylint: disable=C0413
+    from .report_store import ReportStore  # pylint: disable=C0413
+except ImportError:
+    import main  # pylint: disable=C0413
+    from chunk_store import ChunkedCellSet  # pylint: disable=C0413
+    from logic import (
+        FieldGenerator,
+        Item,
+        Pickaxe,
+        PickaxeGenerator,
+    )  # pylint: disable=C0413
+    from report_store import ReportStore  # pylint: disable=C0413
+
+
+class RunStatus:
+    CLEAR = "clear"
+    GAME_OVER = "game_over"
+    STUCK = "stuck"
+    TIMEOUT = "timeout"
+
+
+class NullView(main.IView):
+    def draw_text(self, x, y, text, color):
+        pass
+
+    def draw_image(self, x, y, src_x, src_y, is_dither, offset=(0, 0), is_revert=False):
+        pass
+
+    def draw_rect(self, x, y, width, height, color, is_fill):
+        pass
+
+    def set_clip(self, rect):
+        pass
+
+    def clear(self, x, y):
+        pass
+
+
+class NullUnitView(main.IUnitView):
+    def draw_unit(self, x, y, image_x, image_y, face, direct, offset):
+        pass
+
+
+class ScriptedInput(main.IInput):
+    """登録したタイル位置を1フレームに1回ずつクリックする"""
+
+    def __init__(self):
+        self.click_list = []
+        self.mouse_pos = (None, None)
+
+    def click(self, tile_pos):
+        # Cursorは同じタイルを2回クリックして確定する
+        mouse_pos = tuple(p * 8 - t + 4 for p, t in zip(tile_pos, main.Cursor.TILT))
+        self.click_list += [mouse_pos, mouse_pos]
+
+    def is_click(self):
+        self.mouse_pos = self.click_list.pop(0) if self.click_list else (None, None)
+        return self.mouse_pos[0] is not None
+
+    def get_mouse_x(self):
+        return self.mouse_pos[0]
+
+    def get_mouse_y(self):
+        return self.mouse_pos[1]
+
+    def is_empty(self):
+        return len(self.click_list) == 0
+
+
+class NullReportStore(ReportStore):
+    def set_local_storage(self, value, is_append=False):
+        return True
+
+    def get_local_storage(self):
+        return None
+
+
+@contextmanager
+def headless(scripted_input=None):
+    """描画・入力・セーブをpyxelやファイルに依存しないものに差し替える"""
+    view = NullView()
+    unit_view = NullUnitView()
+    scripted_input = ScriptedInput() if scripted_input is None else scripted_input
+    replace_list = [
+        (main.PyxelView, "create", lambda: view),
+        (main.PyxelInput, "create", lambda: scripted_input),
+        (main.PyxelUnitView, "create", lambda: unit_view),
+        (main, "ReportStore", NullReportStore),
+    ]
+    missing = object()
+    saved_list = [
+        (obj, name, vars(obj).get(name, missing)) for obj, name, _ in replace_list
+    ]
+    for obj, name, value in replace_list:
+        setattr(obj, name, value)
+    try:
+        yield scripted_input
+    finally:
+        for obj, name, value in saved_list:
+            if value is missing:
+                delattr(obj, name)
+            else:
+                setattr(obj, name, value)
+
+
+class SeededFieldGenerator(FieldGenerator):
+    """seedごとに異なる地形を生成する。seed=Noneは本番と同じ地形"""
+
+    def __init__(self, seed=None):
+        self.seed = seed
+        super().__init__()
+
+    def get_hash(self, value):
+        return hash(value) if self.seed is None else hash((self.seed, value))
+
+
+def split_params(params):
+    """上書きする定数をFieldGeneratorとBagに振り分ける"""
+    field_params = {}
+    bag_params = {}
+    for key, value in params.items():
+        if hasattr(FieldGenerator, key):
+            field_params[key] = value
+        elif hasattr(main.Bag, key):
+            bag_params[key] = value
+        else:
+            raise ValueError(f"unknown param: {key}")
+    return field_params, bag_params
+
+
+def create_game_core(params=None, seed=None, scripted_input=None):
+    field_params, bag_params = split_params({} if params is None else params)
+    with headless(scripted_input):
+        game_core = main.GameCore(is_reset=True)
+        generator_cls = type(
+            "SweepFieldGenerator", (SeededFieldGenerator,), field_params
+        )
+        game_core.field.field_generator = generator_cls(seed)
+        bag_cls = type("SweepBag", (main.Bag,), bag_params)
+        game_core.bag = bag_cls(
+            game_core.player.get_pos(None),
+            init_items=main.GameCore.INIT_ITEM_MAP.copy(),
+        )
+    return game_core
+
+
+def get_bag_tile_pos(item):
+    for y, item_list in enumerate(main.Bag.ITEM_POS_MAP):
+        if item in item_list:
+            return (
+                main.Bag.TILE_POS[0] + item_list.index(item),
+                main.Bag.TILE_POS[1] + y,
+            )
+    return None
+
+
+def get_forge_tile_pos(tag):
+    return tuple(p + t for p, t in zip(main.Forge.TILE_POS, tag.value))
+
+
+def get_best_pickaxe(bag):
+    pickaxe_list = [p for p in Pickaxe if bag.get_item_count(p) > 0]
+    return pickaxe_list[-1] if len(pickaxe_list) > 0 else None
+
+
+def get_material_list(pickaxe):
+    """pickaxeを作るために炉へ入れる(素材, 置き場所)のリストを返す"""
+    for item, (src, dst) in PickaxeGenerator.ITEM_TO_PICKAXE_MAP.items():
+        if dst != pickaxe:
+            continue
+        material_list = [(item, main.Forge.Tags.ITEM)]
+        if src is not None:
+            material_list.append((src, main.Forge.Tags.PICKAXE))
+        material_list.append((Item.COAL, main.Forge.Tags.COAL))
+        return material_list
+    return []
+
+
+class IDigPolicy(ABC):
+    @abstractmethod
+    def get_clicks(self, game_core):
+        """次にクリックするタイル位置のリストを返す。打つ手がなければNone"""
+
+
+class GreedyDigPolicy(IDigPolicy):
+    """一番良いつるはしを装備し、作れるつるはしがあれば炉に戻って作る
+
+    それ以外は、次のつるはしまでの素材を経路コストの近い順に掘りに行く。
+    最上位(METAL_5)のつるはしが作れるようになったらJEWELも掘る。
+    """
+
+    # 鉱石を探す経路コストの上限。見つからなければ次の上限で探し直す
+    SEARCH_COST_LIST = (48, 192)
+    # 目的地への経路を探すとき、始点と終点を囲む矩形から広げる範囲
+    SEARCH_MARGIN = 8
+    # 掘る手間(耐久度)を移動何歩分とみなすか
+    DIG_COST = 2
+    EXPLORE_STEP = main.GameObject.TILE_TILT - 1
+    # 手持ちがこの数に満たない素材を集める
+    WANT_NUM = 3
+    SMITH_LIST = tuple(p for p in Pickaxe if p != Pickaxe.JEWEL)
+    SEARCH_DIRECT_LIST = tuple(
+        d.value
+        for d in (main.Direct.DOWN, main.Direct.RIGHT, main.Direct.LEFT, main.Direct.UP)
+    )
+
+    def __init__(self):
+        # 辿っている経路と、その経路を探したときのつるはし
+        self.path = None
+        self.path_pickaxe = None
+        self.path_is_explore = False
+
+    def get_clicks(self, game_core):
+        bag = game_core.bag
+        best = get_best_pickaxe(bag)
+        if best is not None and bag.get_equiped() != best:
+            return [get_bag_tile_pos(best), main.Bag.EQUIP_TILE_POS]
+        for pickaxe in reversed(self.SMITH_LIST):
+            material_list = get_material_list(pickaxe)
+            if bag.get_item_count(pickaxe) < self.WANT_NUM and all(
+                bag.get_item_count(item) > 0 for item, _ in material_list
+            ):
+                self.path = None
+                return self._get_smith_clicks(game_core, material_list)
+        want_set = self._get_want_set(bag, best)
+        field = game_core.field
+        generator = field.field_generator
+
+        def is_want(pos):
+            if pos in field.dig_pos_set:
+                return field.get_ore(pos) in want_set
+            return pos[1] > field.SKYLINE_Y and generator.get_item(*pos) in want_set
+
+        path = self._get_rest_path(game_core, best)
+        if path is None or not (self.path_is_explore or is_want(path[-1])):
+            path = None
+            for max_cost in self.SEARCH_COST_LIST:
+                path = self._search(game_core, is_want, max_cost=max_cost)
+                if path is not None:
+                    break
+            self.path_is_explore = path is None
+            if path is None:
+                path = self._get_explore_path(game_core)
+        self.path = path
+        self.path_pickaxe = best
+        return self._get_path_clicks(path)
+
+    def _get_rest_path(self, game_core, pickaxe):
+        # 行き来しないよう、前回探した経路の残りがあればそれを辿る
+        # つるはしが変わると通れるマスが変わるので探し直す
+        pos = game_core.player.get_pos(None)
+        if (
+            self.path is None
+            or self.path_pickaxe != pickaxe
+            or pos not in self.path[:-1]
+        ):
+            return None
+        return self.path[self.path.index(pos) :]
+
+    def _get_want_set(self, bag, best):
+        next_index = 0 if best is None else self.SMITH_LIST.index(best) + 1
+        want_set = {Item.COAL}
+        for pickaxe in self.SMITH_LIST[: next_index + 1]:
+            want_set.add(get_material_list(pickaxe)[0][0])
+        want_set = {
+            item for item in want_set if bag.get_item_count(item) < self.WANT_NUM
+        }
+        if next_index >= len(self.SMITH_LIST):
+            want_set.add(Item.JEWEL)
+        return want_set
+
+    def _get_smith_clicks(self, game_core, material_list):
+        player_pos = game_core.player.get_pos(None)
+        furnace_x, furnace_y = game_core.field.furnace.get_abs_pos()
+        stand_pos = (furnace_x + 1, furnace_y)
+        if player_pos == stand_pos and (
+            game_core.player.get_face_direct() == main.Direct.LEFT
+        ):
+            clicks = []
+            for item, tag in material_list:
+                clicks += [get_bag_tile_pos(item), get_forge_tile_pos(tag)]
+            return clicks + [get_forge_tile_pos(main.Forge.Tags.SMITH)]
+        # 炉の方を向くよう、右隣から左へ歩いて炉の前に立つ
+        approach_pos = (furnace_x + 2, furnace_y)
+        target_pos = stand_pos if player_pos == approach_pos else approach_pos
+        return self._get_path_clicks(self._search(game_core, goal_pos=target_pos))
+
+    def _get_explore_path(self, game_core):
+        # 近くに目的の鉱石がなければ地表(炉の横)へ戻り、地表にいれば横へ進む
+        pos = game_core.player.get_pos(None)
+        furnace_x, furnace_y = game_core.field.furnace.get_abs_pos()
+        target_list = [(pos[0] + self.EXPLORE_STEP, pos[1])]
+        if pos[1] != furnace_y:
+            target_list.insert(0, (furnace_x + 2, furnace_y))
+        for target_pos in target_list:
+            path = self._search(game_core, goal_pos=target_pos)
+            if path is not None:
+                return path
+        return None
+
+    def _search(self, game_core, is_goal=None, goal_pos=None, max_cost=None):
+        """通れるマスだけを通って、目的のマスまでの最も安い経路を返す
+
+        goal_posを指定した場合はそのマスへ(A*)、そうでなければis_goalを満たす
+        最も近いマスへの経路を、コストmax_cost以内で探す。
+        """
+        field = game_core.field
+        generator = field.field_generator
+        dig_pos_set = field.dig_pos_set
+        skyline_y = field.SKYLINE_Y
+        furnace_pos = field.furnace.get_abs_pos()
+        pickaxe = game_core.bag.get_equiped()
+        start = game_core.player.get_pos(None)
+        area = None
+        if goal_pos is not None:
+            is_goal = goal_pos.__eq__
+            area = [
+                (min(s, g) - self.SEARCH_MARGIN, max(s, g) + self.SEARCH_MARGIN)
+                for s, g in zip(start, goal_pos)
+            ]
+
+        def get_heuristic(pos):
+            if goal_pos is None:
+                return 0
+            return abs(goal_pos[0] - pos[0]) + abs(goal_pos[1] - pos[1])
+
+        # 掘れるかどうかは深さだけで決まるので行ごとに覚えておく
+        digable_map = {}
+        cost_map = {start: 0}
+        prev_map = {}
+        heap = [(get_heuristic(start), 0, start)]
+        while len(heap) > 0:
+            _, cost, pos = heapq.heappop(heap)
+            if cost > cost_map[pos]:
+                continue
+            if pos != start and is_goal(pos):
+                path = [pos]
+                while path[-1] != start:
+                    path.append(prev_map[path[-1]])
+                return path[::-1]
+            for direct in self.SEARCH_DIRECT_LIST:
+                nxt = (pos[0] + direct[0], pos[1] + direct[1])
+                if nxt[1] < skyline_y or nxt == furnace_pos:
+                    continue
+                if area is not None and not (
+                    area[0][0] <= nxt[0] <= area[0][1]
+                    and area[1][0] <= nxt[1] <= area[1][1]
+                ):
+                    continue
+                if nxt[1] == skyline_y or nxt in dig_pos_set:
+                    next_cost = cost + 1
+                else:
+                    is_digable = digable_map.get(nxt[1])
+                    if is_digable is None:
+                        is_digable = pickaxe is not None and generator.is_digable(
+                            *nxt, pickaxe
+                        )
+                        digable_map[nxt[1]] = is_digable
+                    if not is_digable:
+                        continue
+                    next_cost = cost + 1 + self.DIG_COST
+                if max_cost is not None and next_cost > max_cost:
+                    continue
+                if next_cost < cost_map.get(nxt, next_cost + 1):
+                    cost_map[nxt] = next_cost
+                    prev_map[nxt] = pos
+                    heapq.heappush(
+                        heap, (next_cost + get_heuristic(nxt), next_cost, nxt)
+                    )
+        return None
+
+    def _get_path_clicks(self, path):
+        """経路の最初の直線部分の終点をクリックする
+
+        直線ならFieldの経路探索も同じマスを通るので、掘れないマスに迷い込まない。
+        """
+        if path is None:
+            return None
+        limit = main.GameObject.TILE_TILT - 1
+        direct = tuple(n - p for p, n in zip(path[0], path[1]))
+        end = 1
+        while (
+            end + 1 < len(path)
+            and end < limit
+            and tuple(n - p for p, n in zip(path[end], path[end + 1])) == direct
+        ):
+            end += 1
+        rel_pos = tuple(e - s for s, e in zip(path[0], path[end]))
+        return [tuple(main.GameObject.TILE_TILT + r for r in rel_pos)]
+
+
+class DigSmithSolver:
+    """GameCoreをヘッドレスで動かし、方策のクリックでクリアまで進める"""
+
+    MAX_FRAMES = 600000
+    STUCK_LIMIT = 3
+
+    def __init__(self, params=None, seed=None, policy=None, max_frames=MAX_FRAMES):
+        self.params = {} if params is None else params
+        self.seed = seed
+        self.policy = GreedyDigPolicy() if policy is None else policy
+        self.max_frames = max_frames
+        self.input = ScriptedInput()
+        self.game_core = create_game_core(self.params, seed, self.input)
+        self.frames = 0
+        self.moves = 0
+        self.digs = 0
+        self.breaks = 0
+        self.smiths = 0
+
+    def run(self):
+        status = RunStatus.TIMEOUT
+        stuck_count = 0
+        while self.frames < self.max_frames:
+            if self.game_core.is_game_clear():
+                status = RunStatus.CLEAR
+                break
+            if self.game_core.is_game_over():
+                status = RunStatus.GAME_OVER
+                break
+            clicks = self.policy.get_clicks(self.game_core)
+            if clicks is None:
+                status = RunStatus.STUCK
+                break
+            before_state = self._get_state()
+            for tile_pos in clicks:
+                self.input.click(tile_pos)
+            self._run_until_idle()
+            stuck_count = stuck_count + 1 if self._get_state() == before_state else 0
+            if stuck_count >= self.STUCK_LIMIT:
+                status = RunStatus.STUCK
+                break
+        return {
+            **self.params,
+            "seed": self.seed,
+            "status": status,
+            "frames": self.frames,
+            "moves": self.moves,
+            "digs": self.digs,
+            "breaks": self.breaks,
+            "smiths": self.smiths,
+            "pickaxe": get_best_pickaxe(self.game_core.bag),
+            "jewel": self.game_core.bag.get_item_count(Item.JEWEL),
+        }
+
+    def _get_state(self):
+        game_core = self.game_core
+        return (
+            game_core.player.get_pos(None),
+            game_core.player.get_face_direct(),
+            tuple(sorted(game_core.bag.item_map.items(), key=lambda i: i[0].name)),
+            game_core.bag.get_equiped(),
+            len(game_core.field.dig_pos_set),
+        )
+
+    def _get_pickaxe_counts(self):
+        return [self.game_core.bag.get_item_count(p) for p in Pickaxe]
+
+    def _run_until_idle(self):
+        game_core = self.game_core
+        while self.frames < self.max_frames:
+            pos = game_core.player.get_pos(None)
+            dig_num = len(game_core.field.dig_pos_set)
+            strength = game_core.bag.get_strength()
+            # つるはしが作られるのはクリックしたフレームだけ
+            pickaxe_counts = (
+                None if self.input.is_empty() else self._get_pickaxe_counts()
+            )
+            game_core.update()
+            self.frames += 1
+            if game_core.player.get_pos(None) != pos:
+                self.moves += 1
+            if len(game_core.field.dig_pos_set) != dig_num:
+                self.digs += 1
+                if strength == 1:
+                    self.breaks += 1
+            if pickaxe_counts is not None and any(
+                a > b for a, b in zip(self._get_pickaxe_counts(), pickaxe_counts)
+            ):
+                self.smiths += 1
+            if game_core.flg_game_end or (
+                self.input.is_empty()
+                and not game_core.player.is_moving()
+                and len(game_core.direct_list) == 0
+            ):
+                return
+
+
+def _solve_task(task):
+    params, seed, max_frames = task
+    return DigSmithSolver(params, seed, max_frames=max_frames).run()
+
+
+def run_sweep(scenarios, seeds, max_frames=DigSmithSolver.MAX_FRAMES, processes=None):
+    tasks = [
+        (params, seed, max_frames)
+        for params, seed in itertools.product(scenarios, seeds)
+    ]
+    if processes == 1:
+        return [_solve_task(task) for task in tasks]
+    processes = os.cpu_count() if processes is None else processes
+    chunksize = max(1, len(tasks) // (processes * 4))
+    with Pool(processes) as pool:
+        return pool.map(_solve_task, tasks, chunksize=chunksize)
+
+
+def make_scenarios(param_grid):
+    """{定数名: 候補値のリスト}の直積からシナリオのリストを生成する"""
+    keys = list(param_grid)
+    return [
+        dict(zip(keys, values))
+        for values in itertools.product(*(param_grid[key] for key in keys))
+    ]
+
+
+def shift_peak_map(offset):
+    return {item: y + offset for item, y in FieldGenerator.APPEAR_PEAK_MAP.items()}
+
+
+def _format_value(value, separators=(("=", ";"), (":", "/"))):
+    if isinstance(value, dict):
+        (key_sep, item_sep), *inner_separators = separators
+        return item_sep.join(
+            f"{getattr(k, 'name', k)}{key_sep}{_format_value(v, inner_separators)}"
+            for k, v in value.items()
+        )
+    if isinstance(value, tuple):
+        return "/".join(str(_format_value(v)) for v in value)
+    return getattr(value, "name", value)
+
+
+def write_report(results, file):
+    if len(results) == 0:
+        return
+    writer = csv.DictWriter(file, fieldnames=list(results[0]))
+    writer.writeheader()
+    for result in results:
+        writer.writerow({k: _format_value(v) for k, v in result.items()})
+
+
+def _get_benchmark_cases():
+    rand = random.Random(0)
+    generator = SeededFieldGenerator(0)
+    pos_list = [(rand.randint(-40, 40), rand.randint(2, 80)) for _ in range(1000)]
+    dig_pos_set = ChunkedCellSet(pos_list)
+    route_list = [
+        (
+            (rand.randint(-20, 20), rand.randint(2, 40)),
+            (rand.randint(-4, 4), rand.randint(-4, 4)),
+        )
+        for _ in range(100)
+    ]
+    game_core = create_game_core(seed=0)
+    field = game_core.field
+    field.dig_pos_set = dig_pos_set
+    policy = GreedyDigPolicy()
+
+    def get_item():
+        for pos in pos_list:
+            generator.get_item(*pos)
+
+    def get_items():
+        generator.get_items(-5, 10, 11, 11)
+
+    def get_lightest_path():
+        for start, rel_pos in route_list:
+            generator.get_lightest_path(start, rel_pos, dig_pos_set)
+
+    def cell_set_contains():
+        for pos in pos_list:
+            _ = pos in dig_pos_set
+
+    def field_draw():
+        field.tile_cache.clear()
+        field.draw()
+
+    def field_draw_cached():
+        field.draw()
+
+    def search():
+        policy._search(  # pylint: disable=W0212
+            game_core,
+            lambda pos: generator.get_item(*pos) == Item.JEWEL,
+            max_cost=GreedyDigPolicy.SEARCH_COST_LIST[-1],
+        )
+
+    return [
+        ("FieldGenerator.get_item x1000", get_item),
+        ("FieldGenerator.get_items 11x11", get_items),
+        ("FieldGenerator.get_lightest_path x100", get_lightest_path),
+        ("ChunkedCellSet.__contains__ x1000", cell_set_contains),
+        ("Field.draw", field_draw),
+        ("Field.draw cached", field_draw_cached),
+        ("GreedyDigPolicy._search", search),
+    ]
+
+
+def run_benchmarks(number=100, repeat=5):
+    """ホットな処理の1回あたりの時間(秒)をrepeat回中の最小値で返す"""
+    ret = []
+    for name, func in _get_benchmark_cases():
+        func()  # キャッシュを温めておく
+        elapsed = min(timeit.repeat(func, number=number, repeat=repeat))
+        ret.append({"name": name, "number": number, "per_call": elapsed / number})
+    return ret
+
+
+def main_sweep():
+    scenarios = make_scenarios(
+        {
+            "APPEAR_PEAK_MAP": [shift_peak_map(offset) for offset in [-2, 0, 2]],
+            "FLAT_APPEAR_RATE_MAP": [
+                {Item.COAL: (0, coal), Item.JEWEL: (48, 0.01)}
+                for coal in [0.1, 0.15, 0.2]
+            ],
+            "MAX_STRENGTH": [10, 20, 30],
+        }
+    )
+    write_report(run_sweep(scenarios, range(8)), sys.stdout)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["bench"]:
+        write_report(run_benchmarks(), sys.stdout)
+    else:
+        main_sweep()
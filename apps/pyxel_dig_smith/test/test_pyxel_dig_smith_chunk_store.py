@@ -0,0 +1,104 @@
+import os
+import sys
+import unittest
+
+for p in ["../src/"]:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), p)))
+from chunk_store import (  # pylint: disable=C0413
+    CHUNK_SIZE,
+    ChunkedCellSet,
+    ChunkedValueMap,
+)
+from logic import Item  # pylint: disable=C0413
+
+
+class TestChunkedCellSet(unittest.TestCase):
+    POS_LIST = [
+        (0, 0),
+        (2, 3),
+        (CHUNK_SIZE - 1, CHUNK_SIZE - 1),
+        (CHUNK_SIZE, 0),
+        (-1, 5),
+        (-CHUNK_SIZE - 3, 100),
+        (7, 1000),
+    ]
+
+    def test_add_contains(self):
+        cell_set = ChunkedCellSet()
+        for i, pos in enumerate(self.POS_LIST):
+            with self.subTest(pos=pos):
+                self.assertNotIn(pos, cell_set)
+                cell_set.add(pos)
+                cell_set.add(pos)
+                self.assertIn(pos, cell_set)
+                self.assertEqual(len(cell_set), i + 1)
+        self.assertEqual(cell_set, set(self.POS_LIST))
+        self.assertEqual(set(self.POS_LIST), cell_set)
+        self.assertNotIn((1, 0), cell_set)
+        self.assertNotIn((0, -1), cell_set)
+
+    def test_discard(self):
+        cell_set = ChunkedCellSet(self.POS_LIST)
+        for pos in self.POS_LIST:
+            cell_set.discard(pos)
+            cell_set.discard(pos)
+            self.assertNotIn(pos, cell_set)
+        self.assertEqual(len(cell_set), 0)
+        self.assertEqual(len(cell_set.get_chunk_keys()), 0)
+
+    def test_iter_chunk(self):
+        cell_set = ChunkedCellSet(self.POS_LIST)
+        self.assertEqual(len(cell_set.get_chunk_keys()), 5)
+        self.assertEqual(
+            set(cell_set.iter_chunk((0, 0))),
+            {(0, 0), (2, 3), (CHUNK_SIZE - 1, CHUNK_SIZE - 1)},
+        )
+        self.assertEqual(set(cell_set.iter_chunk((-1, 0))), {(-1, 5)})
+        self.assertEqual(list(cell_set.iter_chunk((9, 9))), [])
+
+    def test_many_cells(self):
+        pos_set = {(x, y) for x in range(-50, 50) for y in range(0, 300, 3)}
+        cell_set = ChunkedCellSet(pos_set)
+        self.assertEqual(len(cell_set), len(pos_set))
+        self.assertEqual(set(cell_set), pos_set)
+
+
+class TestChunkedValueMap(unittest.TestCase):
+    def test_set_get(self):
+        value_map = ChunkedValueMap(tuple(Item))
+        pos_item_map = {
+            (0, 0): Item.METAL_1,
+            (-1, 2): Item.COAL,
+            (CHUNK_SIZE, 40): Item.JEWEL,
+        }
+        for pos, item in pos_item_map.items():
+            value_map[pos] = item
+        self.assertEqual(len(value_map), 3)
+        self.assertEqual(value_map, pos_item_map)
+        self.assertEqual(pos_item_map, value_map)
+        self.assertEqual(value_map[(-1, 2)], Item.COAL)
+        self.assertIsNone(value_map.get((1, 0)))
+        self.assertNotIn((1, 0), value_map)
+        with self.assertRaises(KeyError):
+            _ = value_map[(1, 0)]
+        value_map[(0, 0)] = Item.METAL_2
+        self.assertEqual(value_map[(0, 0)], Item.METAL_2)
+        self.assertEqual(len(value_map), 3)
+        self.assertEqual(list(value_map.iter_chunk((0, 0))), [((0, 0), Item.METAL_2)])
+
+    def test_delete(self):
+        value_map = ChunkedValueMap(tuple(Item), {(3, 4): Item.METAL_3})
+        del value_map[(3, 4)]
+        self.assertEqual(value_map, {})
+        self.assertEqual(len(value_map.get_chunk_keys()), 0)
+        with self.assertRaises(KeyError):
+            del value_map[(3, 4)]
+
+    def test_invalid_value(self):
+        value_map = ChunkedValueMap(tuple(Item))
+        with self.assertRaises(KeyError):
+            value_map[(0, 0)] = "METAL_1"
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,7 +13,6 @@ from main import (  # pylint: disable=C0413
     Player,
     Direct,
     Color,
-    Ore,
     Bag,
     Cursor,
     Unit,
@@ -126,35 +125,6 @@ class TestUnit(TestParent):
                 )
 
 
-class TestOre(TestParent):
-    def test_draw(self):
-        test_cases = [
-            ("base axis", (2, 2), (2, 2)),
-            ("base axis slide", (2, 2), (2, 3)),
-            ("x - 1 axis", (1, 2), (2, 2)),
-            ("y - 1 axis", (2, 1), (2, 2)),
-            ("x + 1 axis", (3, 2), (2, 2)),
-            ("y + 1 axis", (2, 3), (2, 2)),
-        ]
-        for case_name, center_pos, abs_pos in test_cases:
-            with self.subTest(
-                case_name=case_name,
-                center_pos=center_pos,
-                abs_pos=abs_pos,
-            ):
-                self.reset()
-                ore = Ore(abs_pos, Item.METAL_1)
-                ore.draw_abs(center_pos)
-                expected = [
-                    ("draw_image", *abs_pos, *Item.METAL_1.value, False, (0, 0), False)
-                ]
-                self.assertEqual(
-                    expected,
-                    self.test_view.get_call_params(),
-                    self.test_view.get_call_params(),
-                )
-
-
 class TestFurnace(TestParent):
     def test_draw(self):
         chest = Furnace((4, 1))
@@ -1,6 +1,7 @@
 import os
 import sys
 import unittest
+from unittest.mock import patch
 
 for p in ["../src/", "./"]:
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), p)))
@@ -15,7 +16,6 @@ from main import (  # pylint: disable=C0413
     GameCore,
     Field,
     Direct,
-    Ore,
     Furnace,
 )
 from logic import (  # pylint: disable=C0413
@@ -237,7 +237,7 @@ class TestField(TestUnitParent):
         # objectsは、pos: (オブジェクト, 埋まっているか否か)
         field = Field(center_pos)
         field.ores_map = {
-            pos: Ore(pos, v[0])
+            pos: v[0]
             for pos, v in objects.items()
             if isinstance(v[0], Item) and not v[1]
         }
@@ -247,6 +247,34 @@ class TestField(TestUnitParent):
 
         return field
 
+    def test_draw_cache(self):
+        test_cases = [
+            ("dig", (2, 3), None),
+            ("dig with ore", (2, 3), Item.METAL_1),
+            ("delete ore", (2, 2), Item.METAL_2),
+        ]
+        for case_name, target_pos, item in test_cases:
+            with self.subTest(case_name=case_name, target_pos=target_pos, item=item):
+                self.reset()
+                if item is not None:
+                    self.test_field_generator.set_item({target_pos: item})
+                field = self._generate_field({(2, 2)}, (2, 2), {})
+                field.draw()
+                if case_name == "delete ore":
+                    field.ores_map[target_pos] = item
+                    field.tile_cache.clear()
+                    field.draw()
+                    field.delete_ore(target_pos)
+                else:
+                    self.assertTrue(field.dig(target_pos, Pickaxe.METAL_1))
+                self.test_view.reset()
+                field.draw()
+                cached_draw = self.test_view.get_call_params()
+                self.test_view.reset()
+                field.tile_cache.clear()
+                field.draw()
+                self.assertEqual(cached_draw, self.test_view.get_call_params())
+
     def test_convert_to_abs_axis(self):
         tilt = GameCore.TILE_TILT
         test_cases = [
@@ -528,6 +556,26 @@ class TestField(TestUnitParent):
         field.delete_ore((2, 1))
         self.assertEqual({}, field.ores_map)
 
+    def test_get_ore_diff(self):
+        """掘る・拾うたびに差分を更新し、FieldGeneratorを全体に引き直さない"""
+        self.test_field_generator.set_item({(2, 4): Item.METAL_1, (3, 4): Item.COAL})
+        field = self._generate_field({(2, 3)}, (2, 2), {(2, 3): (Item.METAL_1, False)})
+        self.assertEqual([((2, 3), Item.METAL_1)], field.get_ore_diff())
+        field.dig((2, 4), Pickaxe.METAL_1)
+        field.delete_ore((2, 4))
+        field.dig((3, 4), Pickaxe.METAL_1)
+        expected = {((2, 3), Item.METAL_1), ((2, 4), None)}
+        with patch.object(
+            self.test_field_generator,
+            "get_item",
+            wraps=self.test_field_generator.get_item,
+        ) as mock:
+            self.assertEqual(expected, set(field.get_ore_diff()))
+            self.assertEqual(0, mock.call_count)
+        # 丸ごと差し替えた後は全体を調べ直す
+        field.dig_pos_set = set(field.dig_pos_set)
+        self.assertEqual(expected, set(field.get_ore_diff()))
+
     def test_get_route(self):
         test_cases = [
             ("left", [Direct.LEFT], (-1, 0), set()),
@@ -3,6 +3,7 @@ import sys
 import unittest
 from unittest.mock import patch
 import math
+import random
 
 for p in ["../src/"]:
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), p)))
@@ -15,7 +16,7 @@ from logic import (  # pylint: disable=C0413
 
 
 class TestFieldGenerator(unittest.TestCase):
-    @patch("logic.FieldGenerator._is_appear")
+    @patch("logic.FieldGenerator._get_threshold")
     def test_get_item(self, mock):
         test_cases = [
             ("metal 1", Item.METAL_1, 0),
@@ -33,13 +34,66 @@ class TestFieldGenerator(unittest.TestCase):
                 expected=expected,
                 ret_ture_order=ret_ture_order,
             ):
-                mock.side_effect = [i == ret_ture_order for i in range(len(Item))]
-                field_generator = FieldGenerator.create()
+                mock.side_effect = lambda _, item, order=ret_ture_order: (
+                    1.0 if list(Item).index(item) == order else 0.0
+                )
+                field_generator = FieldGenerator()
                 self.assertEqual(
                     expected,
                     field_generator.get_item(2, 3),
                 )
 
+    def test_get_item_table(self):
+        field_generator = FieldGenerator.create()
+
+        def get_item_without_table(x, y):
+            for item in Item:
+                if field_generator._is_appear(x, y, item):  # pylint: disable=W0212
+                    return item
+            return None
+
+        region = (-30, -10, 60, FieldGenerator.APPEAR_TABLE_DEPTH + 20)
+        items = field_generator.get_items(*region)
+        self.assertEqual(len(items), region[3])
+        for dy, row in enumerate(items):
+            self.assertEqual(len(row), region[2])
+            for dx, item in enumerate(row):
+                pos = (region[0] + dx, region[1] + dy)
+                expected = get_item_without_table(*pos)
+                self.assertEqual(expected, item, pos)
+                self.assertEqual(expected, field_generator.get_item(*pos), pos)
+
+    def test_appear_table_follows_params(self):
+        """作った後に出現パラメータを差し替えても、今の値で判定する"""
+        field_generator = FieldGenerator.create()
+        field_generator.get_item(0, 7)
+        test_cases = [
+            (
+                "replace",
+                patch.object(
+                    FieldGenerator, "FLAT_APPEAR_RATE_MAP", {Item.COAL: (0, 1.0)}
+                ),
+                False,
+            ),
+            (
+                "in place",
+                patch.dict(FieldGenerator.FLAT_APPEAR_RATE_MAP, {Item.COAL: (0, 1.0)}),
+                True,
+            ),
+        ]
+        for case_name, patcher, is_rebuild in test_cases:
+            with self.subTest(case_name=case_name):
+                with patcher:
+                    if is_rebuild:
+                        field_generator.rebuild_appear_table()
+                    # COAL の閾値が 1.0 なので、ほかの鉱石の閾値を下回らない位置は COAL になる
+                    self.assertEqual(Item.COAL, field_generator.get_item(0, 0))
+                field_generator.rebuild_appear_table()
+                self.assertEqual(
+                    FieldGenerator().get_items(-5, 0, 10, 10),
+                    field_generator.get_items(-5, 0, 10, 10),
+                )
+
     @patch("logic.FieldGenerator.get_hash")
     def test_is_appeear(self, mock):
         test_cases = [
@@ -201,6 +255,66 @@ class TestFieldGenerator(unittest.TestCase):
                     field_generator.get_lightest_path(start_pos, rel_pos, dig_pos_set),
                 )
 
+    def test_get_lightest_path_random_field(self):
+        def get_cost(path, dig_pos_set):
+            return sum(1 for p in path[1:] if p[1] > 1 and p not in dig_pos_set)
+
+        def get_path_by_relaxation(start, goal, dig_pos_set):
+            # 置き換え前の実装（矩形内の全マスを (距離, コスト) で緩和する幅優先探索）
+            min_x, max_x = min(start[0], goal[0]) - 1, max(start[0], goal[0]) + 1
+            min_y, max_y = min(start[1], goal[1]) - 1, max(start[1], goal[1]) + 1
+            best = {start: (0, 0)}
+            prev = {}
+            queue = [start]
+            head = 0
+            while head < len(queue):
+                cur = queue[head]
+                head += 1
+                cur_dist, cur_cost = best[cur]
+                if cur == goal:
+                    continue
+                for dx, dy in [(0, 1), (1, 0), (-1, 0), (0, -1)]:
+                    nxt = (cur[0] + dx, cur[1] + dy)
+                    if not (min_x <= nxt[0] <= max_x and min_y <= nxt[1] <= max_y):
+                        continue
+                    nd = cur_dist + 1
+                    nc = cur_cost + (0 if nxt[1] <= 1 or nxt in dig_pos_set else 1)
+                    if (
+                        nxt not in best
+                        or nd < best[nxt][0]
+                        or (nd == best[nxt][0] and nc < best[nxt][1])
+                    ):
+                        best[nxt] = (nd, nc)
+                        prev[nxt] = cur
+                        queue.append(nxt)
+            path = [goal]
+            while path[-1] != start:
+                path.append(prev[path[-1]])
+            path.reverse()
+            return path
+
+        rand = random.Random(0)
+        field_generator = FieldGenerator.create()
+        for i in range(100):
+            dig_pos_set = {
+                (rand.randint(-40, 40), rand.randint(0, 80)) for _ in range(2000)
+            }
+            start = (rand.randint(-20, 20), rand.randint(0, 40))
+            rel_pos = (rand.randint(-20, 20), rand.randint(-20, 40))
+            goal = (start[0] + rel_pos[0], start[1] + rel_pos[1])
+            with self.subTest(i=i, start=start, rel_pos=rel_pos):
+                path = field_generator.get_lightest_path(start, rel_pos, dig_pos_set)
+                expected = get_path_by_relaxation(start, goal, dig_pos_set)
+                self.assertEqual(path[0], start)
+                self.assertEqual(path[-1], goal)
+                for bef, aft in zip(path, path[1:]):
+                    self.assertEqual(abs(aft[0] - bef[0]) + abs(aft[1] - bef[1]), 1)
+                # 同じコストの経路が複数あるときは選ぶ経路が違ってもよい
+                self.assertEqual(len(expected), len(path))
+                self.assertEqual(
+                    get_cost(expected, dig_pos_set), get_cost(path, dig_pos_set)
+                )
+
 
 class TestPickaxeGenerator(unittest.TestCase):
     def test_get_recipe(self):
@@ -1,6 +1,7 @@
 import os
 import sys
 import unittest
+from unittest.mock import patch
 
 for p in ["../src/", "./"]:
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), p)))
@@ -11,7 +12,6 @@ from main import (  # pylint: disable=C0413
     GameCore,
     Direct,
     Color,
-    Ore,
     Bag,
     Cursor,
     Furnace,
@@ -24,6 +24,24 @@ from logic import (  # pylint: disable=C0413
     Item,
     Pickaxe,
 )
+from report_store import ReportStore  # pylint: disable=C0413
+
+
+class MemoryReportStore(ReportStore):
+    def __init__(self):
+        super().__init__()
+        self.storage = None
+        self.save_params = []
+        self.write_params = []
+
+    def set_local_storage(self, value, is_append=False):
+        self.write_params.append(len(value.splitlines()))
+        self.storage = self.storage + value if is_append else value
+        self.save_params.append(len(self.storage.splitlines()))
+        return True
+
+    def get_local_storage(self):
+        return self.storage
 
 
 class TestGameCore(TestUnitParent):
@@ -657,7 +675,7 @@ class TestGameCore(TestUnitParent):
             ):
                 self.reset()
                 self.core.field.dig_pos_set = {(2, 2)}
-                self.core.field.ores_map = {(2, 2): Ore((2, 2), Item.METAL_1)}
+                self.core.field.ores_map = {(2, 2): Item.METAL_1}
                 self.core.bag.item_map = items
                 mouse_pos = tuple(
                     p * 8 - t
@@ -739,7 +757,7 @@ class TestGameCore(TestUnitParent):
                     [
                         ["clear"],
                         ["clip start"],
-                        ["field", dig_pos_set],
+                        ["field", self.core.field.dig_pos_set],
                         ["clip end"],
                         ["position"],
                         ["player", expected[3], D.NUTRAL],
@@ -882,7 +900,7 @@ class TestGameCore(TestUnitParent):
                     [
                         ["clear"],
                         ["clip start"],
-                        ["field", dig_pos_set],
+                        ["field", self.core.field.dig_pos_set],
                         ["furnace", furnace_pos],
                         ["clip end"],
                         ["position"],
@@ -931,7 +949,7 @@ class TestGameCore(TestUnitParent):
                     [
                         ["clear"],
                         ["clip start"],
-                        ["field", dig_pos_set],
+                        ["field", self.core.field.dig_pos_set],
                         ["furnace", (3, 1)],
                         ["clip end"],
                         ["position"],
@@ -1358,6 +1376,96 @@ class TestGameCore(TestUnitParent):
         )
         self.check()
 
+    def test_save_load(self):
+        store = MemoryReportStore()
+        self.mock_report_store.return_value = store
+        self.test_field_generator.set_item(
+            {(2, 4): Item.METAL_1, (3, 4): Item.COAL, (40, 30): Item.METAL_4}
+        )
+        core = GameCore()
+        self.assertEqual(store.save_params, [1])
+        core.field.dig((2, 4), Pickaxe.METAL_1)
+        core.field.dig((3, 4), Pickaxe.METAL_1)
+        core.field.delete_ore((2, 4))
+        core.bag.push(Item.METAL_1)
+        core.bag.push(Pickaxe.METAL_2)
+        core.bag.equip(Bag.EQUIP_TILE_POS, Pickaxe.METAL_2)
+        core.bag.chip_equipment()
+        core._set_avail_item({Item.METAL_1}, 1)  # pylint: disable=W0212
+        core.forge.push(Forge.TILE_POS, Item.METAL_1)
+        core.player.pos = (3, 4)
+        core._save(is_snapshot=False)  # pylint: disable=W0212
+        core.field.dig((40, 30), Pickaxe.METAL_1)
+        core._save(is_snapshot=False)  # pylint: disable=W0212
+        # DELTAは1行ずつ追記する
+        self.assertEqual(store.save_params, [1, 2, 3])
+        self.assertEqual(store.write_params, [1, 1, 1])
+
+        for is_reset in [False, True]:
+            with self.subTest(is_reset=is_reset):
+                store.storage = core.report_store.get_local_storage()
+                loaded = GameCore(is_reset=is_reset)
+                if is_reset:
+                    self.assertEqual(loaded.field.dig_pos_set, {(2, 3)})
+                    self.assertEqual(loaded.bag.item_map, GameCore.INIT_ITEM_MAP)
+                    continue
+                self.assertEqual(loaded.field.dig_pos_set, core.field.dig_pos_set)
+                self.assertEqual(loaded.field.ores_map, core.field.ores_map)
+                self.assertEqual(
+                    loaded.field.ores_map,
+                    {
+                        (2, 3): Item.METAL_1,
+                        (3, 4): Item.COAL,
+                        (40, 30): Item.METAL_4,
+                    },
+                )
+                self.assertEqual(loaded.player.get_pos(None), (3, 4))
+                self.assertEqual(loaded.field.center_pos, (3, 4))
+                self.assertEqual(loaded.bag.item_map, core.bag.item_map)
+                self.assertEqual(loaded.bag.strength_map, core.bag.strength_map)
+                self.assertEqual(loaded.bag.get_equiped(), Pickaxe.METAL_2)
+                self.assertEqual(loaded.avail_item_map, core.avail_item_map)
+                self.assertEqual(loaded.forge.box_item, core.forge.box_item)
+                self.assertEqual(loaded.forge.item_set, {Item.METAL_1})
+                # 読み込み後はスナップショットで書き直す
+                self.assertEqual(len(store.storage.splitlines()), 1)
+
+    def test_save_compact(self):
+        store = MemoryReportStore()
+        store.MAX_DELTA_NUM = 2
+        self.mock_report_store.return_value = store
+        core = GameCore()
+        for x in range(2, 7):
+            core.field.dig((x, 4), Pickaxe.METAL_1)
+            core._save(is_snapshot=False)  # pylint: disable=W0212
+        # DELTAがMAX_DELTA_NUMを超えるとSNAPSHOTにまとめ直す
+        self.assertEqual(store.save_params, [1, 2, 3, 1, 2, 3])
+        loaded = GameCore()
+        self.assertEqual(loaded.field.dig_pos_set, core.field.dig_pos_set)
+
+    def test_save_only_when_changed(self):
+        """選択を変えただけのクリックではセーブせず、装備を変えたらセーブする"""
+        store = MemoryReportStore()
+        self.mock_report_store.return_value = store
+        core = GameCore()
+        core.bag.item_map = {Pickaxe.METAL_1: 1}
+        pickaxe_pos = (
+            Bag.TILE_POS[0] + Bag.ITEM_POS_MAP[1].index(Pickaxe.METAL_1),
+            Bag.TILE_POS[1] + 1,
+        )
+        test_cases = [
+            ("select", pickaxe_pos, [1]),
+            ("equip", Bag.EQUIP_TILE_POS, [1, 2]),
+        ]
+        for case_name, select_pos, expected in test_cases:
+            with self.subTest(case_name=case_name):
+                with patch.object(core.cursor, "update"), patch.object(
+                    core.cursor, "get_select_pos", return_value=select_pos
+                ):
+                    core.update()
+                self.assertEqual(expected, store.save_params)
+        self.assertEqual(Pickaxe.METAL_1, core.bag.get_equiped())
+
 
 if __name__ == "__main__":
     unittest.main()
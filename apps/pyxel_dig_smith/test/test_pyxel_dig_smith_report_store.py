@@ -0,0 +1,155 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from report_store import (  # pylint: disable=C0413
+    RecordType,
+    ReportStore,
+    SaveRecord,
+)
+
+
+def _make_record(record_type=RecordType.SNAPSHOT):
+    return SaveRecord(
+        record_type,
+        (3, -4),
+        [((0, 0), bytes(range(32))), ((-1, 2), bytes(32))],
+        [(5, 6), (-7, 8)],
+        [((2, 3), 1), ((9, 9), 0)],
+        [1, 0, 255],
+        [30, 0, 65535],
+        12,
+        [0, -1, 5],
+        (7, 0b1010),
+    )
+
+
+class TestSaveRecord(unittest.TestCase):
+    def test_to_bytes(self):
+        test_cases = [
+            ("snapshot", _make_record()),
+            ("delta", _make_record(RecordType.DELTA)),
+            ("empty", SaveRecord(RecordType.DELTA, (0, 0))),
+        ]
+        for case_name, record in test_cases:
+            with self.subTest(case_name=case_name):
+                self.assertEqual(record, SaveRecord.from_bytes(record.to_bytes()))
+
+    def test_from_bytes_broken(self):
+        data = _make_record().to_bytes()
+        test_cases = [
+            ("truncated", data[:-1]),
+            ("trailing", data + b"\x00"),
+            ("empty", b""),
+            ("unknown type", b"\x09" + data[1:]),
+        ]
+        for case_name, target in test_cases:
+            with self.subTest(case_name=case_name):
+                self.assertIsNone(SaveRecord.from_bytes(target))
+
+
+class TestReportStore(unittest.TestCase):
+    @patch.object(ReportStore, "set_local_storage")
+    def test_save(self, mock):
+        mock.return_value = True
+        report_store = ReportStore()
+        test_cases = [
+            ("snapshot", RecordType.SNAPSHOT, False, 0),
+            ("delta", RecordType.DELTA, True, 1),
+            ("delta twice", RecordType.DELTA, True, 2),
+            ("snapshot again", RecordType.SNAPSHOT, False, 0),
+        ]
+        for case_name, record_type, is_append, delta_num in test_cases:
+            with self.subTest(case_name=case_name):
+                self.assertEqual(True, report_store.save(_make_record(record_type)))
+                (value,) = mock.call_args.args
+                self.assertEqual(
+                    is_append, mock.call_args.kwargs.get("is_append", False)
+                )
+                # 書き込むのは今回のレコードの1行だけ
+                self.assertTrue(value.endswith("\n"))
+                self.assertEqual(1, len(value.splitlines()))
+                self.assertEqual(delta_num, report_store.delta_num)
+
+    def test_is_compact_needed(self):
+        report_store = ReportStore()
+        report_store.delta_num = ReportStore.MAX_DELTA_NUM - 1
+        self.assertFalse(report_store.is_compact_needed())
+        report_store.delta_num += 1
+        self.assertTrue(report_store.is_compact_needed())
+
+    def test_set_local_storage(self):
+        with tempfile.TemporaryDirectory() as dir_name:
+            save_path = os.path.join(dir_name, "save.txt")
+            delta_path = os.path.join(dir_name, "delta.txt")
+            with patch.multiple(
+                ReportStore, SAVE_FILENAME=save_path, SAVE_DELTA_FILENAME=delta_path
+            ):
+                report_store = ReportStore()
+                self.assertTrue(report_store.set_local_storage("a\n"))
+                self.assertTrue(report_store.set_local_storage("b\n", is_append=True))
+                self.assertTrue(report_store.set_local_storage("c\n", is_append=True))
+                with open(delta_path, encoding="utf-8") as f:
+                    self.assertEqual("b\nc\n", f.read())
+                # 置き換えると、まだ移されていない追記分は捨てる
+                self.assertTrue(report_store.set_local_storage("d\n"))
+                self.assertFalse(os.path.exists(delta_path))
+                with open(save_path, encoding="utf-8") as f:
+                    self.assertEqual("d\n", f.read())
+
+    def test_local_storage_fail(self):
+        report_store = ReportStore()
+        with patch("builtins.open", side_effect=PermissionError):
+            self.assertFalse(report_store.set_local_storage("test"))
+            self.assertIsNone(report_store.get_local_storage())
+
+    @patch.object(ReportStore, "get_local_storage")
+    @patch.object(ReportStore, "set_local_storage")
+    def test_load(self, mock_set, mock_get):
+        report_store = ReportStore()
+        snapshot = _make_record()
+        delta = _make_record(RecordType.DELTA)
+        report_store.save(snapshot)
+        report_store.save(delta)
+        snapshot_line, delta_line = (call.args[0] for call in mock_set.call_args_list)
+        save_str = snapshot_line + delta_line
+        version_line = report_store._crypt(  # pylint: disable=W0212
+            bytes([ReportStore.VERSION + 1]) + snapshot.to_bytes()
+        )
+        test_cases = [
+            ("success", [snapshot, delta], save_str),
+            ("broken tail", [snapshot], snapshot_line + delta_line[:10]),
+            ("broken middle", [snapshot], snapshot_line + "!!\n" + delta_line),
+            ("no snapshot", None, delta_line + snapshot_line),
+            ("unmatch version", None, version_line),
+            ("empty", None, ""),
+            ("fail", None, None),
+        ]
+        for case_name, expected, load_str in test_cases:
+            with self.subTest(case_name=case_name):
+                mock_get.return_value = load_str
+                self.assertEqual(expected, report_store.load())
+
+    def test_crypt(self):
+        test_cases = [
+            ("case1", b"test", b"test", False),
+            ("case2", bytes(range(100)), bytes(range(100)), False),
+            ("error", None, "error test", True),
+        ]
+        for case_name, expected, target, is_broken in test_cases:
+            with self.subTest(case_name=case_name):
+                report_store = ReportStore()
+                if is_broken:
+                    crypt_str = target  # 破損データを模擬
+                else:
+                    crypt_str = report_store._crypt(target)  # pylint: disable=W0212
+                self.assertEqual(
+                    expected, report_store._decrypt(crypt_str)  # pylint: disable=W0212
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+import main  # pylint: disable=C0413
+from logic import FieldGenerator, Item, Pickaxe  # pylint: disable=C0413
+from solver import (  # pylint: disable=C0413
+    DigSmithSolver,
+    GreedyDigPolicy,
+    NullReportStore,
+    NullView,
+    RunStatus,
+    ScriptedInput,
+    SeededFieldGenerator,
+    create_game_core,
+    get_material_list,
+    headless,
+    make_scenarios,
+    run_benchmarks,
+    run_sweep,
+    shift_peak_map,
+    write_report,
+)
+
+
+class TestSolver(unittest.TestCase):
+    def test_headless(self):
+        with headless() as scripted_input:
+            self.assertIsInstance(main.PyxelView.create(), NullView)
+            self.assertIs(main.PyxelInput.create(), scripted_input)
+            self.assertIs(main.ReportStore, NullReportStore)
+        self.assertNotIn("create", vars(main.PyxelView))
+        self.assertIsNot(main.ReportStore, NullReportStore)
+
+    def test_scripted_input(self):
+        scripted_input = ScriptedInput()
+        scripted_input.click((3, 2))
+        for _ in range(2):
+            self.assertTrue(scripted_input.is_click())
+            self.assertEqual(
+                (scripted_input.get_mouse_x() // 8, scripted_input.get_mouse_y() // 8),
+                (3, 2),
+            )
+        self.assertFalse(scripted_input.is_click())
+        self.assertTrue(scripted_input.is_empty())
+
+    def test_seeded_field_generator(self):
+        pos_list = [(x, y) for x in range(-10, 10) for y in range(2, 60)]
+        default = FieldGenerator()
+        seeded_list = [SeededFieldGenerator(seed) for seed in [None, 0, 0, 1]]
+        items_list = [[g.get_item(*pos) for pos in pos_list] for g in seeded_list]
+        self.assertEqual(items_list[0], [default.get_item(*pos) for pos in pos_list])
+        self.assertEqual(items_list[1], items_list[2])
+        self.assertNotEqual(items_list[1], items_list[3])
+
+    def test_create_game_core(self):
+        peak_map = shift_peak_map(3)
+        game_core = create_game_core(
+            {"APPEAR_PEAK_MAP": peak_map, "MAX_STRENGTH": 5}, seed=2
+        )
+        self.assertIsInstance(game_core.report_store, NullReportStore)
+        self.assertEqual(game_core.field.field_generator.seed, 2)
+        self.assertEqual(game_core.field.field_generator.APPEAR_PEAK_MAP, peak_map)
+        self.assertEqual(FieldGenerator.APPEAR_PEAK_MAP[Item.METAL_1], 7)
+        self.assertEqual(game_core.bag.strength_map[Pickaxe.METAL_1], 5)
+        self.assertEqual(game_core.bag.strength_map[Pickaxe.JEWEL], 15)
+        self.assertEqual(main.Bag.MAX_STRENGTH, 20)
+        with self.assertRaises(ValueError):
+            create_game_core({"UNKNOWN": 1})
+
+    def test_smith(self):
+        solver = DigSmithSolver(seed=0)
+        bag = solver.game_core.bag
+        bag.item_map = {Item.METAL_1: 1, Item.METAL_2: 1, Item.COAL: 2}
+        bag.equip_item = None
+        solver.max_frames = 2000
+        policy = solver.policy
+        expected_list = [Pickaxe.METAL_1, Pickaxe.METAL_2]
+        for expected in expected_list:
+            with self.subTest(expected=expected):
+                while bag.get_item_count(expected) == 0:
+                    clicks = policy.get_clicks(solver.game_core)
+                    for tile_pos in clicks:
+                        solver.input.click(tile_pos)
+                    solver._run_until_idle()  # pylint: disable=W0212
+                    self.assertLess(solver.frames, solver.max_frames)
+        self.assertEqual(bag.get_item_count(Pickaxe.METAL_1), 0)
+        self.assertEqual(bag.get_item_count(Pickaxe.METAL_2), 1)
+        self.assertEqual(bag.get_item_count(Item.COAL), 0)
+        self.assertEqual(solver.smiths, 2)
+        self.assertEqual(solver.game_core.player.get_pos(None), (1, 1))
+
+    def test_get_material_list(self):
+        test_cases = [
+            (Pickaxe.METAL_1, [Item.METAL_1, Item.COAL]),
+            (Pickaxe.METAL_3, [Item.METAL_3, Pickaxe.METAL_2, Item.COAL]),
+            (Item.COAL, []),
+        ]
+        for pickaxe, expected in test_cases:
+            with self.subTest(pickaxe=pickaxe):
+                self.assertEqual(
+                    [item for item, _ in get_material_list(pickaxe)], expected
+                )
+
+    def test_run(self):
+        result = DigSmithSolver({"MAX_STRENGTH": 10}, seed=1, max_frames=3000).run()
+        self.assertEqual(result["status"], RunStatus.TIMEOUT)
+        self.assertEqual(result["frames"], 3000)
+        self.assertEqual(result["MAX_STRENGTH"], 10)
+        self.assertGreater(result["moves"], 0)
+        self.assertGreater(result["digs"], 0)
+        self.assertGreaterEqual(result["digs"], result["breaks"] * 10)
+        self.assertFalse(os.path.exists(main.ReportStore.SAVE_FILENAME))
+
+    def test_run_game_over(self):
+        solver = DigSmithSolver(seed=1)
+        solver.game_core.bag.item_map = {}
+        solver.game_core.avail_item_map = {}
+        result = solver.run()
+        self.assertEqual(result["status"], RunStatus.GAME_OVER)
+        self.assertEqual(result["frames"], 0)
+
+    def test_run_stuck(self):
+        class NoMovePolicy(GreedyDigPolicy):
+            def get_clicks(self, game_core):
+                return [main.Bag.EQUIP_TILE_POS]
+
+        result = DigSmithSolver(seed=1, policy=NoMovePolicy()).run()
+        self.assertEqual(result["status"], RunStatus.STUCK)
+        self.assertEqual(result["frames"], DigSmithSolver.STUCK_LIMIT * 2)
+
+    def test_run_sweep(self):
+        scenarios = make_scenarios({"MAX_STRENGTH": [5, 20]})
+        expected = [
+            DigSmithSolver(params, seed, max_frames=1000).run()
+            for params in scenarios
+            for seed in [0, 1]
+        ]
+        self.assertEqual(run_sweep(scenarios, [0, 1], 1000, processes=1), expected)
+        self.assertEqual(run_sweep(scenarios, [0, 1], 1000, processes=2), expected)
+
+    def test_write_report(self):
+        results = [
+            {
+                "FLAT_APPEAR_RATE_MAP": {Item.COAL: (0, 0.2)},
+                "seed": 0,
+                "status": RunStatus.CLEAR,
+                "pickaxe": Pickaxe.METAL_5,
+            }
+        ]
+        file = io.StringIO()
+        write_report(results, file)
+        self.assertEqual(
+            file.getvalue().splitlines(),
+            ["FLAT_APPEAR_RATE_MAP,seed,status,pickaxe", "COAL=0/0.2,0,clear,METAL_5"],
+        )
+
+    def test_run_benchmarks(self):
+        results = run_benchmarks(number=1, repeat=1)
+        self.assertIn(
+            "FieldGenerator.get_lightest_path x100", [r["name"] for r in results]
+        )
+        for result in results:
+            self.assertGreater(result["per_call"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -134,12 +134,16 @@ class TestUnitParent(TestParent):
             "main.GameCore.is_game_over", return_value=False
         )
         self.mock_bag_is_game_over = self.patcher_gamecore_is_game_over.start()
+        self.patcher_report_store = patch("main.ReportStore")
+        self.mock_report_store = self.patcher_report_store.start()
+        self.mock_report_store.return_value.load.return_value = None
 
     def tearDown(self):
         super().tearDown()
         self.patcher_unit_view.stop()
         self.patcher_field_generator.stop()
         self.patcher_gamecore_is_game_over.stop()
+        self.patcher_report_store.stop()
 
     def reset(self):
         super().reset()
@@ -0,0 +1,477 @@
+import copy
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+from fish import Fish, FishRarity, FishSize
+from hook import BaitType, Hook, HookState
+from main import (
+    FishCatchPopup,
+    GameCore,
+    IFishView,
+    IInput,
+    IView,
+    TournamentGameCore,
+)
+
+
+class HeadlessView(IView):
+    """何も描かない View（pyxel を import しない）。"""
+
+    def draw_text(self, x, y, text):
+        pass
+
+    def draw_line(self, x1, y1, x2, y2, color):
+        pass
+
+    def draw_blt(self, x, y, img, u, v, w, h, colkey):
+        pass
+
+    def draw_rectb(self, x, y, w, h, color):
+        pass
+
+    def draw_rect(self, x, y, w, h, color):
+        pass
+
+    def get_frame(self) -> int:
+        return 0
+
+    def create_layer(self, w, h):
+        return self
+
+    def draw_layer(self, x, y, layer):
+        pass
+
+
+class HeadlessFishView(IFishView):
+    def draw_fish(self, x, y, fish_size, vx, is_hit: bool):
+        pass
+
+
+class BotInput(IInput):
+    """BotPolicy が毎フレーム書き換える入力。"""
+
+    def __init__(self):
+        self.pressed = False
+        self.held = False
+        self.x = 0
+        self.y = 0
+
+    def set(self, pressed=False, held=False, pos=(0, 0)):
+        self.pressed = pressed
+        self.held = held
+        self.x, self.y = pos
+
+    def is_mouse_btn_pressed(self) -> bool:
+        return self.pressed
+
+    def is_mouse_btn_held(self) -> bool:
+        return self.held
+
+    @property
+    def mouse_x(self) -> int:
+        return self.x
+
+    @property
+    def mouse_y(self) -> int:
+        return self.y
+
+
+class HeadlessGameCore(GameCore):
+    def _create_view(self):
+        return HeadlessView()
+
+    def _create_input(self):
+        return BotInput()
+
+    def _create_fish_view(self):
+        return HeadlessFishView()
+
+    def skip_frames(self, frame_num) -> int:
+        """入力を変えずに update を続けるのと同じだけ、最大 frame_num フレームを一度に進める。
+
+        フックの状態が変わるフレームと、魚がフックに重なるフレームの手前で止まり、
+        進めたフレーム数を返す（そのフレームは通常の update で処理する）。
+        進める区間はスポーンの間隔ごとに分け、区間ごとに GameCore._update_frames で進める。
+        投擲中は次のスポーンまでに着水するなら Hook.skip_throw で着水まで進める。
+        ポップアップ表示中・ゲームオーバー後と、魚を掛けて巻いていないときは 0 を返す。
+        """
+        hook = self.hook
+        state = hook.state
+        if self.is_game_over or self.is_popup_visible:
+            return 0
+        if self.following_fish is not None and state != HookState.REELING:
+            return 0
+        if state == HookState.THROWING:
+            # 投擲の軌道は水面より上なので、着水点が届かなければ途中も届かない
+            probe = copy.copy(hook)
+            throw_frames = probe.skip_throw()
+            if throw_frames <= min(
+                frame_num, self._get_spawn_frames()
+            ) and self._is_out_of_reach([(probe.x, probe.y)]):
+                self._update_frames(throw_frames, vars(probe))
+                return throw_frames
+        # フックだけを写しで進め、状態が変わる手前までの毎フレームの属性と位置を集める
+        probe = copy.copy(hook)
+        probe_vars = vars(probe)
+        hook_vars_list = []
+        hook_pos_list = []
+        for _ in range(frame_num):
+            probe.update()
+            if probe.state != state:
+                break
+            # Hook の属性はすべて使い回しのない値なので、浅い写しで巻き戻せる
+            hook_vars_list.append(probe_vars.copy())
+            hook_pos_list.append((probe.x, probe.y))
+        is_hit_check = self.following_fish is None and not self._is_out_of_reach(
+            hook_pos_list
+        )
+        skipped = 0
+        while skipped < len(hook_pos_list):
+            step = min(len(hook_pos_list) - skipped, self._get_spawn_frames())
+            move_frames = step
+            if is_hit_check:
+                move_frames = self._get_overlap_frame(
+                    hook_pos_list[skipped : skipped + step]
+                )
+            if move_frames == 0:
+                break
+            skipped += move_frames
+            self._update_frames(move_frames, hook_vars_list[skipped - 1])
+            if move_frames < step:
+                # 次のフレームで魚がフックに重なる
+                break
+        return skipped
+
+    def _get_spawn_frames(self) -> int:
+        """次のスポーンが起きるフレームまでのフレーム数（そのフレームを含む）。"""
+        return self._next_spawn_interval - self._spawn_timer
+
+    def _is_out_of_reach(self, hook_pos_list) -> bool:
+        """どのフック位置も、ヒット前の魚・これから出る魚の頭の y から離れているか。"""
+        if len(hook_pos_list) == 0:
+            return True
+        head_y_list = [
+            y_min + Fish._HEAD_OFFSET_Y  # pylint: disable=W0212
+            for y_min, _ in self.FISH_Y_RANGE_BY_SIZE.values()
+        ]
+        head_y_list.extend(
+            fish.get_head_pos()[1] for fish in self.fish_list if not fish.is_hit
+        )
+        half = Fish.TILE_SIZE / 2
+        return max(y for _, y in hook_pos_list) < min(head_y_list) - half
+
+    def _get_overlap_frame(self, hook_pos_list) -> int:
+        """ヒット前の魚が hook_pos_list のどれかのフレームでフックに重なるまでのフレーム数。
+
+        重ならなければ len(hook_pos_list) を返す。
+        """
+        half = Fish.TILE_SIZE / 2
+        y_list = [y for _, y in hook_pos_list]
+        y_min, y_max = min(y_list) - half, max(y_list) + half
+        frame = len(hook_pos_list)
+        for fish in self.fish_list:
+            # 頭の y がどのフック位置からも離れている魚は重ならない
+            if not fish.is_hit and y_min <= fish.get_head_pos()[1] <= y_max:
+                frame = min(frame, fish.find_overlap_frame(hook_pos_list))
+        return frame
+
+
+class HeadlessTournamentGameCore(TournamentGameCore, HeadlessGameCore):
+    """TournamentGameCore を描画なしで動かす。"""
+
+
+class BotPolicy:
+    """充電量・えさ・巻き始めのタイミングを固定した操作方針。
+
+    charge_frames: 投擲前にボタンを押し続けるフレーム数
+    bait_type: 使うえさ（違えば待機中にボタンを押して切り替える）
+    reel_delay: 着水してから巻き始めるまでのフレーム数（魚が掛かったらすぐ巻く）
+    """
+
+    BAIT_BTN_POS_MAP = {
+        BaitType.FLOAT_BAIT: (GameCore.FLOAT_BAIT_BTN_X, GameCore.FLOAT_BAIT_BTN_Y),
+        BaitType.LURE: (GameCore.LURE_BTN_X, GameCore.LURE_BTN_Y),
+    }
+    POPUP_POS = (FishCatchPopup.X, FishCatchPopup.Y)
+
+    def __init__(
+        self,
+        charge_frames=Hook.MAX_CHARGE_FRAMES,
+        bait_type=BaitType.FLOAT_BAIT,
+        reel_delay=60,
+    ):
+        self.charge_frames = charge_frames
+        self.bait_type = bait_type
+        self.reel_delay = reel_delay
+        self._state_frames = 0
+        self._prev_state = None
+
+    def __repr__(self):
+        return (
+            f"BotPolicy(charge_frames={self.charge_frames}, "
+            f"bait_type={self.bait_type.name}, reel_delay={self.reel_delay})"
+        )
+
+    def act(self, core, bot_input):
+        """core の状態を見て、次の update で使う入力を bot_input に設定する。"""
+        hook = core.hook
+        state = hook.state
+        if state != self._prev_state:
+            self._state_frames = 0
+            self._prev_state = state
+        self._state_frames += 1
+        if core.is_popup_visible:
+            bot_input.set(pressed=True, pos=self.POPUP_POS)
+        elif state == HookState.IDLE:
+            if hook.bait_type != self.bait_type:
+                bot_input.set(pressed=True, pos=self.BAIT_BTN_POS_MAP[self.bait_type])
+                self._state_frames = 0
+            else:
+                # charge_frames 回押し続けた次のフレームで離す
+                bot_input.set(held=self._state_frames <= self.charge_frames)
+        elif state in (HookState.SURFACE, HookState.SINKING):
+            landed_frames = self._state_frames if state == HookState.SINKING else 0
+            is_reel = (
+                core.following_fish is not None
+                or landed_frames >= self.reel_delay
+                or hook.y >= Hook.FINISH_Y_MAX - 1
+            )
+            bot_input.set(held=is_reel)
+        else:
+            bot_input.set(held=state == HookState.REELING)
+
+    def get_repeat_frames(self, core, frame_num) -> int:
+        """フックの状態が変わらない限り、act が今の入力をこのあと何フレーム続けるか（最大 frame_num）。"""
+        bot_input = core.input
+        if bot_input.pressed or core.is_popup_visible:
+            return 0
+        hook = core.hook
+        state = hook.state
+        if state == HookState.IDLE and bot_input.held:
+            return max(0, min(frame_num, self.charge_frames - self._state_frames))
+        if state == HookState.SINKING and not bot_input.held:
+            # reel_delay に届くか、フックが下限の手前まで沈んだら巻き始める
+            sink_frames = (Hook.FINISH_Y_MAX - 1 - hook.y) / Hook.SINK_VY_MAP[
+                hook.bait_type
+            ]
+            return max(
+                0,
+                min(
+                    frame_num,
+                    self.reel_delay - self._state_frames - 1,
+                    int(sink_frames),
+                ),
+            )
+        if state in (HookState.SURFACE, HookState.SINKING) and bot_input.held:
+            return 0
+        return frame_num
+
+    def skip_frames(self, frame_num):
+        """act を呼ばずに進めた frame_num フレームを数えに入れる。"""
+        self._state_frames += frame_num
+
+    def reset(self):
+        """前のセッションで数えていた状態とフレーム数を捨て、新しいセッションに備える。"""
+        self._state_frames = 0
+        self._prev_state = None
+
+
+def _new_count_map():
+    return {
+        "size": {size.name: 0 for size in FishSize},
+        "rarity": {rarity.name: 0 for rarity in FishRarity},
+    }
+
+
+class SessionSimulator:
+    """GameCore をゲームオーバーまで動かし、1 セッション分の結果を集める。"""
+
+    MAX_FRAMES = 60 * 60 * 30
+
+    def __init__(
+        self, policy, max_frames=MAX_FRAMES, is_fast=True, core_cls=HeadlessGameCore
+    ):
+        self.policy = policy
+        self.max_frames = max_frames
+        # 入力が変わらず魚も掛からない区間を HeadlessGameCore.skip_frames でまとめて進める
+        self.is_fast = is_fast
+        self.core_cls = core_cls
+
+    def run(self, seed):
+        random.seed(seed)
+        core = self.core_cls()
+        self.policy.reset()
+        result = {
+            "seed": seed,
+            "score": 0,
+            "frames": 0,
+            "throws": 0,
+            "hooked": _new_count_map(),
+            "caught": _new_count_map(),
+            "line_breaks": 0,
+            "escapes": 0,
+        }
+        while not core.is_game_over and result["frames"] < self.max_frames:
+            hook = core.hook
+            fish = core.following_fish
+            prev_state = hook.state
+            self.policy.act(core, core.input)
+            core.update()
+            result["frames"] += 1
+            if prev_state == HookState.IDLE and hook.state == HookState.THROWING:
+                result["throws"] += 1
+            if self.is_fast and core.hook is hook and hook.state == prev_state:
+                frame_num = self.policy.get_repeat_frames(
+                    core, self.max_frames - result["frames"]
+                )
+                skipped = core.skip_frames(frame_num) if frame_num > 0 else 0
+                self.policy.skip_frames(skipped)
+                result["frames"] += skipped
+            if fish is None:
+                fish = core.following_fish
+                if fish is not None:
+                    self._count(result["hooked"], fish)
+                continue
+            if core.hook is hook:
+                continue
+            # フックが作り直された: 追従中だった魚の結末を数える
+            if hook.state == HookState.FINISHED_SUCCESS:
+                self._count(result["caught"], fish)
+            elif hook.is_line_broken:
+                result["line_breaks"] += 1
+            else:
+                result["escapes"] += 1
+        result["score"] = core.score
+        return result
+
+    @staticmethod
+    def _count(count_map, fish):
+        count_map["size"][fish.fish_size.name] += 1
+        count_map["rarity"][fish.fish_rarity.name] += 1
+
+
+# 調整対象の定数を "クラス名.属性名" で指定するためのクラス一覧
+PARAM_CLASS_MAP = {
+    "Fish": Fish,
+    "Hook": Hook,
+    "GameCore": GameCore,
+    "TournamentGameCore": TournamentGameCore,
+}
+
+
+def _apply_params(params):
+    """定数を書き換え、元の値を返す。"""
+    old = {}
+    for key, value in params.items():
+        cls_name, attr = key.split(".")
+        cls = PARAM_CLASS_MAP[cls_name]
+        old[key] = getattr(cls, attr)
+        setattr(cls, attr, value)
+    return old
+
+
+def _run_chunk(task):
+    policy, seed_list, params, max_frames, core_cls = task
+    old = _apply_params(params)
+    try:
+        simulator = SessionSimulator(policy, max_frames, core_cls=core_cls)
+        return [simulator.run(seed) for seed in seed_list]
+    finally:
+        _apply_params(old)
+
+
+def _percentile(sorted_list, ratio):
+    return sorted_list[min(len(sorted_list) - 1, int(len(sorted_list) * ratio))]
+
+
+def _get_rate_map(num_map, den_map):
+    return {
+        key: num_map[key] / den_map[key] if den_map[key] > 0 else 0.0 for key in den_map
+    }
+
+
+def aggregate(results):
+    """セッション結果をスコア分布・サイズ/レア度別の釣り上げ率・糸切れ率にまとめる。"""
+    score_list = sorted(r["score"] for r in results)
+    hooked = _new_count_map()
+    caught = _new_count_map()
+    for r in results:
+        for kind in ("size", "rarity"):
+            for key in hooked[kind]:
+                hooked[kind][key] += r["hooked"][kind][key]
+                caught[kind][key] += r["caught"][kind][key]
+    hooked_num = sum(hooked["size"].values())
+    line_breaks = sum(r["line_breaks"] for r in results)
+    return {
+        "sessions": len(results),
+        "score": {
+            "mean": sum(score_list) / len(score_list),
+            "min": score_list[0],
+            "p10": _percentile(score_list, 0.1),
+            "p50": _percentile(score_list, 0.5),
+            "p90": _percentile(score_list, 0.9),
+            "max": score_list[-1],
+        },
+        "frames_mean": sum(r["frames"] for r in results) / len(results),
+        "throws_mean": sum(r["throws"] for r in results) / len(results),
+        "hooked": hooked,
+        "caught": caught,
+        "catch_rate": {
+            kind: _get_rate_map(caught[kind], hooked[kind]) for kind in caught
+        },
+        "line_break_rate": line_breaks / hooked_num if hooked_num > 0 else 0.0,
+        "escape_rate": (
+            sum(r["escapes"] for r in results) / hooked_num if hooked_num > 0 else 0.0
+        ),
+    }
+
+
+def analyze(
+    policy,
+    session_num,
+    seed=0,
+    params=None,
+    processes=None,
+    max_frames=SessionSimulator.MAX_FRAMES,
+    core_cls=HeadlessGameCore,
+):
+    """session_num 回のセッションをプロセスプールで動かして集計する。
+
+    params: {"Fish.HIT_PROBABILITY": 0.5} のように定数を差し替えて試す。
+    core_cls: HeadlessTournamentGameCore を渡すと、魚を数百匹にしたモードで動かす。
+    """
+    params = params or {}
+    seed_list = list(range(seed, seed + session_num))
+    if processes == 1:
+        results = _run_chunk((policy, seed_list, params, max_frames, core_cls))
+    else:
+        processes = os.cpu_count() if processes is None else processes
+        chunk_size = max(1, session_num // (processes * 4))
+        tasks = [
+            (policy, seed_list[i : i + chunk_size], params, max_frames, core_cls)
+            for i in range(0, session_num, chunk_size)
+        ]
+        with Pool(processes) as pool:
+            results = [r for chunk in pool.map(_run_chunk, tasks) for r in chunk]
+    return aggregate(results)
+
+
+if __name__ == "__main__":
+    session_num = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    # 2 つ目の引数に tournament を渡すと、魚を数百匹にしたモードで動かす
+    is_tournament = len(sys.argv) > 2 and sys.argv[2] == "tournament"
+    for bait_type in BaitType:
+        start = time.perf_counter()
+        summary = analyze(
+            BotPolicy(bait_type=bait_type),
+            session_num,
+            core_cls=HeadlessTournamentGameCore if is_tournament else HeadlessGameCore,
+        )
+        seconds = time.perf_counter() - start
+        print(f"{bait_type.name}: {session_num / seconds * 60:.0f} sessions/min")
+        print(f"  score: {summary['score']}")
+        print(f"  catch rate: {summary['catch_rate']}")
+        print(f"  line break rate: {summary['line_break_rate']:.3f}")
@@ -117,6 +117,51 @@ class Fish:
                 self._vx = abs(self._vx)
         # is_hit=True: 逃げモード。壁折り返しなし、そのまま画面外へ消える
 
+    def update_frames(self, frame_num):
+        """update を frame_num 回呼ぶのと同じだけ進める（ヘッドレス実行用）。"""
+        x, vx = self._x, self._vx
+        if self._is_hit:
+            for _ in range(frame_num):
+                x += vx
+        else:
+            x_min, x_max, tile_size = self._x_min, self._x_max, self.TILE_SIZE
+            for _ in range(frame_num):
+                # update と同じ順序・同じ浮動小数点演算で進める
+                x += vx
+                if x + tile_size > x_max:
+                    x = x_max - tile_size
+                    vx = -abs(vx)
+                if x <= x_min:
+                    x = x_min
+                    vx = abs(vx)
+        self._x, self._vx = x, vx
+
+    def find_overlap_frame(self, hook_pos_list) -> int:
+        """このまま update を続けたとき、i+1 回目の後に hook_pos_list[i] と重なる最初の i を返す。
+
+        重ならなければ len(hook_pos_list)。魚の状態は変えない。
+        """
+        half = self.TILE_SIZE / 2
+        head_y = int(self._y) + self._HEAD_OFFSET_Y
+        x, vx = self._x, self._vx
+        x_min, x_max, tile_size = self._x_min, self._x_max, self.TILE_SIZE
+        for i, (hook_x, hook_y) in enumerate(hook_pos_list):
+            x += vx
+            if not self._is_hit:
+                if x + tile_size > x_max:
+                    x = x_max - tile_size
+                    vx = -abs(vx)
+                if x <= x_min:
+                    x = x_min
+                    vx = abs(vx)
+            offset_x = self._HEAD_OFFSET_X if vx > 0 else 0
+            if (
+                abs(hook_x - (int(x) + offset_x)) <= half
+                and abs(hook_y - head_y) <= half
+            ):
+                return i
+        return len(hook_pos_list)
+
     def try_hit(self) -> bool:
         """ヒット確率判定。ヒット成立時にヒット状態への遷移と逃げ開始を同時に行う。
 
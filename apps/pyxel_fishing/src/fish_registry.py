@@ -0,0 +1,165 @@
+from bisect import bisect_left, bisect_right
+
+from fish import FishSize
+
+
+class _Bucket:
+    """同じサイズの魚の集まり。頭の y の範囲と、頭の x 順に並べた一覧を持つ。"""
+
+    def __init__(self, moved_num):
+        self.entry_list = []  # [頭の x, 追加順, 魚] を頭の x 順に並べたもの
+        self.x_list = []  # entry_list の頭の x だけの一覧（bisect 用）
+        self.y_min = 0
+        self.y_max = 0
+        self.moved_num = moved_num  # 最後に並べ直したときの FishRegistry の移動回数
+
+    def add(self, seq, fish, moved_num):
+        head_x = fish.get_head_pos()[0]
+        entry = [head_x, seq, fish]
+        if self.moved_num != moved_num:
+            # 並べ直し待ちなので末尾に置き、次の sort_by_x でまとめて並べる
+            self.entry_list.append(entry)
+            self.x_list.append(head_x)
+            return
+        index = bisect_right(self.entry_list, entry)
+        self.entry_list.insert(index, entry)
+        self.x_list.insert(index, head_x)
+
+    def remove(self, removed_set):
+        self.entry_list = [e for e in self.entry_list if e[2] not in removed_set]
+        self.x_list = [e[0] for e in self.entry_list]
+
+    def update_y_range(self):
+        y_list = [entry[2].get_head_pos()[1] for entry in self.entry_list]
+        self.y_min = min(y_list)
+        self.y_max = max(y_list)
+
+    def sort_by_x(self, moved_num):
+        """頭の x を取り直し、挿入ソートで並べ直す。
+
+        魚は 1 フレームに少しずつしか動かないので、前回の並びからの入れ替わりはわずかで済む。
+        """
+        entry_list = self.entry_list
+        for entry in entry_list:
+            entry[0] = entry[2].get_head_pos()[0]
+        for i in range(1, len(entry_list)):
+            entry = entry_list[i]
+            j = i
+            while j > 0 and entry_list[j - 1] > entry:
+                entry_list[j] = entry_list[j - 1]
+                j -= 1
+            entry_list[j] = entry
+        self.x_list = [entry[0] for entry in entry_list]
+        self.moved_num = moved_num
+
+
+class FishRegistry:
+    """魚の一覧を、サイズ（深度帯）ごとに頭の x 順で並べたバケツにも分けて持つ。
+
+    一覧としては追加順を保ったリストとして振る舞う（GameCore.fish_list）。
+    当たり判定では、フックの y が届く深度帯のバケツだけを、頭の x が範囲に入る分だけ調べる。
+    バケツの深度帯はサイズごとの出現範囲ではなく、実際に入っている魚の頭の y から求める。
+    魚の追加・除去はそのバケツの並びに差し込む・抜くだけで済ませる。
+    魚が動いたら mark_moved() を呼ぶ。並べ直しはフックの y が届くバケツだけ、
+    次の find_overlap で前回の並びからの挿入ソートで行う。
+    """
+
+    def __init__(self, fish_iter=()):
+        self._fish_list = []
+        self._count_map = {size: 0 for size in FishSize}
+        self._bucket_map = {}
+        self._seq_map = {}
+        self._next_seq = 0
+        self._moved_num = 0  # mark_moved の呼ばれた回数
+        self._is_y_dirty = False
+        for fish in fish_iter:
+            self.append(fish)
+
+    def __len__(self):
+        return len(self._fish_list)
+
+    def __iter__(self):
+        return iter(self._fish_list)
+
+    def __getitem__(self, index):
+        return self._fish_list[index]
+
+    def __contains__(self, fish):
+        return fish in self._seq_map
+
+    def append(self, fish):
+        self._fish_list.append(fish)
+        self._seq_map[fish] = self._next_seq
+        bucket = self._bucket_map.get(fish.fish_size)
+        if bucket is None:
+            bucket = _Bucket(self._moved_num)
+            self._bucket_map[fish.fish_size] = bucket
+        bucket.add(self._next_seq, fish, self._moved_num)
+        self._next_seq += 1
+        self._count_map[fish.fish_size] += 1
+        self._is_y_dirty = True
+
+    def retain(self, predicate):
+        """predicate が True の魚だけを追加順のまま残す。"""
+        kept_list = [fish for fish in self._fish_list if predicate(fish)]
+        if len(kept_list) == len(self._fish_list):
+            return
+        kept_set = set(kept_list)
+        removed_map = {}
+        for fish in self._fish_list:
+            if fish not in kept_set:
+                del self._seq_map[fish]
+                self._count_map[fish.fish_size] -= 1
+                removed_map.setdefault(fish.fish_size, set()).add(fish)
+        self._fish_list = kept_list
+        for fish_size, removed_set in removed_map.items():
+            bucket = self._bucket_map[fish_size]
+            bucket.remove(removed_set)
+            if len(bucket.entry_list) == 0:
+                del self._bucket_map[fish_size]
+        self._is_y_dirty = True
+
+    def update(self):
+        """全魚を 1 フレーム進める（魚ごとに Fish.update を呼ぶ）。"""
+        for fish in self._fish_list:
+            fish.update()
+        self.mark_moved()
+
+    def update_frames(self, frame_num):
+        """全魚を frame_num フレーム進める（ヘッドレス実行用）。"""
+        for fish in self._fish_list:
+            fish.update_frames(frame_num)
+        self.mark_moved()
+
+    def count_by_size(self) -> dict:
+        """FishSize ごとの数（追加・除去のたびに更新済みの値の写し）。"""
+        return dict(self._count_map)
+
+    def mark_moved(self, is_y_changed=False):
+        """魚が動いたことを知らせる。y も変わった（頭位置の指定など）ときは is_y_changed を渡す。"""
+        self._moved_num += 1
+        if is_y_changed:
+            self._is_y_dirty = True
+
+    def find_overlap(self, hook_x, hook_y):
+        """ヒット前で、頭がフックと重なる魚を追加順に返す（Fish.overlaps と同じ判定）。"""
+        if self._is_y_dirty:
+            for bucket in self._bucket_map.values():
+                bucket.update_y_range()
+            self._is_y_dirty = False
+        ret = []
+        for bucket in self._bucket_map.values():
+            half = bucket.entry_list[0][2].TILE_SIZE / 2
+            if hook_y < bucket.y_min - half or hook_y > bucket.y_max + half:
+                continue
+            if bucket.moved_num != self._moved_num:
+                bucket.sort_by_x(self._moved_num)
+            start = bisect_left(bucket.x_list, hook_x - half)
+            end = bisect_right(bucket.x_list, hook_x + half)
+            ret.extend(
+                (seq, fish)
+                for _, seq, fish in bucket.entry_list[start:end]
+                if not fish.is_hit and fish.overlaps(hook_x, hook_y)
+            )
+        ret.sort(key=lambda item: item[0])
+        return [fish for _, fish in ret]
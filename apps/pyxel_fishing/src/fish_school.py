@@ -0,0 +1,268 @@
+import heapq
+import math
+from array import array
+from itertools import count
+from operator import add, attrgetter
+
+from fish import Fish, FishRarity, FishSize
+
+
+class _Column:
+    """SchoolFish の属性。FishSchool に入っている間は、その列の自分の行を読み書きする。"""
+
+    def __init__(self, typecode, to_value=None, to_item=None):
+        self.typecode = typecode
+        self.to_value = to_value
+        self.to_item = to_item
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def get_item(self, value):
+        return value if self.to_item is None else self.to_item(value)
+
+    def __get__(self, fish, owner=None):
+        if fish is None:
+            return self
+        school = fish.school
+        if school is None:
+            return fish.__dict__[self.name]
+        item = school.column_map[self.name][fish.slot]
+        return item if self.to_value is None else self.to_value(item)
+
+    def __set__(self, fish, value):
+        school = fish.school
+        if school is None:
+            fish.__dict__[self.name] = value
+            return
+        school.column_map[self.name][fish.slot] = self.get_item(value)
+        school.touch(fish, self.name)
+
+
+class SchoolFish(Fish):
+    """FishSchool に入れる魚。
+
+    群れに入っている間は状態を群れの列に置き、Fish のメソッドはその列を読み書きする。
+    群れから取り除かれると、そのときの状態を自身の属性に持ち直す。
+    """
+
+    _x = _Column("d")
+    _y = _Column("d")
+    _vx = _Column("d")
+    _fish_size = _Column("b", FishSize, attrgetter("value"))
+    _fish_rarity = _Column("b", FishRarity, attrgetter("value"))
+    _is_hit = _Column("b", bool, int)
+    _is_caught = _Column("b", bool, int)
+    COLUMN_LIST = [_x, _y, _vx, _fish_size, _fish_rarity, _is_hit, _is_caught]
+
+    def __init__(self, y, vx, fish_size, x_min, x_max):
+        self.school = None
+        self.slot = -1
+        super().__init__(y, vx, fish_size, x_min, x_max)
+
+    def attach(self, school, slot):
+        self.school = school
+        self.slot = slot
+
+    def detach(self):
+        if self.school is not None:
+            state = {
+                column.name: getattr(self, column.name) for column in self.COLUMN_LIST
+            }
+            self.school = None
+            self.slot = -1
+            self.__dict__.update(state)
+
+
+class FishSchool:
+    """大量の魚の状態を項目ごとの列（array）で持つ群れ。FishRegistry と同じく GameCore.fish_list として使う。
+
+    x, y, vx, サイズ, レア度, ヒット・釣り上げフラグを列で持ち、全魚の移動は x と vx の列の足し算 1 回で進める。
+    壁での折り返しは、壁までのフレーム数から見積もった時刻が来た魚だけを 1 匹ずつ Fish.update と同じ式で調べる。
+    ヒット前の魚は壁で折り返して画面の外に出ないので、除去（retain_hit）はヒット・釣り上げ済みの魚だけを調べる。
+    当たり判定は頭の y ごとに分けた一覧から、フックの y が届く行だけを調べる。
+    SchoolFish の属性を書き換えると群れに知らされるので、魚を直接動かしても Fish と同じ結果になる。
+    """
+
+    def __init__(self, fish_iter=()):
+        self.column_map = {
+            column.name: array(column.typecode) for column in SchoolFish.COLUMN_LIST
+        }
+        self._fish_list = []  # 行ごとの SchoolFish（追加順）
+        self._count_map = {size: 0 for size in FishSize}
+        self._frame = 0  # update の呼ばれた回数
+        self._wall_heap = []  # [壁を調べ始めるフレーム, 追加順, 魚]
+        self._push_seq = count()
+        self._near_set = set()  # 壁の手前まで来たので毎フレーム折り返しを調べる魚
+        self._hit_set = set()  # ヒット・釣り上げ済みで、画面の外に出うる魚
+        # 頭の y → その行の魚の一覧（None なら次の当たり判定で作り直す）
+        self._row_map = None
+        for fish in fish_iter:
+            self.append(fish)
+
+    def __len__(self):
+        return len(self._fish_list)
+
+    def __iter__(self):
+        return iter(self._fish_list)
+
+    def __getitem__(self, index):
+        return self._fish_list[index]
+
+    def __contains__(self, fish):
+        return getattr(fish, "school", None) is self
+
+    def append(self, fish):
+        """SchoolFish を末尾に加える。"""
+        for column in SchoolFish.COLUMN_LIST:
+            self.column_map[column.name].append(
+                column.get_item(getattr(fish, column.name))
+            )
+        fish.attach(self, len(self._fish_list))
+        self._fish_list.append(fish)
+        self._count_map[fish.fish_size] += 1
+        self._schedule(fish)
+        if self._row_map is not None:
+            self._row_map.setdefault(fish.get_head_pos()[1], []).append(fish)
+
+    def retain(self, predicate):
+        """predicate が True の魚だけを追加順のまま残す。"""
+        self._remove({fish for fish in self._fish_list if not predicate(fish)})
+
+    def retain_hit(self, predicate):
+        """ヒット・釣り上げ済みの魚のうち predicate が False のものを取り除く。
+
+        ヒット前の魚は壁の間で折り返すので画面の外には出ず、調べない。
+        """
+        self._remove({fish for fish in self._hit_set if not predicate(fish)})
+
+    def _remove(self, removed_set):
+        if len(removed_set) == 0:
+            return
+        for fish in removed_set:
+            self._count_map[fish.fish_size] -= 1
+            self._near_set.discard(fish)
+            self._hit_set.discard(fish)
+            fish.detach()
+        self._fish_list = [fish for fish in self._fish_list if fish.school is self]
+        for name, column in self.column_map.items():
+            self.column_map[name] = array(
+                column.typecode, [column[fish.slot] for fish in self._fish_list]
+            )
+        for slot, fish in enumerate(self._fish_list):
+            fish.slot = slot
+        self._row_map = None
+
+    def count_by_size(self) -> dict:
+        """FishSize ごとの数（追加・除去のたびに更新済みの値の写し）。"""
+        return dict(self._count_map)
+
+    def mark_moved(self, is_y_changed=False):
+        """FishRegistry と同じ呼び出しに応える。位置は毎回列から読むので、並べ直すものはない。"""
+
+    def touch(self, fish, name):
+        """SchoolFish の属性が書き換えられたときに呼ばれる。"""
+        if name == "_y":
+            # ヒットした魚は当たり判定で見ないので、頭の y の一覧は作り直さなくてよい
+            if fish not in self._hit_set:
+                self._row_map = None
+        else:
+            self._schedule(fish)
+
+    def _schedule(self, fish):
+        """魚が次に壁を調べるべきフレームを決め直す。"""
+        slot = fish.slot
+        is_hit = self.column_map["_is_hit"][slot]
+        if is_hit or self.column_map["_is_caught"][slot]:
+            self._hit_set.add(fish)
+        else:
+            self._hit_set.discard(fish)
+        if is_hit:
+            # 逃げ中の魚は壁で折り返さない
+            self._near_set.discard(fish)
+            return
+        frames = self._get_wall_frames(
+            fish, self.column_map["_x"][slot], self.column_map["_vx"][slot]
+        )
+        if frames <= 0:
+            self._near_set.add(fish)
+            return
+        self._near_set.discard(fish)
+        if frames < math.inf:
+            heapq.heappush(
+                self._wall_heap,
+                [self._frame + frames + 1, next(self._push_seq), fish],
+            )
+
+    @staticmethod
+    def _get_wall_frames(fish, x, vx):
+        """折り返さないことが確かな update の回数（浮動小数点の誤差の分 1 回少なく見積もる）。"""
+        x_min, x_max = fish._x_min, fish._x_max  # pylint: disable=W0212
+        if x <= x_min or x + fish.TILE_SIZE > x_max:
+            # 頭の位置を指定されて壁の外にいる魚は、向きによらず次の update で押し戻される
+            return 0
+        if vx > 0:
+            return int((x_max - fish.TILE_SIZE - x) / vx) - 1
+        if vx < 0:
+            return int((x - x_min) / -vx) - 1
+        return math.inf
+
+    def update(self):
+        """全魚を 1 フレーム進める（魚ごとに Fish.update を呼ぶのと同じ結果）。"""
+        column_map = self.column_map
+        x_list = array("d", map(add, column_map["_x"], column_map["_vx"]))
+        column_map["_x"] = x_list
+        self._frame += 1
+        heap = self._wall_heap
+        hit_list = column_map["_is_hit"]
+        while len(heap) > 0 and heap[0][0] <= self._frame:
+            fish = heapq.heappop(heap)[2]
+            # 予定を入れた後にヒットした魚や、取り除かれた魚の古い予定は読み捨てる
+            if fish.school is self and not hit_list[fish.slot]:
+                self._near_set.add(fish)
+        if len(self._near_set) == 0:
+            return
+        vx_list = column_map["_vx"]
+        tile_size = Fish.TILE_SIZE
+        for fish in list(self._near_set):
+            # Fish.update の折り返しと同じ式
+            slot = fish.slot
+            x_min, x_max = fish._x_min, fish._x_max  # pylint: disable=W0212
+            x, vx = x_list[slot], vx_list[slot]
+            if x + tile_size > x_max:
+                x = x_max - tile_size
+                vx = -abs(vx)
+            if x <= x_min:
+                x = x_min
+                vx = abs(vx)
+            x_list[slot], vx_list[slot] = x, vx
+            self._schedule(fish)
+
+    def update_frames(self, frame_num):
+        """全魚を frame_num フレーム進める（ヘッドレス実行用）。"""
+        for _ in range(frame_num):
+            self.update()
+
+    def find_overlap(self, hook_x, hook_y):
+        """ヒット前で、頭がフックと重なる魚を追加順に返す（Fish.overlaps と同じ判定）。"""
+        if self._row_map is None:
+            self._row_map = {}
+            for fish in self._fish_list:
+                self._row_map.setdefault(fish.get_head_pos()[1], []).append(fish)
+        half = Fish.TILE_SIZE / 2
+        head_offset_x = Fish._HEAD_OFFSET_X  # pylint: disable=W0212
+        x_list = self.column_map["_x"]
+        vx_list = self.column_map["_vx"]
+        hit_list = self.column_map["_is_hit"]
+        ret = []
+        for head_y in range(math.ceil(hook_y - half), math.floor(hook_y + half) + 1):
+            for fish in self._row_map.get(head_y, ()):
+                slot = fish.slot
+                if hit_list[slot]:
+                    continue
+                head_x = int(x_list[slot]) + (head_offset_x if vx_list[slot] > 0 else 0)
+                if abs(hook_x - head_x) <= half:
+                    ret.append(fish)
+        ret.sort(key=attrgetter("slot"))
+        return ret
@@ -19,6 +19,76 @@ class BaitType(str, Enum):
     LURE = "lure"
 
 
+class TrajectoryTable:
+    """充電フレーム数（MIN_CHARGE_FRAMES〜MAX_CHARGE_FRAMES）ごとの投擲軌道の前計算表。
+
+    投擲の結果は充電フレーム数だけで決まるため、Hook の設定（投擲起点・水面・投擲パラメータ）
+    ごとに一度だけ計算して共有する。軌道は投擲開始後の毎フレームの位置 (x, y) の列で、
+    最後の要素が着水点になる。
+    """
+
+    _cache = {}
+
+    def __init__(self, hook_cls, x, y, water_y):
+        self._min_charge_frames = hook_cls.MIN_CHARGE_FRAMES
+        self._max_charge_frames = hook_cls.MAX_CHARGE_FRAMES
+        self._path_list = [
+            self._build_path(
+                x, y, *hook_cls.get_throw_velocity(charging_frames), water_y, hook_cls
+            )
+            for charging_frames in range(
+                self._min_charge_frames, self._max_charge_frames + 1
+            )
+        ]
+
+    @staticmethod
+    def _build_path(x, y, vx, vy, water_y, hook_cls):
+        # Hook._update_throwing と同じ順序で積分し、毎フレームの位置を一致させる
+        path = []
+        while True:
+            x += vx
+            y += vy
+            vy += hook_cls.GRAVITY
+            if y >= water_y:
+                path.append((x, water_y))
+                return path
+            path.append((x, y))
+
+    @classmethod
+    def get(cls, hook_cls, x, y, water_y):
+        """設定ごとに共有される表を返す（未計算なら計算する）。"""
+        key = (
+            hook_cls,
+            x,
+            y,
+            water_y,
+            hook_cls.GRAVITY,
+            hook_cls.MIN_CHARGE_FRAMES,
+            hook_cls.MAX_CHARGE_FRAMES,
+            hook_cls.MIN_VX,
+            hook_cls.MAX_VX,
+            hook_cls.MIN_VY,
+            hook_cls.MAX_VY,
+        )
+        table = cls._cache.get(key)
+        if table is None:
+            table = cls(hook_cls, x, y, water_y)
+            cls._cache[key] = table
+        return table
+
+    def get_path(self, charging_frames):
+        """充電フレーム数に対応する軌道（範囲外は MIN/MAX に丸める）。"""
+        charging_frames = max(
+            self._min_charge_frames, min(self._max_charge_frames, charging_frames)
+        )
+        return self._path_list[charging_frames - self._min_charge_frames]
+
+    def get_landing(self, charging_frames):
+        """着水点 (x, y) と着水までのフレーム数を返す。"""
+        path = self.get_path(charging_frames)
+        return path[-1], len(path)
+
+
 class Hook:
     # --- 投擲パラメータ ---
     GRAVITY = 0.5  # 重力加速度（毎フレーム vy に加算）
@@ -75,6 +145,9 @@ class Hook:
         self._surface_timer = 0
         self._charging_frames = 0
         self._is_charging = False
+        # 投擲起点から投げたときの前計算軌道（throw_charged で設定）
+        self._throw_path = None
+        self._throw_frame = 0  # 投擲開始からの経過フレーム数
         self._has_fish = False
         self._reel_with_fish_frames = 0
         self._reel_speed_with_fish = 0.0  # hook_fish() で魚サイズに応じた値に設定される
@@ -101,6 +174,14 @@ class Hook:
     def y(self) -> int:
         return int(self._y)
 
+    @property
+    def is_line_broken(self) -> bool:
+        """魚を掛けたまま巻き続けて糸切れフレーム数に達したか。"""
+        return (
+            self._has_fish
+            and self._reel_with_fish_frames >= self._reel_line_break_frames
+        )
+
     @property
     def charge_ratio(self) -> float:
         """充電進捗の割合（0.0〜1.0）。MIN_CHARGE_FRAMES 未満は 0.0 を返す。
@@ -112,6 +193,20 @@ class Hook:
             return 0.0
         return min(1.0, self._charging_frames / self.MAX_CHARGE_FRAMES)
 
+    @property
+    def trajectory_table(self) -> TrajectoryTable:
+        return TrajectoryTable.get(
+            type(self), self._throw_x, self._throw_y, self._water_y
+        )
+
+    @property
+    def predicted_landing_x(self):
+        """現在の充電で投げたときの着水点 X。投擲できない充電量（MIN_CHARGE_FRAMES 未満）は None。"""
+        if self._charging_frames < self.MIN_CHARGE_FRAMES:
+            return None
+        (x, _), _ = self.trajectory_table.get_landing(self._charging_frames)
+        return int(x)
+
     def start_charge(self):
         self._is_charging = True
 
@@ -119,19 +214,23 @@ class Hook:
         self._is_charging = False
         self._charging_frames = 0
 
-    def _calculate_velocity(self):
+    @classmethod
+    def get_throw_velocity(cls, charging_frames):
         ratio = max(
             0.0,
             min(
                 1.0,
-                (self._charging_frames - self.MIN_CHARGE_FRAMES)
-                / (self.MAX_CHARGE_FRAMES - self.MIN_CHARGE_FRAMES),
+                (charging_frames - cls.MIN_CHARGE_FRAMES)
+                / (cls.MAX_CHARGE_FRAMES - cls.MIN_CHARGE_FRAMES),
             ),
         )
-        vx = self.MIN_VX + (self.MAX_VX - self.MIN_VX) * ratio
-        vy = self.MIN_VY + (self.MAX_VY - self.MIN_VY) * ratio
+        vx = cls.MIN_VX + (cls.MAX_VX - cls.MIN_VX) * ratio
+        vy = cls.MIN_VY + (cls.MAX_VY - cls.MIN_VY) * ratio
         return vx, vy
 
+    def _calculate_velocity(self):
+        return self.get_throw_velocity(self._charging_frames)
+
     def throw_charged(self):
         if self._charging_frames < self.MIN_CHARGE_FRAMES:
             return
@@ -139,6 +238,32 @@ class Hook:
         self._vx = vx
         self._vy = vy
         self._state = HookState.THROWING
+        self._throw_frame = 0
+        if (self._x, self._y) == (self._throw_x, self._throw_y):
+            self._throw_path = self.trajectory_table.get_path(self._charging_frames)
+        else:
+            self._throw_path = None
+
+    def skip_throw(self) -> int:
+        """投擲中の残りを一度に進めて着水させ、進めたフレーム数を返す（ヘッドレス実行用）。
+
+        投擲起点から投げた場合は前計算軌道の着水点へ O(1) で移動する。
+        それ以外は通常の投擲処理を着水まで繰り返す。
+        """
+        if self._state != HookState.THROWING:
+            return 0
+        if self._throw_path is None:
+            start_frame = self._throw_frame
+            while self._state == HookState.THROWING:
+                self._update_throwing()
+            return self._throw_frame - start_frame
+        skipped = len(self._throw_path) - self._throw_frame
+        self._x, self._y = self._throw_path[-1]
+        self._throw_frame = len(self._throw_path)
+        self._state = HookState.SURFACE
+        self._vx = 0
+        self._vy = 0
+        return skipped
 
     def start_reeling(self):
         self._state = HookState.REELING
@@ -180,6 +305,7 @@ class Hook:
             self._update_sinking()
 
     def _update_throwing(self):
+        self._throw_frame += 1
         self._x += self._vx
         self._y += self._vy
         self._vy += self.GRAVITY
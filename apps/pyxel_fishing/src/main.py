@@ -6,6 +6,8 @@ import random
 from abc import ABC, abstractmethod
 
 from fish import Fish, FishRarity, FishSize
+from fish_registry import FishRegistry
+from fish_school import FishSchool, SchoolFish
 from hook import BaitType, Hook, HookState
 
 
@@ -34,35 +36,53 @@ class IView(ABC):
     def get_frame(self) -> int:
         pass
 
+    @abstractmethod
+    def create_layer(self, w, h) -> "IView":
+        """w×h のオフスクリーンレイヤーを作り、そこへ描画する View を返す。"""
+
+    @abstractmethod
+    def draw_layer(self, x, y, layer):
+        """create_layer で作ったレイヤー全体を (x, y) に転送する。"""
+
     @classmethod
     def create(cls):
         return cls()
 
 
 class PyxelView(IView):
-    def __init__(self):
+    def __init__(self, image=None):
         import pyxel  # pylint: disable=W0621, C0415
 
         self.pyxel = pyxel
+        self.image = image
+        # 描画先（image 指定時はその画像、なければ画面）。pyxel と Image は同じ描画 API を持つ
+        self.canvas = pyxel if image is None else image
 
     def draw_text(self, x, y, text):
-        self.pyxel.text(x, y, text, 7)
+        self.canvas.text(x, y, text, 7)
 
     def draw_line(self, x1, y1, x2, y2, color):
-        self.pyxel.line(x1, y1, x2, y2, color)
+        self.canvas.line(x1, y1, x2, y2, color)
 
     def draw_blt(self, x, y, img, u, v, w, h, colkey):
-        self.pyxel.blt(x, y, img, u, v, w, h, colkey)
+        self.canvas.blt(x, y, img, u, v, w, h, colkey)
 
     def draw_rectb(self, x, y, w, h, color):
-        self.pyxel.rectb(x, y, w, h, color)
+        self.canvas.rectb(x, y, w, h, color)
 
     def draw_rect(self, x, y, w, h, color):
-        self.pyxel.rect(x, y, w, h, color)
+        self.canvas.rect(x, y, w, h, color)
 
     def get_frame(self) -> int:
         return self.pyxel.frame_count
 
+    def create_layer(self, w, h):
+        return PyxelView(self.pyxel.Image(w, h))
+
+    def draw_layer(self, x, y, layer):
+        # レイヤーは不透明な 1 枚絵として転送する（colkey なし）
+        self.canvas.blt(x, y, layer.image, 0, 0, layer.image.width, layer.image.height)
+
 
 class IFishView(ABC):
     @abstractmethod
@@ -261,6 +281,32 @@ class GameOverPopup(BasePopup):
         view.draw_text(restart_x, self.RESTART_Y, self.RESTART_TEXT)
 
 
+class BackgroundCompositor:
+    """動かない背景をオフスクリーンレイヤーに一度だけ描き、毎フレーム 1 回の転送で描画する。
+
+    render(layer, w, h, theme) でレイヤーへの描画を行う。
+    画面サイズ（w, h）かテーマが変わったときだけレイヤーを作り直して描き直す。
+    """
+
+    def __init__(self, view, render):
+        self.view = view
+        self._render = render
+        self._layer = None
+        self._key = None
+
+    def invalidate(self):
+        """次の draw でレイヤーを描き直させる。"""
+        self._key = None
+
+    def draw(self, w, h, theme):
+        key = (w, h, theme)
+        if key != self._key:
+            self._layer = self.view.create_layer(w, h)
+            self._render(self._layer, w, h, theme)
+            self._key = key
+        self.view.draw_layer(0, 0, self._layer)
+
+
 class GameCore:
     SCREEN_WIDTH = 240
     SCREEN_HEIGHT = 320
@@ -326,6 +372,7 @@ class GameCore:
     MAX_GAUGE_COLOR = 2  # ゲージ強調色（紫: MAX 到達時）
 
     GAUGE_BG_COLOR = 1  # ゲージ背景色（暗い青）
+    LANDING_MARKER_H = 4  # 着水予測マーカーの高さ（水面の直上に縦線で表示）
 
     # 魚の移動・出現範囲
     # 【深度ゾーン設計】
@@ -360,11 +407,13 @@ class GameCore:
         FishSize.MEDIUM_L: 1,
         FishSize.LARGE: 1,
     }
+    FISH_CLS = Fish
 
     def __init__(self):
-        self.view = PyxelView.create()
-        self.input = PyxelInput.create()
-        self.fish_view = PyxelFishView.create()
+        self.view = self._create_view()
+        self.input = self._create_input()
+        self.fish_view = self._create_fish_view()
+        self.background = BackgroundCompositor(self.view, self._draw_background)
         self.hook = self._create_hook()
         self.fish_list = []
         self._spawn_timer = 0
@@ -383,6 +432,36 @@ class GameCore:
         # 疲労値 0 で釣り上げた場合、釣り上げポップアップ解除後にゲームオーバーへ遷移するためのフラグ
         self._pending_game_over = False
 
+    def _create_view(self):
+        return PyxelView.create()
+
+    def _create_input(self):
+        return PyxelInput.create()
+
+    def _create_fish_view(self):
+        return PyxelFishView.create()
+
+    @property
+    def score(self) -> int:
+        return self._score
+
+    @property
+    def fatigue(self) -> int:
+        return self._fatigue
+
+    @property
+    def following_fish(self):
+        """ヒットして追従中の魚（None = 追従なし）。"""
+        return self._following_fish
+
+    @property
+    def is_popup_visible(self) -> bool:
+        return self._popup is not None
+
+    @property
+    def is_game_over(self) -> bool:
+        return self._is_game_over
+
     def _create_hook(self, bait_type=BaitType.FLOAT_BAIT):
         hook = Hook(self.LINE_ORIGIN_X, self.LINE_ORIGIN_Y, self.WATER_Y)
         hook.set_bait_type(bait_type)
@@ -392,14 +471,22 @@ class GameCore:
         y_min, y_max = self.FISH_Y_RANGE_BY_SIZE[fish_size]
         y = random.randint(y_min, y_max)
         vx = self.FISH_SPEED * random.choice([1, -1])
-        return Fish(y, vx, fish_size, x_min=0, x_max=self.SCREEN_WIDTH)
+        return self.FISH_CLS(y, vx, fish_size, x_min=0, x_max=self.SCREEN_WIDTH)
+
+    def _create_fish_list(self, fish_iter):
+        return FishRegistry(fish_iter)
+
+    @property
+    def fish_list(self) -> FishRegistry:
+        return self._fish_registry
+
+    @fish_list.setter
+    def fish_list(self, fish_iter):
+        self._fish_registry = self._create_fish_list(fish_iter)
 
     def _count_fish_by_size(self) -> dict:
-        """現在の fish_list に含まれる FishSize ごとの数を返す。"""
-        counts = {size: 0 for size in FishSize}
-        for fish in self.fish_list:
-            counts[fish.fish_size] += 1
-        return counts
+        """現在の fish_list に含まれる FishSize ごとの数を返す（追加・除去時に数え済み）。"""
+        return self.fish_list.count_by_size()
 
     def _select_spawn_size(self):
         """上限未満の FishSize からランダムに1つ選ぶ。全サイズ上限なら None。"""
@@ -419,10 +506,41 @@ class GameCore:
         fish = self._create_fish(fish_size)
         self.fish_list.append(fish)
 
-    def _draw_horizontal_tiles(self, y, u, v, w, h, x_offset=0):
-        col_count = math.ceil((self.SCREEN_WIDTH - x_offset) / w)
+    def _draw_horizontal_tiles(self, view, screen_w, y, u, v, w, h, x_offset=0):
+        col_count = math.ceil((screen_w - x_offset) / w)
         for i in range(col_count):
-            self.view.draw_blt(x_offset + i * w, y, 0, u, v, w, h, 0)
+            view.draw_blt(x_offset + i * w, y, 0, u, v, w, h, 0)
+
+    def _get_background_theme(self):
+        """背景を構成するスプライトの組（変わったら背景レイヤーを描き直す）。"""
+        return (
+            self.BG_SPRITE,
+            self.MID_SPRITE,
+            self.FG_SPRITE,
+            self.WATER_SURFACE_SPRITE,
+            self.UNDERWATER_SPRITE,
+        )
+
+    def _draw_background(self, view, screen_w, screen_h, theme):
+        """水上の 3 レイヤーと水中領域を view に描く（BackgroundCompositor から呼ばれる）。"""
+        bg_sprite, mid_sprite, fg_sprite, surface_sprite, underwater_sprite = theme
+        # 水上レイヤー（奥→手前: 背景→中景→前景、x_offset で奥行き表現）
+        for sprite, x_offset in [
+            (bg_sprite, -32),
+            (mid_sprite, -16),
+            (fg_sprite, 0),
+        ]:
+            self._draw_horizontal_tiles(view, screen_w, 0, *sprite, x_offset=x_offset)
+        # 水中領域（水面スプライト1行 + 水中スプライト複数行）
+        self._draw_horizontal_tiles(view, screen_w, self.WATER_Y, *surface_sprite)
+        row_count = (screen_h - self.WATER_Y - self.TILE_SIZE) // self.TILE_SIZE
+        for row in range(row_count):
+            self._draw_horizontal_tiles(
+                view,
+                screen_w,
+                self.WATER_Y + self.TILE_SIZE * (row + 1),
+                *underwater_sprite,
+            )
 
     def _is_in_rect(self, mx, my, rx, ry, rw, rh) -> bool:
         return rx <= mx < rx + rw and ry <= my < ry + rh
@@ -498,7 +616,27 @@ class GameCore:
             self._handle_click()
             self._handle_hold()
             self._handle_power_charge()
-        self._update_reeling()
+        self._update_frames()
+
+    def _update_frames(self, frame_num=1, hook_vars=None):
+        """入力処理の後に続くフック・釣果・魚・スポーンタイマーの処理を frame_num フレーム分行う。
+
+        update は毎フレーム frame_num=1 で呼ぶ。HeadlessGameCore.skip_frames は、その間に
+        フックの状態が変わらず、魚がフックに重ならず、スポーンが最後のフレームにしか起きない範囲で
+        まとめて呼ぶ。hook_vars は写しで求めておいた frame_num フレーム後のフックの属性。
+        """
+        self._update_reeling(frame_num, hook_vars)
+        self._update_finished_hook()
+        self.fish_list.update_frames(frame_num)
+        self._update_hit_detection()
+        # フック追従を先に行い、追従後の位置で画面外判定を行う（処理順が重要）
+        self._update_hook_following()
+        self._remove_finished_fish()
+        self._spawn_timer += frame_num - 1
+        self._update_spawn_timer()
+
+    def _update_finished_hook(self):
+        """FINISHED になったフックを片付け、釣り上げた魚を得点に加える。"""
         if self.hook.state == HookState.FINISHED_SUCCESS:
             if self._following_fish is not None:
                 score = self._following_fish.get_score()
@@ -522,24 +660,17 @@ class GameCore:
             # IDLE 復帰直後に疲労値 0 ならゲームオーバーへ自動遷移する
             if self._fatigue == 0:
                 self._is_game_over = True
-        for fish in self.fish_list:
-            fish.update()
-        self._update_hit_detection()
-        # フック追従を先に行い、追従後の位置で画面外判定を行う（処理順が重要）
-        self._update_hook_following()
-        # 画面外または釣り上げ済みの魚を fish_list から除去
-        self.fish_list = [
-            f
-            for f in self.fish_list
-            if not self._is_fish_offscreen(f) and not f.is_caught
-        ]
-        self._update_spawn_timer()
 
-    def _update_reeling(self):
-        """リーリング処理を行う。魚ヒット中は疲労値を 1 減少させる。"""
-        self.hook.update()
+    def _update_reeling(self, frame_num=1, hook_vars=None):
+        """フックを frame_num フレーム進める。魚ヒット中のリーリングは 1 フレームごとに疲労値を 1 減少させる。"""
+        if hook_vars is None:
+            for _ in range(frame_num):
+                self.hook.update()
+        else:
+            # Hook の属性はすべて使い回しのない値なので、写しの属性をそのまま移せる
+            vars(self.hook).update(hook_vars)
         if self.hook.state == HookState.REELING and self._following_fish is not None:
-            self._update_fatigue(1)
+            self._update_fatigue(frame_num)
 
     def _update_fatigue(self, amount):
         """疲労値を減少させる（0 以下にはならない）。"""
@@ -559,22 +690,29 @@ class GameCore:
         """魚が画面外に出ているか判定する。"""
         return fish.draw_x + fish.TILE_SIZE < 0 or fish.draw_x > self.SCREEN_WIDTH
 
+    def _is_fish_remaining(self, fish) -> bool:
+        return not self._is_fish_offscreen(fish) and not fish.is_caught
+
+    def _remove_finished_fish(self):
+        """画面外または釣り上げ済みの魚を fish_list から除去する。"""
+        self.fish_list.retain(self._is_fish_remaining)
+
     def _update_hit_detection(self):
         """ヒット判定を処理する（オーバーラップ検出 → try_hit() → hook 通知）。
 
-        is_hit チェック: すでにヒット済みの魚への二重判定を防ぐ（GameCore 側の責務）。
+        is_hit チェック: すでにヒット済みの魚への二重判定を防ぐ（FishRegistry.find_overlap が除外する）。
         _following_fish チェック: 追従中の魚がいる場合は追加ヒット処理をスキップ。
         hook.hook_fish(fish.fish_size): ヒット確定時に呼び出し、魚サイズに応じた巻き上げ速度・糸切れフレームを設定する。
         """
         if self._following_fish is not None:
             return
-        for fish in self.fish_list:
-            if not fish.is_hit and fish.overlaps(self.hook.x, self.hook.y):
-                if fish.try_hit():
-                    # overlap した特定の魚を記録（複数魚がいても正しい魚のみ追従するため）
-                    self._following_fish = fish
-                    self.hook.hook_fish(fish.fish_size)
-                    break  # 先着1匹のみ追従（以降の魚へのtry_hit()呼び出しを防ぐ）
+        # フックの y が届く深度帯・x 範囲の魚だけを、fish_list の順に調べる
+        for fish in self.fish_list.find_overlap(self.hook.x, self.hook.y):
+            if fish.try_hit():
+                # overlap した特定の魚を記録（複数魚がいても正しい魚のみ追従するため）
+                self._following_fish = fish
+                self.hook.hook_fish(fish.fish_size)
+                break  # 先着1匹のみ追従（以降の魚へのtry_hit()呼び出しを防ぐ）
 
     def _update_hook_following(self):
         """ヒットした魚とフックの追従方向を状態に応じて切り替える。
@@ -589,27 +727,16 @@ class GameCore:
             return
         if self.hook.state == HookState.REELING:
             self._following_fish.set_head_position(self.hook.x, self.hook.y)
+            self.fish_list.mark_moved(is_y_changed=True)
         else:
             head_x, head_y = self._following_fish.get_head_pos()
             self.hook.move_to(head_x, head_y)
 
     def draw(self):
-        # 水上レイヤー（奥→手前: 背景→中景→前景、x_offset で奥行き表現）
-        for sprite, x_offset in [
-            (self.BG_SPRITE, -32),
-            (self.MID_SPRITE, -16),
-            (self.FG_SPRITE, 0),
-        ]:
-            self._draw_horizontal_tiles(0, *sprite, x_offset=x_offset)
-        # 水中領域（水面スプライト1行 + 水中スプライト複数行）
-        self._draw_horizontal_tiles(self.WATER_Y, *self.WATER_SURFACE_SPRITE)
-        row_count = (
-            self.SCREEN_HEIGHT - self.WATER_Y - self.TILE_SIZE
-        ) // self.TILE_SIZE
-        for row in range(row_count):
-            self._draw_horizontal_tiles(
-                self.WATER_Y + self.TILE_SIZE * (row + 1), *self.UNDERWATER_SPRITE
-            )
+        # 背景（水上レイヤー・水中領域）は合成済みレイヤーを 1 回で転送する
+        self.background.draw(
+            self.SCREEN_WIDTH, self.SCREEN_HEIGHT, self._get_background_theme()
+        )
         # 釣り人スプライト（タイル座標 (1,0): u=TILE_SIZE（列1 × タイルサイズ）, v=0）
         self.view.draw_blt(
             self.THROW_X,
@@ -696,6 +823,15 @@ class GameCore:
         self.view.draw_rectb(
             self.GAUGE_X, gauge_full_top_y, self.GAUGE_W, self.GAUGE_MAX_H, gauge_color
         )
+        # 着水予測マーカー（前計算の軌道表を引くだけで、毎フレームの物理計算はしない）
+        landing_x = self.hook.predicted_landing_x
+        self.view.draw_line(
+            landing_x,
+            self.WATER_Y - self.LANDING_MARKER_H,
+            landing_x,
+            self.WATER_Y - 1,
+            gauge_color,
+        )
 
     def _draw_bait_button(self, bait_type):
         configs = {
@@ -714,6 +850,25 @@ class GameCore:
             )
 
 
+class TournamentGameCore(GameCore):
+    """サイズごとの魚の上限を引き上げ、1 画面に数百匹を泳がせるモード。
+
+    魚は FishSchool の列で持ち、移動・除去・当たり判定を群れ単位でまとめて行う。
+    乱数の引き方は GameCore と同じなので、同じ上限の GameCore と同じ展開になる。
+    """
+
+    MAX_FISH_BY_SIZE = {size: 100 for size in FishSize}
+    SPAWN_INTERVAL_MIN = 2
+    SPAWN_INTERVAL_MAX = 6
+    FISH_CLS = SchoolFish
+
+    def _create_fish_list(self, fish_iter):
+        return FishSchool(fish_iter)
+
+    def _remove_finished_fish(self):
+        self.fish_list.retain_hit(self._is_fish_remaining)
+
+
 class PyxelController:
     def __init__(self):
         import pyxel  # pylint: disable=W0621, C0415
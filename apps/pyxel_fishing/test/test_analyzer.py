@@ -0,0 +1,238 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/")))
+from analyzer import (  # pylint: disable=C0413
+    BotInput,
+    BotPolicy,
+    HeadlessGameCore,
+    HeadlessTournamentGameCore,
+    SessionSimulator,
+    aggregate,
+    analyze,
+)
+from fish import Fish  # pylint: disable=C0413
+from hook import BaitType, Hook, HookState  # pylint: disable=C0413
+from main import GameCore, TournamentGameCore  # pylint: disable=C0413
+
+
+class _WideHeadlessGameCore(HeadlessGameCore):
+    """TournamentGameCore と同じ上限・出現間隔で、魚を Fish と FishRegistry で持つ。"""
+
+    MAX_FISH_BY_SIZE = TournamentGameCore.MAX_FISH_BY_SIZE
+    SPAWN_INTERVAL_MIN = TournamentGameCore.SPAWN_INTERVAL_MIN
+    SPAWN_INTERVAL_MAX = TournamentGameCore.SPAWN_INTERVAL_MAX
+
+
+class TestBotPolicy(unittest.TestCase):
+    def test_switch_bait_then_charge_and_throw(self):
+        """えさが違えばボタンで切り替え、charge_frames 押してから離して投擲する"""
+        core = HeadlessGameCore()
+        policy = BotPolicy(charge_frames=20, bait_type=BaitType.LURE)
+        policy.act(core, core.input)
+        self.assertTrue(core.input.is_mouse_btn_pressed())
+        self.assertEqual(
+            (GameCore.LURE_BTN_X, GameCore.LURE_BTN_Y),
+            (core.input.mouse_x, core.input.mouse_y),
+        )
+        core.update()
+        self.assertEqual(BaitType.LURE, core.hook.bait_type)
+        held_num = 0
+        while core.hook.state == HookState.IDLE:
+            policy.act(core, core.input)
+            held_num += core.input.is_mouse_btn_held()
+            core.update()
+        self.assertEqual(20, held_num)
+        self.assertEqual(HookState.THROWING, core.hook.state)
+        self.assertAlmostEqual(
+            Hook.get_throw_velocity(20)[0], core.hook._vx  # pylint: disable=W0212
+        )
+
+    def test_reset(self):
+        """reset で状態の切り替わりと経過フレーム数を忘れ、続けて動かしても同じ結果になる"""
+        core = HeadlessGameCore()
+        policy = BotPolicy(charge_frames=20)
+        for _ in range(5):
+            policy.act(core, core.input)
+            core.update()
+        policy.skip_frames(3)
+        policy.reset()
+        self.assertEqual(
+            (0, None),
+            (policy._state_frames, policy._prev_state),  # pylint: disable=W0212
+        )
+        simulator = SessionSimulator(policy)
+        self.assertEqual(
+            simulator.run(4), SessionSimulator(BotPolicy(charge_frames=20)).run(4)
+        )
+
+    def test_bot_input(self):
+        bot_input = BotInput()
+        bot_input.set(pressed=True, pos=(3, 4))
+        self.assertEqual(
+            (True, False, 3, 4),
+            (
+                bot_input.is_mouse_btn_pressed(),
+                bot_input.is_mouse_btn_held(),
+                bot_input.mouse_x,
+                bot_input.mouse_y,
+            ),
+        )
+
+
+class TestHeadlessGameCore(unittest.TestCase):
+    def _throw(self, core, charge_frames):
+        core.input.set(held=True)
+        for _ in range(charge_frames):
+            core.update()
+        core.input.set()
+        core.update()
+        self.assertEqual(HookState.THROWING, core.hook.state)
+
+    def test_skip_frames_throwing(self):
+        """投擲中は着水まで一度に進み、毎フレーム update したのと同じ状態になる"""
+        cores = []
+        for _ in range(2):
+            random.seed(0)
+            core = HeadlessGameCore()
+            self._throw(core, 20)
+            cores.append(core)
+        fast, slow = cores
+        hook = fast.hook
+        skipped = fast.skip_frames(300)
+        self.assertIs(hook, fast.hook)
+        self.assertEqual(HookState.SURFACE, hook.state)
+        for _ in range(skipped + 1):
+            slow.update()
+        self.assertEqual(HookState.SURFACE, slow.hook.state)
+        fast.update()
+        self.assertEqual(
+            (slow.hook.x, slow.hook.y, slow._spawn_timer),  # pylint: disable=W0212
+            (hook.x, hook.y, fast._spawn_timer),  # pylint: disable=W0212
+        )
+        self.assertEqual(
+            [(f.draw_x, f.draw_y, f.vx) for f in slow.fish_list],
+            [(f.draw_x, f.draw_y, f.vx) for f in fast.fish_list],
+        )
+
+    def test_skip_frames_idle(self):
+        """何も起きないフレームは frame_num だけ進み、ゲームオーバー後は進まない"""
+        core = HeadlessGameCore()
+        self.assertEqual(30, core.skip_frames(30))
+        self.assertEqual(HookState.IDLE, core.hook.state)
+        core._is_game_over = True  # pylint: disable=W0212
+        self.assertEqual(0, core.skip_frames(30))
+
+
+class TestSessionSimulator(unittest.TestCase):
+    def test_run_until_game_over(self):
+        """ゲームオーバーまで動かし、同じシードなら同じ結果になる"""
+        for bait_type in BaitType:
+            with self.subTest(bait_type=bait_type):
+                simulator = SessionSimulator(BotPolicy(bait_type=bait_type))
+                result = simulator.run(3)
+                self.assertEqual(result, simulator.run(3))
+                self.assertLess(result["frames"], SessionSimulator.MAX_FRAMES)
+                self.assertGreater(result["throws"], 0)
+                hooked_num = sum(result["hooked"]["size"].values())
+                caught_num = sum(result["caught"]["size"].values())
+                self.assertEqual(
+                    hooked_num,
+                    caught_num + result["line_breaks"] + result["escapes"],
+                )
+                self.assertEqual(caught_num, sum(result["caught"]["rarity"].values()))
+                self.assertGreater(result["score"], 0)
+
+    def test_max_frames(self):
+        result = SessionSimulator(BotPolicy(), max_frames=100).run(0)
+        self.assertEqual(100, result["frames"])
+
+    def test_fast_forward_matches_step_by_step(self):
+        """まとめて進めても、毎フレーム update したのと同じ結果になる"""
+        for bait_type in BaitType:
+            for reel_delay, charge_frames in [(20, 10), (60, 35), (200, 60)]:
+                policy = BotPolicy(
+                    bait_type=bait_type,
+                    reel_delay=reel_delay,
+                    charge_frames=charge_frames,
+                )
+                with self.subTest(bait_type=bait_type, reel_delay=reel_delay):
+                    self.assertEqual(
+                        SessionSimulator(policy, is_fast=False).run(1),
+                        SessionSimulator(policy).run(1),
+                    )
+
+    def test_fast_forward_max_frames(self):
+        result = SessionSimulator(BotPolicy(), max_frames=1000).run(0)
+        self.assertEqual(1000, result["frames"])
+
+    def test_tournament_matches_registry(self):
+        """FishSchool で持つトーナメントモードも、同じ上限の FishRegistry と同じ結果になる"""
+        for bait_type in BaitType:
+            for is_fast in [False, True]:
+                policy = BotPolicy(bait_type=bait_type)
+                with self.subTest(bait_type=bait_type, is_fast=is_fast):
+                    self.assertEqual(
+                        SessionSimulator(
+                            policy, is_fast=is_fast, core_cls=_WideHeadlessGameCore
+                        ).run(2),
+                        SessionSimulator(
+                            policy,
+                            is_fast=is_fast,
+                            core_cls=HeadlessTournamentGameCore,
+                        ).run(2),
+                    )
+
+    def test_tournament_exceeds_default_limit(self):
+        """トーナメントモードは GameCore の上限を超える数の魚を泳がせる"""
+        random.seed(0)
+        core = HeadlessTournamentGameCore()
+        for _ in range(600):
+            core.update()
+        self.assertGreater(len(core.fish_list), sum(GameCore.MAX_FISH_BY_SIZE.values()))
+
+
+class TestAnalyze(unittest.TestCase):
+    def test_aggregate(self):
+        results = []
+        for score, caught in [(1, 1), (3, 0), (2, 1)]:
+            result = SessionSimulator(BotPolicy(), max_frames=1).run(0)
+            result.update(score=score, frames=10, throws=1, line_breaks=1 - caught)
+            result["hooked"]["size"]["SMALL"] = 1
+            result["hooked"]["rarity"]["LOW"] = 1
+            result["caught"]["size"]["SMALL"] = caught
+            result["caught"]["rarity"]["LOW"] = caught
+            results.append(result)
+        summary = aggregate(results)
+        self.assertEqual(3, summary["sessions"])
+        self.assertEqual(
+            {"mean": 2.0, "min": 1, "p10": 1, "p50": 2, "p90": 3, "max": 3},
+            summary["score"],
+        )
+        self.assertAlmostEqual(2 / 3, summary["catch_rate"]["size"]["SMALL"])
+        self.assertEqual(0.0, summary["catch_rate"]["size"]["LARGE"])
+        self.assertAlmostEqual(1 / 3, summary["line_break_rate"])
+        self.assertEqual(0.0, summary["escape_rate"])
+
+    def test_analyze_with_pool(self):
+        """プロセスプールで動かしても 1 プロセスと同じ集計になる"""
+        policy = BotPolicy(bait_type=BaitType.LURE)
+        self.assertEqual(
+            analyze(policy, 4, seed=10, processes=1),
+            analyze(policy, 4, seed=10, processes=2),
+        )
+
+    def test_params(self):
+        """定数を差し替えて動かし、終了後は元の値に戻す"""
+        summary = analyze(
+            BotPolicy(), 2, params={"Fish.HIT_PROBABILITY": 0.0}, processes=1
+        )
+        self.assertEqual(0, summary["score"]["max"])
+        self.assertEqual(0, sum(summary["hooked"]["size"].values()))
+        self.assertEqual(0.3, Fish.HIT_PROBABILITY)
+
+
+if __name__ == "__main__":
+    unittest.main()
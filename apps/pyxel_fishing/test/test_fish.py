@@ -108,6 +108,50 @@ class TestFishMovement(unittest.TestCase):
                 self.assertEqual(fish.vx, exp_vx)
                 self.assertEqual(fish.draw_y, 150)  # y は壁折り返しの有無によらず不変
 
+    def test_update_frames(self):
+        """update_frames(n) は update() を n 回呼んだのと同じ位置・向きになる"""
+        # (説明, fixed_x, vx, is_hit, frame_num)
+        cases = [
+            ("壁なし", 50.1, 0.5, False, 10),
+            ("左右の壁で折り返す", 3.3, -0.7, False, 700),
+            ("逃げ中は折り返さない", 5.0, -2.0, True, 20),
+            ("0 フレーム", 50.0, 1.0, False, 0),
+        ]
+        for desc, fixed_x, vx, is_hit, frame_num in cases:
+            with self.subTest(desc):
+                fish = self._make_fish(vx=vx, fixed_x=fixed_x)
+                expected = self._make_fish(vx=vx, fixed_x=fixed_x)
+                fish._is_hit = expected._is_hit = is_hit  # pylint: disable=W0212
+                fish.update_frames(frame_num)
+                for _ in range(frame_num):
+                    expected.update()
+                fish_x, expected_x = fish._x, expected._x  # pylint: disable=W0212
+                self.assertEqual((expected_x, expected.vx), (fish_x, fish.vx))
+
+    def test_find_overlap_frame(self):
+        """update() を続けて初めて overlaps() になるフレームを返し、魚は動かさない"""
+        fish = self._make_fish(vx=2.0, fixed_x=200.0)
+        head_y = 150 + Fish._HEAD_OFFSET_Y  # pylint: disable=W0212
+        # (説明, フック位置の列)
+        cases = [
+            ("右壁で折り返して戻ってくる", [(190, head_y)] * 40),
+            ("y が離れている", [(190, head_y + 5)] * 30),
+            ("最初のフレーム", [(209, head_y)] * 3),
+            ("フックが動く", [(100 + i, head_y - 4) for i in range(60)]),
+        ]
+        for desc, hook_pos_list in cases:
+            with self.subTest(desc):
+                expected = self._make_fish(vx=2.0, fixed_x=200.0)
+                expected_frame = len(hook_pos_list)
+                for i, (hook_x, hook_y) in enumerate(hook_pos_list):
+                    expected.update()
+                    if expected.overlaps(hook_x, hook_y):
+                        expected_frame = i
+                        break
+                self.assertEqual(expected_frame, fish.find_overlap_frame(hook_pos_list))
+                fish_x = fish._x  # pylint: disable=W0212
+                self.assertEqual((200.0, 2.0), (fish_x, fish.vx))
+
 
 class TestFishOverlaps(unittest.TestCase):
     """Fish.overlaps() の仕様テスト。魚頭位置 (_get_head_pos()) から TILE_SIZE/2=4px 以内で判定。
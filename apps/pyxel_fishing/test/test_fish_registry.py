@@ -0,0 +1,119 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/")))
+from fish import Fish, FishSize  # pylint: disable=C0413
+from fish_registry import FishRegistry  # pylint: disable=C0413
+
+SCREEN_WIDTH = 240
+
+
+def _make_fish(rand, fish_size=None):
+    return Fish(
+        rand.randint(100, 280),
+        rand.choice([0.5, -0.5]),
+        fish_size or rand.choice(list(FishSize)),
+        x_min=0,
+        x_max=SCREEN_WIDTH,
+    )
+
+
+def _find_overlap_by_scan(fish_list, hook_x, hook_y):
+    return [f for f in fish_list if not f.is_hit and f.overlaps(hook_x, hook_y)]
+
+
+class TestFishRegistry(unittest.TestCase):
+    def test_list_behavior(self):
+        """追加順を保ったリストとして振る舞い、サイズごとの数を保つ"""
+        random.seed(0)
+        rand = random.Random(0)
+        fish_list = [_make_fish(rand, size) for size in list(FishSize) * 2]
+        registry = FishRegistry(fish_list[:3])
+        for fish in fish_list[3:]:
+            registry.append(fish)
+        self.assertEqual(fish_list, list(registry))
+        self.assertEqual(len(fish_list), len(registry))
+        self.assertIs(fish_list[-1], registry[-1])
+        self.assertEqual({size: 2 for size in FishSize}, registry.count_by_size())
+        registry.retain(lambda f: f.fish_size != FishSize.SMALL)
+        self.assertNotIn(fish_list[0], registry)
+        self.assertIn(fish_list[1], registry)
+        self.assertEqual(
+            {**{size: 2 for size in FishSize}, FishSize.SMALL: 0},
+            registry.count_by_size(),
+        )
+        self.assertEqual(
+            [f for f in fish_list if f.fish_size != FishSize.SMALL], list(registry)
+        )
+
+    def test_find_overlap_matches_scan(self):
+        """移動・ヒット・除去・頭位置の指定を重ねても、全件走査と同じ魚を同じ順に返す"""
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                random.seed(seed)
+                rand = random.Random(seed)
+                registry = FishRegistry(_make_fish(rand) for _ in range(30))
+                for frame in range(120):
+                    for fish in registry:
+                        fish.update()
+                    registry.mark_moved()
+                    if frame % 10 == 0:
+                        registry.append(_make_fish(rand))
+                    if frame % 25 == 0:
+                        registry[0].set_head_position(
+                            rand.randint(0, SCREEN_WIDTH), rand.randint(96, 300)
+                        )
+                        registry.mark_moved(is_y_changed=True)
+                    for fish in registry:
+                        head_x, head_y = fish.get_head_pos()
+                        for hook_pos in [
+                            (
+                                head_x + rand.randint(-5, 5),
+                                head_y + rand.randint(-5, 5),
+                            ),
+                            (rand.randint(0, SCREEN_WIDTH), rand.randint(96, 300)),
+                        ]:
+                            self.assertEqual(
+                                _find_overlap_by_scan(registry, *hook_pos),
+                                registry.find_overlap(*hook_pos),
+                            )
+                    if frame % 30 == 0:
+                        registry[len(registry) // 2].try_hit()
+                    registry.retain(lambda f: -f.TILE_SIZE <= f.draw_x <= SCREEN_WIDTH)
+
+    def test_find_overlap_skips_other_bands(self):
+        """フックの y が届かない深度帯の魚は x の並べ直しもせずに飛ばす"""
+        random.seed(0)
+        shallow = Fish(104, 0.5, FishSize.SMALL, x_min=0, x_max=SCREEN_WIDTH)
+        deep = Fish(250, 0.5, FishSize.LARGE, x_min=0, x_max=SCREEN_WIDTH)
+        registry = FishRegistry([shallow, deep])
+        self.assertEqual([deep], registry.find_overlap(*deep.get_head_pos()))
+        registry.mark_moved()
+        registry.find_overlap(*deep.get_head_pos())
+        buckets = registry._bucket_map  # pylint: disable=W0212
+        self.assertEqual(0, buckets[FishSize.SMALL].moved_num)
+        self.assertEqual(1, buckets[FishSize.LARGE].moved_num)
+
+    def test_append_keeps_x_order(self):
+        """追加・除去では並べ直さず、バケツの x 順の位置に差し込む・抜く"""
+        random.seed(0)
+        fish_list = [
+            Fish(104, 0.5, FishSize.SMALL, x_min=0, x_max=SCREEN_WIDTH)
+            for _ in range(10)
+        ]
+        registry = FishRegistry(fish_list[:5])
+        for fish in fish_list[5:]:
+            registry.append(fish)
+        registry.retain(lambda f: f is not fish_list[3])
+        bucket = registry._bucket_map[FishSize.SMALL]  # pylint: disable=W0212
+        expected = sorted(
+            f.get_head_pos()[0] for f in fish_list if f is not fish_list[3]
+        )
+        self.assertEqual(expected, bucket.x_list)
+        self.assertEqual(0, bucket.moved_num)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/")))
+from fish import Fish, FishSize  # pylint: disable=C0413
+from fish_registry import FishRegistry  # pylint: disable=C0413
+from fish_school import FishSchool, SchoolFish  # pylint: disable=C0413
+
+SCREEN_WIDTH = 240
+
+
+def _make_fish_pair(rand, seed, fish_size=None):
+    """同じ乱数で作った Fish と SchoolFish の組を返す。"""
+    y = rand.randint(100, 280)
+    vx = rand.choice([0.5, -0.5, 0.7, -1.3])
+    fish_size = fish_size or rand.choice(list(FishSize))
+    pair = []
+    for fish_cls in [Fish, SchoolFish]:
+        random.seed(seed)
+        pair.append(fish_cls(y, vx, fish_size, x_min=0, x_max=SCREEN_WIDTH))
+    return pair
+
+
+def _get_state(fish_list):
+    return [
+        (f.draw_x, f.draw_y, f.vx, f.fish_size, f.fish_rarity, f.is_hit, f.is_caught)
+        for f in fish_list
+    ]
+
+
+def _find_overlap_by_scan(fish_list, hook_x, hook_y):
+    return [f for f in fish_list if not f.is_hit and f.overlaps(hook_x, hook_y)]
+
+
+class TestFishSchool(unittest.TestCase):
+    def test_list_behavior(self):
+        """追加順を保ったリストとして振る舞い、サイズごとの数を保つ"""
+        rand = random.Random(0)
+        fish_list = [
+            _make_fish_pair(rand, i, size)[1]
+            for i, size in enumerate(list(FishSize) * 2)
+        ]
+        school = FishSchool(fish_list[:3])
+        for fish in fish_list[3:]:
+            school.append(fish)
+        self.assertEqual(fish_list, list(school))
+        self.assertEqual(len(fish_list), len(school))
+        self.assertIs(fish_list[-1], school[-1])
+        self.assertEqual({size: 2 for size in FishSize}, school.count_by_size())
+        school.retain(lambda f: f.fish_size != FishSize.SMALL)
+        self.assertNotIn(fish_list[0], school)
+        self.assertIn(fish_list[1], school)
+        self.assertEqual(
+            {**{size: 2 for size in FishSize}, FishSize.SMALL: 0},
+            school.count_by_size(),
+        )
+        self.assertEqual(
+            [f for f in fish_list if f.fish_size != FishSize.SMALL], list(school)
+        )
+        self.assertEqual(list(range(len(school))), [f.slot for f in school])
+
+    def test_matches_fish_update(self):
+        """追加・移動・ヒット・頭位置の指定・釣り上げ・除去を重ねても、Fish を 1 匹ずつ動かしたのと同じ状態になる"""
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                rand = random.Random(seed)
+                pair_list = [_make_fish_pair(rand, i) for i in range(40)]
+                registry = FishRegistry(pair[0] for pair in pair_list)
+                school = FishSchool(pair[1] for pair in pair_list)
+
+                def is_remaining(fish):
+                    return -fish.TILE_SIZE <= fish.draw_x <= SCREEN_WIDTH and (
+                        not fish.is_caught
+                    )
+
+                for frame in range(600):
+                    registry.update()
+                    school.update()
+                    if frame % 7 == 0:
+                        fish, school_fish = _make_fish_pair(rand, 100 + frame)
+                        registry.append(fish)
+                        school.append(school_fish)
+                    if frame % 11 == 0:
+                        index = rand.randrange(len(school))
+                        for fish in [registry[index], school[index]]:
+                            random.seed(frame)
+                            fish.try_hit()
+                    if frame % 13 == 0:
+                        index = rand.randrange(len(school))
+                        pos = (rand.randint(0, SCREEN_WIDTH), rand.randint(96, 300))
+                        registry[index].set_head_position(*pos)
+                        registry.mark_moved(is_y_changed=True)
+                        school[index].set_head_position(*pos)
+                        school.mark_moved(is_y_changed=True)
+                    if frame % 17 == 0:
+                        index = rand.randrange(len(school))
+                        registry[index].set_caught()
+                        school[index].set_caught()
+                    registry.retain(is_remaining)
+                    school.retain_hit(is_remaining)
+                    self.assertEqual(_get_state(registry), _get_state(school))
+                    self.assertEqual(registry.count_by_size(), school.count_by_size())
+
+    def test_find_overlap_matches_scan(self):
+        """行ごとの一覧から探しても、全件走査と同じ魚を同じ順に返す"""
+        rand = random.Random(0)
+        school = FishSchool(_make_fish_pair(rand, i)[1] for i in range(30))
+        for frame in range(120):
+            school.update()
+            if frame % 25 == 0:
+                school[0].set_head_position(
+                    rand.randint(0, SCREEN_WIDTH), rand.randint(96, 300)
+                )
+            for fish in school:
+                head_x, head_y = fish.get_head_pos()
+                for hook_pos in [
+                    (head_x + rand.randint(-5, 5), head_y + rand.randint(-5, 5)),
+                    (rand.randint(0, SCREEN_WIDTH), rand.randint(96, 300)),
+                ]:
+                    self.assertEqual(
+                        _find_overlap_by_scan(school, *hook_pos),
+                        school.find_overlap(*hook_pos),
+                    )
+            if frame % 30 == 0:
+                random.seed(0)
+                while not school[len(school) // 2].try_hit():
+                    pass
+            school.retain_hit(lambda f: -f.TILE_SIZE <= f.draw_x <= SCREEN_WIDTH)
+
+    def test_detach_keeps_state(self):
+        """群れから取り除かれた魚は、そのときの状態を自身で持ち続ける"""
+        rand = random.Random(0)
+        fish, school_fish = _make_fish_pair(rand, 0)
+        school = FishSchool([school_fish])
+        for _ in range(50):
+            fish.update()
+            school.update()
+        school.retain(lambda f: False)
+        self.assertEqual(0, len(school))
+        self.assertIsNone(school_fish.school)
+        self.assertEqual(_get_state([fish]), _get_state([school_fish]))
+        fish.update()
+        school_fish.update()
+        self.assertEqual(_get_state([fish]), _get_state([school_fish]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,7 @@ import sys
 import unittest
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/")))
-from hook import Hook, HookState, BaitType  # pylint: disable=C0413
+from hook import Hook, HookState, BaitType, TrajectoryTable  # pylint: disable=C0413
 from fish import FishSize  # pylint: disable=C0413
 from main import GameCore  # pylint: disable=C0413
 
@@ -829,5 +829,105 @@ class TestLineBreakByFishSize(unittest.TestCase):
                 )
 
 
+class TestTrajectoryTable(unittest.TestCase):
+    def _make_hook(self):
+        return Hook(GameCore.LINE_ORIGIN_X, GameCore.LINE_ORIGIN_Y, GameCore.WATER_Y)
+
+    def _throw_step_by_step(self, charging_frames):
+        hook = self._make_hook()
+        hook._charging_frames = charging_frames  # pylint: disable=W0212
+        hook.throw_charged()
+        path = []
+        while hook.state == HookState.THROWING:
+            hook.update()
+            path.append((hook._x, hook._y))  # pylint: disable=W0212
+        return path
+
+    def test_path_matches_frame_by_frame_throw(self):
+        """全充電フレーム数で、前計算の軌道が毎フレームの投擲処理の位置と一致する"""
+        table = self._make_hook().trajectory_table
+        for charging_frames in range(
+            Hook.MIN_CHARGE_FRAMES, Hook.MAX_CHARGE_FRAMES + 1
+        ):
+            with self.subTest(charging_frames=charging_frames):
+                path = self._throw_step_by_step(charging_frames)
+                self.assertEqual(table.get_path(charging_frames), path)
+                self.assertEqual(
+                    (path[-1], len(path)), table.get_landing(charging_frames)
+                )
+
+    def test_charging_frames_are_clamped(self):
+        """範囲外の充電フレーム数は MIN/MAX の軌道に丸められる"""
+        table = self._make_hook().trajectory_table
+        self.assertIs(
+            table.get_path(Hook.MIN_CHARGE_FRAMES),
+            table.get_path(Hook.MIN_CHARGE_FRAMES - 1),
+        )
+        self.assertIs(
+            table.get_path(Hook.MAX_CHARGE_FRAMES),
+            table.get_path(Hook.MAX_CHARGE_FRAMES + 1),
+        )
+
+    def test_table_is_shared_per_configuration(self):
+        """同じ設定の Hook は表を共有し、起点が違えば別の表になる"""
+        table = self._make_hook().trajectory_table
+        self.assertIs(table, self._make_hook().trajectory_table)
+        other = Hook(
+            GameCore.LINE_ORIGIN_X - 8, GameCore.LINE_ORIGIN_Y, GameCore.WATER_Y
+        )
+        self.assertIsNot(table, other.trajectory_table)
+        self.assertIsInstance(table, TrajectoryTable)
+
+    def test_predicted_landing_x(self):
+        """充電中の着水予測 X は実際に投げた着水点と一致し、投擲できない充電量では None"""
+        cases = [
+            (0, None),
+            (Hook.MIN_CHARGE_FRAMES - 1, None),
+            (
+                Hook.MIN_CHARGE_FRAMES,
+                int(self._throw_step_by_step(Hook.MIN_CHARGE_FRAMES)[-1][0]),
+            ),
+            (
+                Hook.MAX_CHARGE_FRAMES,
+                int(self._throw_step_by_step(Hook.MAX_CHARGE_FRAMES)[-1][0]),
+            ),
+        ]
+        for charging_frames, expected in cases:
+            with self.subTest(charging_frames=charging_frames):
+                hook = self._make_hook()
+                hook._charging_frames = charging_frames  # pylint: disable=W0212
+                self.assertEqual(expected, hook.predicted_landing_x)
+
+    def test_skip_throw(self):
+        """skip_throw は残りの投擲を一度に進め、フレームごとに進めた場合と同じ状態になる"""
+        cases = [
+            ("投擲直後", 0, True),
+            ("途中まで進めた後", 3, True),
+            ("起点以外から投擲", 0, False),
+        ]
+        for desc, advance_frames, from_origin in cases:
+            with self.subTest(desc=desc):
+                hook = self._make_hook()
+                expected = self._make_hook()
+                for h in (hook, expected):
+                    if not from_origin:
+                        h._x -= 8  # pylint: disable=W0212
+                    h._charging_frames = Hook.MAX_CHARGE_FRAMES  # pylint: disable=W0212
+                    h.throw_charged()
+                    for _ in range(advance_frames):
+                        h.update()
+                expected_frames = 0
+                while expected.state == HookState.THROWING:
+                    expected.update()
+                    expected_frames += 1
+                self.assertEqual(expected_frames, hook.skip_throw())
+                self.assertEqual(HookState.SURFACE, hook.state)
+                self.assertEqual(
+                    (expected._x, expected._y),  # pylint: disable=W0212
+                    (hook._x, hook._y),  # pylint: disable=W0212
+                )
+                self.assertEqual(0, hook.skip_throw())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -21,6 +21,7 @@ from hook import Hook, HookState, BaitType  # pylint: disable=C0413
 class TestView(IView):
     def __init__(self):
         self.call_params = []
+        self.layer_list = []
 
     def draw_text(self, x, y, text):
         self.call_params.append(("draw_text", x, y, text))
@@ -40,6 +41,17 @@ class TestView(IView):
     def get_frame(self) -> int:
         return 0
 
+    def create_layer(self, w, h):
+        layer = TestView()
+        self.layer_list.append(layer)
+        self.call_params.append(("create_layer", w, h))
+        return layer
+
+    def draw_layer(self, x, y, layer):
+        # 転送したレイヤーの中身は layer_list 側の call_params で確認する
+        assert layer in self.layer_list
+        self.call_params.append(("draw_layer", x, y))
+
     def get_call_params(self):
         return self.call_params
 
@@ -127,20 +139,8 @@ class TestPyxelController(TestParent):
         self.assertEqual(call_args[0][1], GameCore.SCREEN_HEIGHT)
 
 
-def _build_full_expected_calls(
-    hook_pos=None,
-    bait_type=BaitType.FLOAT_BAIT,
-    charge_ratio=0.0,
-    score=0,
-    fatigue=GameCore.MAX_FATIGUE,
-):
-    """GameCore.draw() の完全な期待呼び出し列（描画順序込み）を構築する
-
-    hook_pos: (x, y) - hook が描画される位置。None の場合（idle）は draw_line なし
-    bait_type: 選択中えさ種類（強調枠の位置決定に使用）
-    charge_ratio: 充電進捗割合（0.0〜1.0）。0.0 の場合はゲージ描画なし。1.0 で強調表示
-    fatigue: 疲労値（デフォルト: MAX_FATIGUE）
-    """
+def _build_background_calls():
+    """背景レイヤーへの期待描画呼び出し列（水上 3 レイヤー → 水面 → 水中）を構築する"""
     tile_w, tile_h = 48, 96
     sprite_h = 8
     expected = []
@@ -177,6 +177,32 @@ def _build_full_expected_calls(
                     0,
                 )
             )
+    return expected
+
+
+def _build_full_expected_calls(
+    hook_pos=None,
+    bait_type=BaitType.FLOAT_BAIT,
+    charge_ratio=0.0,
+    score=0,
+    fatigue=GameCore.MAX_FATIGUE,
+    is_first_draw=True,
+    landing_x=None,
+):
+    """GameCore.draw() の完全な期待呼び出し列（描画順序込み）を構築する
+
+    hook_pos: (x, y) - hook が描画される位置。None の場合（idle）は draw_line なし
+    bait_type: 選択中えさ種類（強調枠の位置決定に使用）
+    charge_ratio: 充電進捗割合（0.0〜1.0）。0.0 の場合はゲージ描画なし。1.0 で強調表示
+    fatigue: 疲労値（デフォルト: MAX_FATIGUE）
+    is_first_draw: その GameCore での初回の draw か（初回のみ背景レイヤーを生成する）
+    landing_x: 着水予測マーカーの X（charge_ratio > 0.0 のとき指定する）
+    """
+    expected = []
+    # 背景: 初回の draw で合成レイヤーを作り、画面へは 1 回で転送する
+    if is_first_draw:
+        expected.append(("create_layer", GameCore.SCREEN_WIDTH, GameCore.SCREEN_HEIGHT))
+    expected.append(("draw_layer", 0, 0))
     # 投擲地点スプライト: タイル座標(1,0)、THROW_Y=WATER_Y-TILE_SIZE（水面直上）
     expected.append(
         (
@@ -269,6 +295,17 @@ def _build_full_expected_calls(
                 gauge_color,
             )
         )
+        # 着水予測マーカー（水面の直上に縦線）
+        expected.append(
+            (
+                "draw_line",
+                landing_x,
+                GameCore.WATER_Y - GameCore.LANDING_MARKER_H,
+                landing_x,
+                GameCore.WATER_Y - 1,
+                gauge_color,
+            )
+        )
     # 疲労ゲージ（外枠 → 内側の順）
     inner_w = int(fatigue / GameCore.MAX_FATIGUE * GameCore.FATIGUE_GAUGE_W)
     inner_x = GameCore.FATIGUE_GAUGE_X + GameCore.FATIGUE_GAUGE_W - inner_w
@@ -437,6 +474,9 @@ class TestGameCore(TestParent):
         core = GameCore()
         core.draw()
         self.assertEqual(_build_full_expected_calls(), self.test_view.get_call_params())
+        self.assertEqual(
+            _build_background_calls(), self.test_view.layer_list[0].get_call_params()
+        )
 
     def test_click_bait_button_switches_bait_type(self):
         """えさ種類ボタン領域クリックでえさ種類が切り替わる"""
@@ -587,6 +627,70 @@ class TestGameCore(TestParent):
                 self.assertEqual(expected, self.test_view.get_call_params())
 
 
+class TestBackgroundCompositor(TestParent):
+    """背景は合成済みレイヤーとして 1 回の転送で描画される"""
+
+    def test_layer_is_rendered_once(self):
+        """2 回目以降の draw ではレイヤーを作り直さず、転送だけを行う"""
+        core = GameCore()
+        for _ in range(3):
+            core.draw()
+        self.assertEqual(1, len(self.test_view.layer_list))
+        self.assertEqual(
+            [("draw_layer", 0, 0)] * 3,
+            [c for c in self.test_view.get_call_params() if c[0] == "draw_layer"],
+        )
+        self.assertEqual(
+            _build_background_calls(), self.test_view.layer_list[0].get_call_params()
+        )
+
+    def test_rerender_on_change(self):
+        """画面サイズ・テーマが変わったとき、invalidate したときだけ描き直す"""
+        cases = [
+            ("変化なし", lambda core: None, 1),
+            (
+                "テーマ変更",
+                lambda core: setattr(core, "UNDERWATER_SPRITE", (16, 112, 48, 8)),
+                2,
+            ),
+            ("画面サイズ変更", lambda core: setattr(core, "SCREEN_HEIGHT", 240), 2),
+            ("invalidate", lambda core: core.background.invalidate(), 2),
+        ]
+        for desc, change, expected in cases:
+            with self.subTest(desc=desc):
+                self.test_view.layer_list.clear()
+                core = GameCore()
+                core.draw()
+                change(core)
+                core.draw()
+                self.assertEqual(expected, len(self.test_view.layer_list))
+
+    def test_draw_call_count_benchmark(self):
+        """背景の描画呼び出し数: 毎フレーム直接描く場合と合成レイヤーを転送する場合の比較"""
+        frame_num = 60
+        core = GameCore()
+        direct_view = TestView()
+        for _ in range(frame_num):
+            core._draw_background(  # pylint: disable=W0212
+                direct_view,
+                GameCore.SCREEN_WIDTH,
+                GameCore.SCREEN_HEIGHT,
+                core._get_background_theme(),  # pylint: disable=W0212
+            )
+        for _ in range(frame_num):
+            core.background.draw(
+                GameCore.SCREEN_WIDTH,
+                GameCore.SCREEN_HEIGHT,
+                core._get_background_theme(),  # pylint: disable=W0212
+            )
+        per_frame = len(_build_background_calls())  # 水上 17 + 水面 5 + 水中 135
+        self.assertEqual(157, per_frame)
+        self.assertEqual(per_frame * frame_num, len(direct_view.get_call_params()))
+        # 合成は初回のレイヤー生成と描画だけで、以降は毎フレーム 1 回の転送
+        self.assertEqual(frame_num + 1, len(self.test_view.get_call_params()))
+        self.assertEqual(per_frame, len(self.test_view.layer_list[0].get_call_params()))
+
+
 class TestGameCoreHold(TestParent):
     def test_hold_transitions_reeling(self):
         """長押し中: SINKING/SURFACE → REELING、それ以外の状態は変化しない（代表: IDLE）"""
@@ -723,6 +827,16 @@ class TestGameCoreCharging(TestParent):
         self.assertEqual(core.hook.state, HookState.IDLE)
 
 
+def _throw_and_get_landing_x(charging_frames):
+    """投擲起点から実際に投げ、フレームごとに進めたときの着水点 X を返す"""
+    hook = Hook(GameCore.LINE_ORIGIN_X, GameCore.LINE_ORIGIN_Y, GameCore.WATER_Y)
+    hook._charging_frames = charging_frames  # pylint: disable=W0212
+    hook.throw_charged()
+    while hook.state == HookState.THROWING:
+        hook.update()
+    return hook.x
+
+
 class TestGameCorePowerGauge(TestParent):
     def setUp(self):
         super().setUp()
@@ -735,26 +849,35 @@ class TestGameCorePowerGauge(TestParent):
         境界値: MIN_CHARGE_FRAMES - 1 → 非表示、MIN_CHARGE_FRAMES → 表示。
         """
         cases = [
-            (0, 0.0, "非充電（frames=0）→ ゲージなし"),
+            (0, 0.0, None, "非充電（frames=0）→ ゲージなし"),
             (
                 Hook.MIN_CHARGE_FRAMES - 1,
                 0.0,
+                None,
                 "タップ相当（frames=MIN-1）→ charge_ratio 非ゼロだがゲージなし",
             ),
             (
                 Hook.MIN_CHARGE_FRAMES,
                 Hook.MIN_CHARGE_FRAMES / Hook.MAX_CHARGE_FRAMES,
+                _throw_and_get_landing_x(Hook.MIN_CHARGE_FRAMES),
                 "充電中（frames=MIN）→ 通常色ゲージあり",
             ),
-            (Hook.MAX_CHARGE_FRAMES, 1.0, "MAX 到達（frames=MAX）→ 強調色ゲージあり"),
+            (
+                Hook.MAX_CHARGE_FRAMES,
+                1.0,
+                _throw_and_get_landing_x(Hook.MAX_CHARGE_FRAMES),
+                "MAX 到達（frames=MAX）→ 強調色ゲージあり",
+            ),
         ]
-        for frames, ratio, desc in cases:
+        for frames, ratio, landing_x, desc in cases:
             with self.subTest(desc=desc):
                 core = GameCore()
                 core.hook._charging_frames = frames  # pylint: disable=W0212
                 self.test_view.call_params.clear()
                 core.draw()
-                expected = _build_full_expected_calls(charge_ratio=ratio)
+                expected = _build_full_expected_calls(
+                    charge_ratio=ratio, landing_x=landing_x
+                )
                 self.assertEqual(expected, self.test_view.get_call_params())
 
 
@@ -1486,11 +1609,12 @@ class TestGameCorePopup(TestParent):
                     self.game_core._popup = FishCatchPopup(  # pylint: disable=W0212
                         popup_score, fish_size, rarity
                     )
+                    is_first_draw = len(self.test_view.layer_list) == 0
 
                     self.game_core.draw()
 
                     expected_calls = _build_full_expected_calls(
-                        score=0
+                        score=0, is_first_draw=is_first_draw
                     ) + _build_popup_expected_calls(rarity, fish_size, popup_score)
                     self.assertEqual(
                         self.test_view.get_call_params(),
@@ -1538,12 +1662,15 @@ class TestGameCoreFatigue(TestParent):
             with self.subTest(desc=desc):
                 self.game_core._fatigue = fatigue  # pylint: disable=W0212
                 self.test_view.call_params = []
+                is_first_draw = len(self.test_view.layer_list) == 0
 
                 self.game_core.draw()
 
                 self.assertEqual(
                     self.test_view.get_call_params(),
-                    _build_full_expected_calls(fatigue=fatigue),
+                    _build_full_expected_calls(
+                        fatigue=fatigue, is_first_draw=is_first_draw
+                    ),
                 )
 
     def test_reeling_with_fish_decreases_fatigue_gauge_rendered_width(self):
@@ -1564,6 +1691,7 @@ class TestGameCoreFatigue(TestParent):
                 self._set_hook_reeling_far()
                 self._set_following_fish()
                 self.test_view.call_params = []
+                is_first_draw = len(self.test_view.layer_list) == 0
 
                 self.game_core.update()
                 self.game_core.draw()
@@ -1573,6 +1701,7 @@ class TestGameCoreFatigue(TestParent):
                     _build_full_expected_calls(
                         hook_pos=expected_hook_pos,
                         fatigue=expected_fatigue,
+                        is_first_draw=is_first_draw,
                     ),
                 )
 
@@ -4,6 +4,8 @@ from movable import Movable, Side, UnitType
 class Attack(Movable):
     SPEED = 2.0  # ユニットの4倍の速度
 
+    __slots__ = ("_is_alive", "_moved", "_range", "pool_index")
+
     def __init__(
         self,
         x: int,
@@ -12,6 +14,18 @@ class Attack(Movable):
         range_num: int,
         speed: float = SPEED,
     ) -> None:
+        self.pool_index = None  # AttackPool 内の添字（プール外なら None）
+        self.reset(x, side, unit_type, range_num, speed)
+
+    def reset(
+        self,
+        x: int,
+        side: Side,
+        unit_type: UnitType,
+        range_num: int,
+        speed: float = SPEED,
+    ) -> None:
+        """生成直後の状態に戻す（AttackPool での使い回し用）"""
         super().__init__(x, side, speed, unit_type)
         self._is_alive = True
         self._moved = 0
@@ -0,0 +1,101 @@
+import sys
+import time
+
+from attack import Attack  # pylint: disable=C0413
+from movable import Side, UnitType  # pylint: disable=C0413
+
+
+class AttackPool:
+    """Attack を使い回すための固定長のプール。
+
+    capacity 個の Attack を先に作っておき、空いている添字の一覧（free list）から貸し出す。
+    返された Attack は reset して次の貸し出しに使う。空きがなくなったときだけ新しく作り、
+    以後はそれもプールの一員として使い回す。
+    """
+
+    DEFAULT_CAPACITY = 64
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self._records = []
+        self._free = []  # 空いている _records の添字（末尾から貸し出す）
+        self._is_free = bytearray()
+        self.allocations = 0  # Attack を作った回数
+        self.acquisitions = 0  # 貸し出した回数（プールがなければ作っていた回数）
+        for _ in range(capacity):
+            self._free.append(self._allocate())
+
+    def __len__(self) -> int:
+        """貸し出し中の数"""
+        return len(self._records) - len(self._free)
+
+    @property
+    def capacity(self) -> int:
+        return len(self._records)
+
+    def _allocate(self) -> int:
+        attack = Attack(0, Side.PLAYER, UnitType.MIDDLE, 1)
+        attack.pool_index = len(self._records)
+        self._records.append(attack)
+        self._is_free.append(1)
+        self.allocations += 1
+        return attack.pool_index
+
+    def acquire(
+        self, x: int, side: Side, unit_type: UnitType, range_num: int
+    ) -> Attack:
+        """Attack(x, side, unit_type, range_num) と同じ状態の Attack を貸し出す"""
+        index = self._free.pop() if self._free else self._allocate()
+        self._is_free[index] = 0
+        self.acquisitions += 1
+        attack = self._records[index]
+        attack.reset(x, side, unit_type, range_num)
+        return attack
+
+    def release(self, attack: Attack) -> None:
+        """貸し出した Attack を返す。プール外の Attack と返却済みのものは無視する"""
+        index = attack.pool_index
+        if index is None or index >= len(self._records):
+            return
+        if self._records[index] is not attack or self._is_free[index]:
+            return
+        self._is_free[index] = 1
+        self._free.append(index)
+
+
+def _benchmark(frame_num: int) -> None:
+    """両軍が出撃し続ける戦闘を frame_num フレーム動かし、フレームあたりの Attack 生成数を出す"""
+    from force import EnemyStrategy, Force  # pylint: disable=C0415
+
+    force = {
+        Side.PLAYER: Force(Side.PLAYER),
+        Side.ENEMY: Force(Side.ENEMY, strategy=EnemyStrategy.CYCLE),
+    }
+    spawn_types = [UnitType.LOWER, UnitType.MIDDLE, UnitType.UPPER]
+    spawn_index = 0
+    start = time.perf_counter()
+    for frame in range(frame_num):
+        if any(f.is_base_destroyed for f in force.values()):
+            break
+        if force[Side.PLAYER].put_unit(spawn_types[spawn_index % len(spawn_types)]):
+            spawn_index += 1
+        for side, opposite in [(Side.PLAYER, Side.ENEMY), (Side.ENEMY, Side.PLAYER)]:
+            force[side].set_opponent_head_x(force[opposite].get_head_x())
+            force[side].take_damage(force[opposite].attacks)
+        for f in force.values():
+            f.update()
+    else:
+        frame = frame_num
+    seconds = time.perf_counter() - start
+    for side, f in force.items():
+        pool = f._attack_pool  # pylint: disable=W0212
+        # 先に作っておいた分を除いた、戦闘中に作った数
+        grown = pool.allocations - AttackPool.DEFAULT_CAPACITY
+        print(
+            f"{side.name}: attacks/frame {pool.acquisitions / frame:.3f}, "
+            f"allocations/frame {grown / frame:.3f} (capacity {pool.capacity})"
+        )
+    print(f"{frame} frames in {seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 18000)
@@ -0,0 +1,287 @@
+import math
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+
+from attack import Attack  # pylint: disable=C0413
+from force import EnemyStrategy, Force, _MinSegmentTree  # pylint: disable=C0413
+from movable import Direct, Movable, Side, UnitType  # pylint: disable=C0413
+from unit import Unit  # pylint: disable=C0413
+
+UNIT_TYPE_LIST = list(UnitType)
+
+
+class _ForceColumns:
+    """1 軍分のユニットと攻撃を列（array）で持つ。行の順番は Force._units / _attacks と同じ"""
+
+    def __init__(self, side: Side, strategy: EnemyStrategy = None) -> None:
+        self.side = side
+        self.face = Direct.RIGHT.value if side == Side.PLAYER else Direct.LEFT.value
+        # ユニット
+        self.x = array("d")
+        self.hp = array("i")
+        self.cooldown = array("i")
+        self.damaged_frames = array("i")
+        self.unit_type = array("b")  # UNIT_TYPE_LIST の添字
+        self.direct = array("b")  # Direct の値
+        # 攻撃
+        self.attack_x = array("d")
+        self.attack_moved = array("d")
+        self.attack_range = array("i")
+        self.attack_is_alive = array("b")
+        self.attack_type = array("b")
+        # 軍の状態（Force と同じ）
+        self.opponent_head_x = None
+        self.is_auto_put_unit = side == Side.ENEMY
+        self.auto_put_cooldown = Force.AUTO_PUT_INTERVAL
+        self.auto_spawn_index = 0
+        self.fund = 0
+        self.fund_cooldown = Force.FUND_INTERVAL
+        if side == Side.ENEMY:
+            self.strategy = (
+                strategy if strategy is not None else random.choice(list(EnemyStrategy))
+            )
+        else:
+            self.strategy = None
+
+    def add_unit(self, unit_type: UnitType, x: float) -> None:
+        params = Unit.TYPE_PARAMS[unit_type]
+        self.x.append(float(x))
+        self.hp.append(params.hp)
+        self.cooldown.append(0)
+        self.damaged_frames.append(0)
+        self.unit_type.append(UNIT_TYPE_LIST.index(unit_type))
+        self.direct.append(self.face)
+
+    def filter_units(self, keep_list: list) -> None:
+        for column in (
+            self.x,
+            self.hp,
+            self.cooldown,
+            self.damaged_frames,
+            self.unit_type,
+            self.direct,
+        ):
+            column[:] = array(column.typecode, [column[i] for i in keep_list])
+
+    def filter_attacks(self, keep_list: list) -> None:
+        for column in (
+            self.attack_x,
+            self.attack_moved,
+            self.attack_range,
+            self.attack_is_alive,
+            self.attack_type,
+        ):
+            column[:] = array(column.typecode, [column[i] for i in keep_list])
+
+
+class BattleEngine:
+    """両軍のユニット・攻撃を列で持ち、GameCore.update と同じ 1 フレームを進める。
+
+    Force / Unit / Attack のオブジェクトを作らず、向きの決定・移動・攻撃の生成・
+    当たり判定・撃破と消失の除去を列ごとの走査で行う。乱数の引き方（敵の戦略選択）も
+    Force と同じなので、同じシードなら GameCore とフレーム単位で同じ結果になる。
+    """
+
+    # 種類ごとのパラメータを UNIT_TYPE_LIST の添字で引けるようにしておく
+    _SPEED = [Unit.TYPE_PARAMS[t].speed for t in UNIT_TYPE_LIST]
+    _RANGE = [Unit.TYPE_PARAMS[t].range for t in UNIT_TYPE_LIST]
+    _INTERVAL = [Unit.TYPE_PARAMS[t].interval for t in UNIT_TYPE_LIST]
+    _BASE_TYPE = UNIT_TYPE_LIST.index(UnitType.BASE)
+
+    def __init__(self, enemy_strategy: EnemyStrategy = None) -> None:
+        self.force = {
+            Side.PLAYER: _ForceColumns(Side.PLAYER),
+            Side.ENEMY: _ForceColumns(Side.ENEMY, enemy_strategy),
+        }
+        self.force[Side.PLAYER].add_unit(UnitType.BASE, Unit.SPAWN_X_PLAYER)
+        self.force[Side.ENEMY].add_unit(UnitType.BASE, Force.BASE_X_ENEMY)
+
+    def get_strategy(self, side: Side) -> "EnemyStrategy | None":
+        return self.force[side].strategy
+
+    def get_fund(self, side: Side) -> int:
+        return self.force[side].fund
+
+    def get_unit_num(self, side: Side) -> int:
+        return len(self.force[side].x)
+
+    def get_head_x(self, side: Side) -> int:
+        """Force.get_head_x と同じ最前列の x 座標"""
+        columns = self.force[side]
+        if len(columns.x) == 0:
+            return None
+        if side == Side.PLAYER:
+            return int(max(columns.x))
+        return int(min(columns.x))
+
+    def is_base_destroyed(self, side: Side) -> bool:
+        return self._BASE_TYPE not in self.force[side].unit_type
+
+    def get_base_hp_ratio(self, side: Side) -> float:
+        columns = self.force[side]
+        if self._BASE_TYPE not in columns.unit_type:
+            return 0.0
+        hp = columns.hp[columns.unit_type.index(self._BASE_TYPE)]
+        return hp / Unit.TYPE_PARAMS[UnitType.BASE].hp
+
+    def is_game_over(self) -> bool:
+        return any(self.is_base_destroyed(side) for side in self.force)
+
+    def get_units(self, side: Side) -> list:
+        """[(x, unit_type, hp, direct, is_damaged)] を Force.units と同じ順で返す"""
+        columns = self.force[side]
+        return [
+            (
+                int(columns.x[i]),
+                UNIT_TYPE_LIST[columns.unit_type[i]],
+                columns.hp[i],
+                Direct(columns.direct[i]),
+                columns.damaged_frames[i] > 0,
+            )
+            for i in range(len(columns.x))
+        ]
+
+    def get_attacks(self, side: Side) -> list:
+        """[(x, unit_type, is_alive, progress)] を Force.attacks と同じ順で返す"""
+        columns = self.force[side]
+        return [
+            (
+                int(columns.attack_x[i]),
+                UNIT_TYPE_LIST[columns.attack_type[i]],
+                bool(columns.attack_is_alive[i]),
+                columns.attack_moved[i] / columns.attack_range[i],
+            )
+            for i in range(len(columns.attack_x))
+        ]
+
+    def put_unit(self, side: Side, unit_type: UnitType = UnitType.MIDDLE) -> bool:
+        """Force.put_unit と同じく軍資金を消費してスポーンする"""
+        columns = self.force[side]
+        if unit_type in Force.SPAWN_COST:
+            cost = Force.SPAWN_COST[unit_type]
+            if columns.fund < cost:
+                return False
+            columns.fund -= cost
+        self.add_unit(side, unit_type)
+        return True
+
+    def add_unit(self, side: Side, unit_type: UnitType, x: float = None) -> None:
+        """軍資金を使わずにユニットを置く（負荷試験用）"""
+        if x is None:
+            x = Unit.SPAWN_X_PLAYER if side == Side.PLAYER else Unit.SPAWN_X_ENEMY
+        self.force[side].add_unit(unit_type, x)
+
+    def update(self) -> None:
+        """GameCore.update のボタン操作以外と同じ順番で 1 フレーム進める。決着後は何もしない"""
+        if self.is_game_over():
+            return
+        for side, opposite in [(Side.PLAYER, Side.ENEMY), (Side.ENEMY, Side.PLAYER)]:
+            self.force[side].opponent_head_x = self.get_head_x(opposite)
+            self._take_damage(self.force[side], self.force[opposite])
+        for columns in self.force.values():
+            self._update_attacks(columns)
+            self._update_units(columns)
+            self._update_fund(columns)
+            self._auto_put(columns)
+
+    def _take_damage(self, columns: _ForceColumns, opponent: _ForceColumns) -> None:
+        """Force.take_damage と同じ順番で、各攻撃を射程内の先頭の未被弾ユニットに当てる"""
+        attack_num = len(opponent.attack_x)
+        if attack_num == 0 or len(columns.x) == 0:
+            return
+        x_list = [int(x) for x in columns.x]
+        lane = sorted(range(len(x_list)), key=x_list.__getitem__)
+        lane_x_list = [x_list[i] for i in lane]
+        lane_index_map = {unit: i for i, unit in enumerate(lane)}
+        damaged_frames = columns.damaged_frames
+        tree = _MinSegmentTree([math.inf if damaged_frames[i] > 0 else i for i in lane])
+        for i in range(attack_num):
+            if not opponent.attack_is_alive[i]:
+                continue
+            attack_range = opponent.attack_range[i]
+            if opponent.attack_moved[i] >= attack_range:
+                continue
+            attack_x = int(opponent.attack_x[i])
+            start = bisect_right(lane_x_list, attack_x - attack_range)
+            end = bisect_left(lane_x_list, attack_x + attack_range)
+            unit = tree.query(start, end)
+            if unit == math.inf:
+                continue
+            columns.hp[unit] -= 1
+            damaged_frames[unit] = Unit.DAMAGED_FRAMES
+            opponent.attack_is_alive[i] = 0
+            tree.update(lane_index_map[unit], math.inf)
+
+    @staticmethod
+    def _update_attacks(columns: _ForceColumns) -> None:
+        """Attack.update と、見えなくなった攻撃の除去"""
+        x_list, moved_list = columns.attack_x, columns.attack_moved
+        alive_list, range_list = columns.attack_is_alive, columns.attack_range
+        step = columns.face * Attack.SPEED
+        for i, x in enumerate(x_list):
+            x += step
+            x_list[i] = x
+            moved_list[i] += Attack.SPEED
+            if x < 0 or x >= Movable.SCREEN_WIDTH:
+                alive_list[i] = 0
+        keep_list = [i for i, moved in enumerate(moved_list) if moved < range_list[i]]
+        if len(keep_list) != len(moved_list):
+            columns.filter_attacks(keep_list)
+
+    def _update_units(self, columns: _ForceColumns) -> None:
+        """Unit.update・攻撃の生成・撃破されたユニットの除去"""
+        head_x = columns.opponent_head_x
+        is_player = columns.side == Side.PLAYER
+        x_list, direct_list = columns.x, columns.direct
+        cooldown_list, damaged_list = columns.cooldown, columns.damaged_frames
+        type_list = columns.unit_type
+        for i, x in enumerate(x_list):
+            unit_type = type_list[i]
+            unit_range = self._RANGE[unit_type]
+            if is_player and (head_x is None or x + unit_range < head_x):
+                direct = Direct.RIGHT.value
+            elif not is_player and (head_x is None or x - unit_range > head_x):
+                direct = Direct.LEFT.value
+            else:
+                direct = Direct.NEUTRAL.value
+            direct_list[i] = direct
+            x_list[i] = x + direct * self._SPEED[unit_type]
+            if damaged_list[i] > 0:
+                damaged_list[i] -= 1
+            if cooldown_list[i] > 0:
+                cooldown_list[i] -= 1
+        for i, direct in enumerate(direct_list):
+            if direct != Direct.NEUTRAL.value or cooldown_list[i] != 0:
+                continue
+            unit_type = type_list[i]
+            cooldown_list[i] = self._INTERVAL[unit_type]
+            columns.attack_x.append(
+                float(int(x_list[i]) + columns.face * Movable.TILE_SIZE)
+            )
+            columns.attack_moved.append(0.0)
+            columns.attack_range.append(self._RANGE[unit_type] - Movable.TILE_SIZE + 1)
+            columns.attack_is_alive.append(1)
+            columns.attack_type.append(unit_type)
+        hp_list = columns.hp
+        keep_list = [i for i, hp in enumerate(hp_list) if hp > 0 or damaged_list[i] > 0]
+        if len(keep_list) != len(hp_list):
+            columns.filter_units(keep_list)
+
+    @staticmethod
+    def _update_fund(columns: _ForceColumns) -> None:
+        columns.fund_cooldown -= 1
+        if columns.fund_cooldown <= 0:
+            columns.fund += Force.FUND_ADD
+            columns.fund_cooldown = Force.FUND_INTERVAL
+
+    def _auto_put(self, columns: _ForceColumns) -> None:
+        if not columns.is_auto_put_unit:
+            return
+        columns.auto_put_cooldown -= 1
+        if columns.auto_put_cooldown <= 0:
+            spawn_types = Force.STRATEGY_SPAWN_TYPES[columns.strategy]
+            unit_type = spawn_types[columns.auto_spawn_index % len(spawn_types)]
+            if self.put_unit(columns.side, unit_type):
+                columns.auto_spawn_index += 1
+            columns.auto_put_cooldown = Force.AUTO_PUT_INTERVAL
@@ -1,9 +1,12 @@
+import math
 import random
+from bisect import bisect_left, bisect_right
 from enum import Enum
 
-from unit import Unit  # pylint: disable=C0413
+from unit import OpponentHead, Unit  # pylint: disable=C0413
 from movable import Side, UnitType  # pylint: disable=C0413
 from attack import Attack  # pylint: disable=C0413
+from attack_pool import AttackPool  # pylint: disable=C0413
 
 
 class EnemyStrategy(Enum):
@@ -13,6 +16,39 @@ class EnemyStrategy(Enum):
     CYCLE = "cycle"
 
 
+class _MinSegmentTree:
+    """区間の最小値の取得と 1 点の更新をどちらも O(log n) で行う"""
+
+    def __init__(self, values: list) -> None:
+        self._size = len(values)
+        self._tree = [math.inf] * self._size + list(values)
+        for i in range(self._size - 1, 0, -1):
+            self._tree[i] = min(self._tree[2 * i], self._tree[2 * i + 1])
+
+    def update(self, index: int, value) -> None:
+        i = index + self._size
+        self._tree[i] = value
+        while i > 1:
+            i //= 2
+            self._tree[i] = min(self._tree[2 * i], self._tree[2 * i + 1])
+
+    def query(self, start: int, end: int):
+        """[start, end) の最小値。空なら math.inf"""
+        ret = math.inf
+        start += self._size
+        end += self._size
+        while start < end:
+            if start & 1:
+                ret = min(ret, self._tree[start])
+                start += 1
+            if end & 1:
+                end -= 1
+                ret = min(ret, self._tree[end])
+            start //= 2
+            end //= 2
+        return ret
+
+
 class Force:
 
     AUTO_PUT_INTERVAL = 30  # 資金不足時はスポーンしないため短いインターバルで問題ない
@@ -38,8 +74,20 @@ class Force:
     def __init__(self, side: Side, strategy: EnemyStrategy = None) -> None:
         self._side = side
         base_x = self.BASE_X_ENEMY if side == Side.ENEMY else None
-        self._units = [Unit(side, UnitType.BASE, x=base_x)]
+        self._opponent_head = OpponentHead()  # 全ユニットで共有する相手の最前列の位置
+        self._units = [
+            Unit(side, UnitType.BASE, x=base_x, opponent_head=self._opponent_head)
+        ]
+        # 最前列のユニットと先頭の拠点ユニット（update・put_unit のたびに更新）
+        self._head = None
+        self._base = None
+        self._tracked_units = None  # _head / _base を求めたときの _units とその長さ
+        self._tracked_len = 0
+        self._track_units()
+        # _units を x 順に並べたもの（take_damage で前回の並びから更新）
+        self._lane = []
         self._attacks = []
+        self._attack_pool = AttackPool()
         self._is_auto_put_unit = side == Side.ENEMY
         self._auto_put_cooldown = self.AUTO_PUT_INTERVAL
         self._auto_spawn_index = 0
@@ -63,15 +111,16 @@ class Force:
     @property
     def is_base_destroyed(self) -> bool:
         """拠点ユニットが撃破されたか"""
-        return not any(unit.unit_type == UnitType.BASE for unit in self._units)
+        self._check_tracked()
+        return self._base is None
 
     @property
     def base_hp_ratio(self) -> float:
         """拠点ユニットの残HP割合（残HP / 最大HP）を返す。拠点破壊済みなら 0.0"""
-        base = next((u for u in self._units if u.unit_type == UnitType.BASE), None)
-        if base is None:
+        self._check_tracked()
+        if self._base is None:
             return 0.0
-        return base.hp / Unit.TYPE_PARAMS[UnitType.BASE].hp
+        return self._base.hp / Unit.TYPE_PARAMS[UnitType.BASE].hp
 
     @property
     def fund(self) -> int:
@@ -83,16 +132,45 @@ class Force:
 
     def get_head_x(self) -> int:
         """最前列のx座標を取得"""
-        if not self._units:
+        self._check_tracked()
+        if self._head is None:
             return None
-        if self._side == Side.PLAYER:
-            return max(unit.x for unit in self._units)
-        return min(unit.x for unit in self._units)
+        return self._head.x
 
     def set_opponent_head_x(self, x: int) -> None:
-        """敵軍の先頭位置を各ユニットに設定"""
+        """敵軍の先頭位置を設定（各ユニットが共有する値を 1 回書き換える）"""
+        self._check_tracked()
+        self._opponent_head.x = x
+
+    def _is_ahead(self, unit: Unit, other: Unit) -> bool:
+        """unit が other より前（相手側）にいるか"""
+        if self._side == Side.PLAYER:
+            return unit.x > other.x
+        return unit.x < other.x
+
+    def _track_units(self) -> None:
+        """_units 全体から最前列と拠点を求め直し、相手の最前列の位置を共有させる"""
+        self._head = None
+        self._base = None
         for unit in self._units:
-            unit.set_opponent_head_x(x)
+            unit.share_opponent_head(self._opponent_head)
+            self._track_unit(unit)
+        self._tracked_units = self._units
+        self._tracked_len = len(self._units)
+
+    def _track_unit(self, unit: Unit) -> None:
+        if self._head is None or self._is_ahead(unit, self._head):
+            self._head = unit
+        if self._base is None and unit.unit_type == UnitType.BASE:
+            self._base = unit
+
+    def _check_tracked(self) -> None:
+        """_units が外から差し替え・追加されていたら求め直す"""
+        if (
+            self._units is not self._tracked_units
+            or len(self._units) != self._tracked_len
+        ):
+            self._track_units()
 
     def put_unit(self, unit_type: UnitType = UnitType.MIDDLE) -> bool:
         """軍資金を消費してユニットをスポーンする。
@@ -103,29 +181,97 @@ class Force:
             if self._fund < cost:
                 return False
             self._fund -= cost
-        self._units.append(Unit(self._side, unit_type))
+        self._check_tracked()
+        unit = Unit(self._side, unit_type, opponent_head=self._opponent_head)
+        self._units.append(unit)
+        self._track_unit(unit)
+        self._tracked_len = len(self._units)
+        self._lane.append(unit)  # 並べ直しは次の take_damage でまとめて行う
         return True
 
+    def _sync_lane(self) -> None:
+        """_lane を _units と同じ顔ぶれにし、x 順に並べ直す。
+
+        前回の並びを使い回すので、移動しただけなら並べ直しはほぼ線形で済む。
+        """
+        if len(self._lane) != len(self._units) or set(self._lane) != set(self._units):
+            self._lane = list(self._units)
+        self._lane.sort(key=lambda unit: unit.x)
+
     def take_damage(self, attacks: list[Attack]) -> None:
-        """各ユニットが攻撃を受ける"""
+        """各ユニットが攻撃を受ける
+
+        攻撃ごとに、射程内で未被弾のユニットのうち _units で最も先にあるものに当たる。
+        x 順の並びを二分探索して射程内の区間を求め、区間内の _units での順番の最小値を
+        セグメント木で引くので、攻撃 m 件・ユニット n 体で O(n log n + m log n)。
+        """
+        if not attacks or not self._units:
+            return
+        self._sync_lane()
+        order_map = {unit: i for i, unit in enumerate(self._units)}
+        x_list = [unit.x for unit in self._lane]
+        lane_index_map = {unit: i for i, unit in enumerate(self._lane)}
+        # 攻撃の陣営ごとに、当たりうるユニット（別陣営・未被弾）の順番を葉に持つ木
+        tree_map = {}
         for attack in attacks:
-            for unit in self._units:
-                if attack.is_hitting(unit):
-                    unit.take_damage()
-                    attack.deactivate()
-                    break
+            if not attack.is_alive or not attack.is_visible:
+                continue
+            tree = tree_map.get(attack.side)
+            if tree is None:
+                tree = _MinSegmentTree(
+                    [
+                        (
+                            math.inf
+                            if unit.is_damaged or unit.side == attack.side
+                            else order_map[unit]
+                        )
+                        for unit in self._lane
+                    ]
+                )
+                tree_map[attack.side] = tree
+            start = bisect_right(x_list, attack.x - attack.range)
+            end = bisect_left(x_list, attack.x + attack.range)
+            order = tree.query(start, end)
+            if order == math.inf:
+                continue
+            unit = self._units[order]
+            unit.take_damage()
+            attack.deactivate()
+            for damaged_tree in tree_map.values():
+                damaged_tree.update(lane_index_map[unit], math.inf)
 
     def update(self) -> None:
         """軍に所属するユニットと攻撃を更新"""
+        self._check_tracked()
+        # 見えなくなった攻撃はプールに返し、残りをその場で前に詰める
+        kept_num = 0
         for attack in self._attacks:
             attack.update()
-        self._attacks = [attack for attack in self._attacks if attack.is_visible]
+            if attack.is_visible:
+                self._attacks[kept_num] = attack
+                kept_num += 1
+            else:
+                self._attack_pool.release(attack)
+        del self._attacks[kept_num:]
         for unit in self._units:
             unit.update()
         self._attacks.extend(
-            unit.create_attack() for unit in self._units if unit.can_attack
+            unit.create_attack(self._attack_pool)
+            for unit in self._units
+            if unit.can_attack
         )
-        self._units = [unit for unit in self._units if unit.is_alive or unit.is_damaged]
+        # 撃破されたユニットを除きながら、移動後の最前列と拠点を求め直す
+        self._head = None
+        self._base = None
+        units = []
+        for unit in self._units:
+            if unit.is_alive or unit.is_damaged:
+                units.append(unit)
+                self._track_unit(unit)
+        self._units = units
+        self._tracked_units = units
+        self._tracked_len = len(units)
+        self._lane = [unit for unit in self._lane if unit.is_alive or unit.is_damaged]
         self._update_fund()  # fund を先に更新
         self._auto_put()  # 更新後の fund で spawn 判定
 
@@ -24,6 +24,8 @@ class Movable:
     SCREEN_WIDTH = 150  # 画面幅
     TILE_SIZE = 8  # タイルサイズ（8x8px）
 
+    __slots__ = ("_x", "_side", "_face", "_direct", "_speed", "_unit_type")
+
     def __init__(self, x: int, side: Side, speed: float, unit_type: UnitType) -> None:
         self._x = float(x)
         self._side = side
@@ -0,0 +1,205 @@
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+from battle import BattleEngine  # pylint: disable=C0413
+from force import EnemyStrategy  # pylint: disable=C0413
+from movable import Side, UnitType  # pylint: disable=C0413
+
+
+class SpawnPolicy:
+    """プレイヤー側の出撃方針（ビルドオーダー）。
+
+    build_order を先頭から順に put_unit し、最後まで行ったら先頭に戻る。
+    軍資金不足で出せなかったときは次のフレームで同じユニットを再試行する。
+    reaction_frames: 出撃に成功してから次の試行までに待つフレーム数の最大値
+    （試合ごとのシードから 0〜reaction_frames を引く。0 なら毎フレーム試行）
+    """
+
+    def __init__(self, name, build_order, reaction_frames=0):
+        self.name = name
+        self.build_order = list(build_order)
+        self.reaction_frames = reaction_frames
+
+    def __repr__(self):
+        order = ",".join(unit_type.name for unit_type in self.build_order)
+        return (
+            f"SpawnPolicy(name={self.name}, build_order=[{order}], "
+            f"reaction_frames={self.reaction_frames})"
+        )
+
+    def create_player(self, seed):
+        return _PolicyPlayer(self, random.Random(seed))
+
+
+class _PolicyPlayer:
+    """1 試合分の SpawnPolicy の状態"""
+
+    def __init__(self, policy, rand):
+        self._policy = policy
+        self._rand = rand
+        self._index = 0
+        self._wait = 0
+
+    def act(self, engine):
+        if self._wait > 0:
+            self._wait -= 1
+            return
+        build_order = self._policy.build_order
+        unit_type = build_order[self._index % len(build_order)]
+        if engine.put_unit(Side.PLAYER, unit_type):
+            self._index += 1
+            self._wait = self._rand.randint(0, self._policy.reaction_frames)
+
+
+DEFAULT_POLICIES = [
+    SpawnPolicy("lower_rush", [UnitType.LOWER], reaction_frames=15),
+    SpawnPolicy("middle_only", [UnitType.MIDDLE], reaction_frames=15),
+    SpawnPolicy("upper_only", [UnitType.UPPER], reaction_frames=15),
+    SpawnPolicy(
+        "cycle", [UnitType.LOWER, UnitType.MIDDLE, UnitType.UPPER], reaction_frames=15
+    ),
+    SpawnPolicy(
+        "screen_upper",
+        [UnitType.LOWER, UnitType.LOWER, UnitType.UPPER],
+        reaction_frames=15,
+    ),
+]
+
+
+class MatchRunner:
+    """BattleEngine で 1 試合を決着（または max_frames）まで動かす。"""
+
+    MAX_FRAMES = 30 * 60 * 10  # 30fps で 10 分
+
+    def __init__(self, policy, strategy, max_frames=MAX_FRAMES):
+        self.policy = policy
+        self.strategy = strategy
+        self.max_frames = max_frames
+
+    def run(self, seed):
+        random.seed(seed)
+        engine = BattleEngine(enemy_strategy=self.strategy)
+        player = self.policy.create_player(seed)
+        frames = 0
+        while not engine.is_game_over() and frames < self.max_frames:
+            player.act(engine)
+            engine.update()
+            frames += 1
+        if engine.is_base_destroyed(Side.ENEMY):
+            winner = Side.PLAYER.name
+        elif engine.is_base_destroyed(Side.PLAYER):
+            winner = Side.ENEMY.name
+        else:
+            winner = None
+        return {
+            "seed": seed,
+            "winner": winner,
+            "frames": frames,
+            "player_base_hp": engine.get_base_hp_ratio(Side.PLAYER),
+            "enemy_base_hp": engine.get_base_hp_ratio(Side.ENEMY),
+        }
+
+
+def _run_chunk(task):
+    policy, strategy, seed_list, max_frames = task
+    runner = MatchRunner(policy, strategy, max_frames)
+    return policy.name, strategy.name, [runner.run(seed) for seed in seed_list]
+
+
+def _mean(value_list):
+    return sum(value_list) / len(value_list) if value_list else 0.0
+
+
+def aggregate(results):
+    """試合結果を勝率・試合の長さ・残り拠点 HP 割合にまとめる。"""
+    match_num = len(results)
+    winner_list = [r["winner"] for r in results]
+    return {
+        "matches": match_num,
+        "win_rate": winner_list.count(Side.PLAYER.name) / match_num,
+        "loss_rate": winner_list.count(Side.ENEMY.name) / match_num,
+        "draw_rate": winner_list.count(None) / match_num,
+        "frames_mean": _mean([r["frames"] for r in results]),
+        "player_base_hp_mean": _mean([r["player_base_hp"] for r in results]),
+        "enemy_base_hp_mean": _mean([r["enemy_base_hp"] for r in results]),
+    }
+
+
+def run_tournament(
+    policies=None,
+    strategies=None,
+    match_num=10,
+    seed=0,
+    processes=None,
+    max_frames=MatchRunner.MAX_FRAMES,
+):
+    """出撃方針 × EnemyStrategy の総当たりを match_num 試合ずつプロセスプールで動かす。
+
+    どの組み合わせも同じシード列（seed から match_num 個）を使う。
+    戻り値は {方針名: {戦略名: aggregate の結果}}。
+    """
+    policies = DEFAULT_POLICIES if policies is None else policies
+    strategies = list(EnemyStrategy) if strategies is None else strategies
+    seed_list = list(range(seed, seed + match_num))
+    processes = os.cpu_count() if processes is None else processes
+    chunk_size = max(1, match_num * len(policies) * len(strategies) // (processes * 4))
+    tasks = [
+        (policy, strategy, seed_list[i : i + chunk_size], max_frames)
+        for policy in policies
+        for strategy in strategies
+        for i in range(0, match_num, chunk_size)
+    ]
+    if processes == 1:
+        chunks = [_run_chunk(task) for task in tasks]
+    else:
+        with Pool(processes) as pool:
+            chunks = pool.map(_run_chunk, tasks)
+    results_map = {}
+    for policy_name, strategy_name, results in chunks:
+        results_map.setdefault(policy_name, {}).setdefault(strategy_name, [])
+        results_map[policy_name][strategy_name].extend(results)
+    return {
+        policy_name: {
+            strategy_name: aggregate(results)
+            for strategy_name, results in strategy_map.items()
+        }
+        for policy_name, strategy_map in results_map.items()
+    }
+
+
+def format_report(matrix):
+    """方針を行・戦略を列にした勝率 / 敗率 / 引き分け率 / 平均フレーム数 / 残り拠点 HP の表を作る。"""
+    strategy_names = list(next(iter(matrix.values())))
+    name_w = max(len("policy"), *(len(name) for name in matrix))
+    col_w = max(30, *(len(name) for name in strategy_names))
+    lines = [
+        "win rate / loss rate / draw rate / mean frames"
+        " / player base hp / enemy base hp",
+        "policy".ljust(name_w)
+        + "".join(f" | {name:<{col_w}}" for name in strategy_names),
+        "-" * (name_w + (col_w + 3) * len(strategy_names)),
+    ]
+    for policy_name, strategy_map in matrix.items():
+        cells = [
+            f"{s['win_rate']:.2f}/{s['loss_rate']:.2f}/{s['draw_rate']:.2f}"
+            f"/{s['frames_mean']:.0f}"
+            f"/{s['player_base_hp_mean']:.2f}/{s['enemy_base_hp_mean']:.2f}"
+            for s in (strategy_map[name] for name in strategy_names)
+        ]
+        lines.append(
+            policy_name.ljust(name_w) + "".join(f" | {cell:<{col_w}}" for cell in cells)
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    match_num = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    start = time.perf_counter()
+    matrix = run_tournament(match_num=match_num)
+    seconds = time.perf_counter() - start
+    print(format_report(matrix))
+    total = match_num * len(DEFAULT_POLICIES) * len(EnemyStrategy)
+    print(f"{total} matches in {seconds:.1f}s")
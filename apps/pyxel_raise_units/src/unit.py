@@ -1,6 +1,16 @@
 from dataclasses import dataclass
 from movable import Movable, Side, Direct, UnitType
 from attack import Attack
+from attack_pool import AttackPool
+
+
+class OpponentHead:
+    """相手の最前列の x 座標。同じ軍のユニットで 1 つを共有し、軍が 1 回書き換える"""
+
+    __slots__ = ("x",)
+
+    def __init__(self, x: int = None) -> None:
+        self.x = x
 
 
 @dataclass(frozen=True)
@@ -28,6 +38,7 @@ class Unit(Movable):
         side: Side,
         unit_type: UnitType,
         x: int = None,
+        opponent_head: OpponentHead = None,
     ) -> None:
         start_pos = (
             x
@@ -41,7 +52,9 @@ class Unit(Movable):
         self._range = params.range
         self._interval = params.interval
         self._damaged_frames = 0
-        self._opponent_head_x = None
+        self._opponent_head = (
+            opponent_head if opponent_head is not None else OpponentHead()
+        )
         self._cooldown = 0
 
     @property
@@ -65,8 +78,12 @@ class Unit(Movable):
         self._damaged_frames = Unit.DAMAGED_FRAMES
 
     def set_opponent_head_x(self, x: int) -> None:
-        """相手の最前列の位置を把握する"""
-        self._opponent_head_x = x
+        """相手の最前列の位置を把握する（共有中なら同じ軍の全ユニットに反映される）"""
+        self._opponent_head.x = x
+
+    def share_opponent_head(self, opponent_head: OpponentHead) -> None:
+        """相手の最前列の位置を軍と共有する"""
+        self._opponent_head = opponent_head
 
     def _is_in_combat(self) -> bool:
         """戦闘状態かどうかを判定"""
@@ -77,23 +94,24 @@ class Unit(Movable):
         """攻撃可能かどうかを判定"""
         return self._is_in_combat() and self._cooldown == 0
 
-    def create_attack(self) -> Attack:
-        """攻撃エフェクトを生成し、クールダウンをリセット"""
+    def create_attack(self, pool: AttackPool = None) -> Attack:
+        """攻撃エフェクトを生成し、クールダウンをリセット（pool があれば使い回す）"""
         attack_x = self.x + self._face.value * self.TILE_SIZE
         self._cooldown = self._interval
         attack_range = self._range - self.TILE_SIZE + 1
+        if pool is not None:
+            return pool.acquire(attack_x, self._side, self.unit_type, attack_range)
         return Attack(attack_x, self._side, self.unit_type, attack_range)
 
     def _update_direct(self) -> None:
         """移動するか否かを更新"""
+        opponent_head_x = self._opponent_head.x
         if self._side == Side.PLAYER and (
-            self._opponent_head_x is None
-            or self._x + self._range < self._opponent_head_x
+            opponent_head_x is None or self._x + self._range < opponent_head_x
         ):
             self.set_direct(Direct.RIGHT)
         elif self._side == Side.ENEMY and (
-            self._opponent_head_x is None
-            or self._x - self._range > self._opponent_head_x
+            opponent_head_x is None or self._x - self._range > opponent_head_x
         ):
             self.set_direct(Direct.LEFT)
         else:
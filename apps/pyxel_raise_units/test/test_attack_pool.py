@@ -0,0 +1,104 @@
+import sys
+import os
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/")))
+from attack import Attack  # pylint: disable=C0413
+from attack_pool import AttackPool  # pylint: disable=C0413
+from force import Force, EnemyStrategy  # pylint: disable=C0413
+from movable import Side, UnitType  # pylint: disable=C0413
+
+
+def _get_attack_state(attack):
+    return (
+        attack.x,
+        attack.side,
+        attack.direct,
+        attack.unit_type,
+        attack.range,
+        attack.is_alive,
+        attack.is_visible,
+        attack.progress,
+    )
+
+
+class TestAttackPool(unittest.TestCase):
+    def test_acquire(self):
+        """貸し出した Attack は新しく作った Attack と同じ状態になる"""
+        pool = AttackPool(capacity=2)
+        test_cases = [
+            ("player", 50, Side.PLAYER, UnitType.MIDDLE, 8),
+            ("enemy", 100, Side.ENEMY, UnitType.UPPER, 18),
+        ]
+        for case_name, x, side, unit_type, range_num in test_cases:
+            with self.subTest(case_name=case_name):
+                attack = pool.acquire(x, side, unit_type, range_num)
+                expected = Attack(x, side, unit_type, range_num)
+                self.assertEqual(_get_attack_state(expected), _get_attack_state(attack))
+                for _ in range(3):
+                    attack.update()
+                    expected.update()
+                self.assertEqual(_get_attack_state(expected), _get_attack_state(attack))
+        self.assertEqual(2, len(pool))
+        self.assertEqual(2, pool.allocations)
+
+    def test_release_and_reuse(self):
+        """返した Attack は作り直さずに使い回し、空きがなければ 1 つずつ増やす"""
+        pool = AttackPool(capacity=1)
+        attack = pool.acquire(50, Side.PLAYER, UnitType.MIDDLE, 8)
+        attack.deactivate()
+        pool.release(attack)
+        self.assertEqual(0, len(pool))
+        reused = pool.acquire(60, Side.ENEMY, UnitType.LOWER, 5)
+        self.assertIs(attack, reused)
+        self.assertTrue(reused.is_alive)
+        self.assertEqual(60, reused.x)
+        other = pool.acquire(70, Side.ENEMY, UnitType.LOWER, 5)
+        self.assertIsNot(reused, other)
+        self.assertEqual(2, pool.capacity)
+        self.assertEqual(2, pool.allocations)
+        self.assertEqual(3, pool.acquisitions)
+
+    def test_release_ignored(self):
+        """プール外の Attack と返却済みの Attack は返しても無視する"""
+        pool = AttackPool(capacity=2)
+        attack = pool.acquire(50, Side.PLAYER, UnitType.MIDDLE, 8)
+        pool.release(attack)
+        pool.release(attack)
+        pool.release(Attack(50, Side.PLAYER, UnitType.MIDDLE, 8))
+        pool.release(
+            AttackPool(capacity=2).acquire(50, Side.PLAYER, UnitType.MIDDLE, 8)
+        )
+        self.assertEqual(0, len(pool))
+        first = pool.acquire(50, Side.PLAYER, UnitType.MIDDLE, 8)
+        second = pool.acquire(50, Side.PLAYER, UnitType.MIDDLE, 8)
+        self.assertIsNot(first, second)
+        self.assertEqual(2, pool.allocations)
+
+    def test_force_recycles_attacks(self):
+        """Force は消えた攻撃をプールに返し、長い戦闘でも Attack を作り足さない"""
+        force = {
+            Side.PLAYER: Force(Side.PLAYER),
+            Side.ENEMY: Force(Side.ENEMY, strategy=EnemyStrategy.CYCLE),
+        }
+        force[Side.PLAYER]._is_auto_put_unit = True  # pylint: disable=W0212
+        force[Side.PLAYER]._strategy = EnemyStrategy.CYCLE  # pylint: disable=W0212
+        for _ in range(3000):
+            for side, opposite in [
+                (Side.PLAYER, Side.ENEMY),
+                (Side.ENEMY, Side.PLAYER),
+            ]:
+                force[side].set_opponent_head_x(force[opposite].get_head_x())
+                force[side].take_damage(force[opposite].attacks)
+            for f in force.values():
+                f.update()
+                pool = f._attack_pool  # pylint: disable=W0212
+                self.assertEqual(len(f.attacks), len(pool))
+        for f in force.values():
+            pool = f._attack_pool  # pylint: disable=W0212
+            self.assertGreater(pool.acquisitions, pool.capacity)
+            self.assertEqual(AttackPool.DEFAULT_CAPACITY, pool.allocations)
+
+
+if __name__ == "__main__":
+    unittest.main()
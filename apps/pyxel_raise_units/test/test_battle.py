@@ -0,0 +1,132 @@
+import sys
+import os
+import random
+import time
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/")))
+from movable import Side, UnitType  # pylint: disable=C0413
+from force import Force, EnemyStrategy  # pylint: disable=C0413
+from battle import BattleEngine  # pylint: disable=C0413
+
+SPAWN_TYPES = [UnitType.LOWER, UnitType.MIDDLE, UnitType.UPPER]
+
+
+def _get_force_state(force):
+    return (
+        [
+            (unit.x, unit.unit_type, unit.hp, unit.direct, unit.is_damaged)
+            for unit in force.units
+        ],
+        [
+            (attack.x, attack.unit_type, attack.is_alive, attack.progress)
+            for attack in force.attacks
+        ],
+        force.fund,
+        force.is_base_destroyed,
+        force.base_hp_ratio,
+    )
+
+
+def _get_engine_state(engine, side):
+    return (
+        engine.get_units(side),
+        engine.get_attacks(side),
+        engine.get_fund(side),
+        engine.is_base_destroyed(side),
+        engine.get_base_hp_ratio(side),
+    )
+
+
+class TestBattleEngine(unittest.TestCase):
+    def test_matches_force(self):
+        """GameCore と同じ順番で動かした Force の組とフレーム単位で同じ状態になる"""
+        test_cases = [
+            ("random 0", 0, SPAWN_TYPES, 3000),
+            ("random 1", 1, SPAWN_TYPES, 3000),
+            ("random 2", 2, SPAWN_TYPES, 3000),
+            # 拠点が破壊されて決着するまで
+            ("upper only", 0, [UnitType.UPPER], 7000),
+        ]
+        for case_name, seed, spawn_types, frame_num in test_cases:
+            with self.subTest(case_name=case_name):
+                put_rand = random.Random(seed + 100)
+                put_list = [put_rand.choice(spawn_types) for _ in range(frame_num)]
+
+                random.seed(seed)
+                force = {Side.PLAYER: Force(Side.PLAYER), Side.ENEMY: Force(Side.ENEMY)}
+                force_log = []
+                for unit_type in put_list:
+                    if force[Side.PLAYER].is_base_destroyed:
+                        break
+                    if force[Side.ENEMY].is_base_destroyed:
+                        break
+                    force[Side.PLAYER].put_unit(unit_type)
+                    for side, opposite in [
+                        (Side.PLAYER, Side.ENEMY),
+                        (Side.ENEMY, Side.PLAYER),
+                    ]:
+                        force[side].set_opponent_head_x(force[opposite].get_head_x())
+                        force[side].take_damage(force[opposite].attacks)
+                    for f in force.values():
+                        f.update()
+                    force_log.append([_get_force_state(f) for f in force.values()])
+
+                random.seed(seed)
+                engine = BattleEngine()
+                self.assertEqual(
+                    force[Side.ENEMY].strategy, engine.get_strategy(Side.ENEMY)
+                )
+                engine_log = []
+                for unit_type in put_list:
+                    if engine.is_game_over():
+                        break
+                    engine.put_unit(Side.PLAYER, unit_type)
+                    engine.update()
+                    engine_log.append(
+                        [_get_engine_state(engine, side) for side in Side]
+                    )
+                self.assertEqual(force_log, engine_log)
+                self.assertEqual(
+                    force[Side.PLAYER].is_base_destroyed
+                    or force[Side.ENEMY].is_base_destroyed,
+                    engine.is_game_over(),
+                )
+
+    def test_strategy(self):
+        """指定した戦略で敵が自動スポーンする"""
+        for strategy in EnemyStrategy:
+            with self.subTest(strategy=strategy):
+                engine = BattleEngine(enemy_strategy=strategy)
+                self.assertEqual(strategy, engine.get_strategy(Side.ENEMY))
+                for _ in range(Force.AUTO_PUT_INTERVAL * 10):
+                    engine.update()
+                spawned = {unit[1] for unit in engine.get_units(Side.ENEMY)}
+                spawned.discard(UnitType.BASE)
+                expected = set(Force.STRATEGY_SPAWN_TYPES[strategy])
+                self.assertTrue(spawned)
+                self.assertLessEqual(spawned, expected)
+
+    def test_mass_battle(self):
+        """数千体のユニットでも数百フレームを短時間で進められる"""
+        random.seed(0)
+        engine = BattleEngine(enemy_strategy=EnemyStrategy.CYCLE)
+        for i in range(2000):
+            for side in Side:
+                engine.add_unit(side, SPAWN_TYPES[i % len(SPAWN_TYPES)])
+        self.assertEqual(
+            4002, engine.get_unit_num(Side.PLAYER) + engine.get_unit_num(Side.ENEMY)
+        )
+        start = time.perf_counter()
+        for _ in range(300):
+            engine.update()
+        self.assertLess(time.perf_counter() - start, 60)
+        # 接敵して撃破が起きていること
+        self.assertLess(engine.get_unit_num(Side.PLAYER), 2001)
+        self.assertLess(
+            engine.get_unit_num(Side.ENEMY), 2001 + 300 // Force.AUTO_PUT_INTERVAL
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 import sys
 import os
+import random
 import unittest
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/")))
@@ -163,6 +164,80 @@ class TestForce(unittest.TestCase):
                     expected_is_alive = i not in expected_disable_attack_ids
                     self.assertEqual(attack.is_alive, expected_is_alive)
 
+    def test_take_damage_matches_scan(self):
+        """大量のユニット・攻撃でも、全ユニットを順に調べる判定と同じユニットに当たる"""
+
+        def take_damage_by_scan(units, attacks):
+            for attack in attacks:
+                for unit in units:
+                    if attack.is_hitting(unit):
+                        unit.take_damage()
+                        attack.deactivate()
+                        break
+
+        def make_battle(seed):
+            rand = random.Random(seed)
+            units = []
+            for _ in range(300):
+                unit = Unit(
+                    Side.PLAYER if rand.random() < 0.95 else Side.ENEMY,
+                    rand.choice([UnitType.LOWER, UnitType.MIDDLE, UnitType.UPPER]),
+                )
+                unit._x = rand.uniform(0, Movable.SCREEN_WIDTH)  # pylint: disable=W0212
+                if rand.random() < 0.1:
+                    unit.take_damage()
+                units.append(unit)
+            attacks = []
+            for _ in range(300):
+                attack = Attack(
+                    rand.randint(0, Movable.SCREEN_WIDTH),
+                    Side.ENEMY if rand.random() < 0.95 else Side.PLAYER,
+                    UnitType.MIDDLE,
+                    rand.randint(1, 20),
+                )
+                if rand.random() < 0.1:
+                    attack.deactivate()
+                attacks.append(attack)
+            return units, attacks
+
+        def get_state(units, attacks):
+            return [(unit.hp, unit.is_damaged) for unit in units], [
+                attack.is_alive for attack in attacks
+            ]
+
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                units, attacks = make_battle(seed)
+                take_damage_by_scan(units, attacks)
+                expected = get_state(units, attacks)
+                units, attacks = make_battle(seed)
+                force = Force(Side.PLAYER)
+                force._units = units  # pylint: disable=W0212
+                force.take_damage(attacks)
+                self.assertEqual(expected, get_state(units, attacks))
+
+    def test_take_damage_after_move_and_spawn(self):
+        """移動・スポーン・撃破で並びが変わっても射程内の先頭のユニットに当たる"""
+        force = Force(Side.PLAYER)
+        force._fund = 1000  # pylint: disable=W0212
+        for _ in range(3):
+            force.put_unit(UnitType.LOWER)
+            for _ in range(20):
+                force.update()
+        # x 順: 先にスポーンしたユニットほど前（BASE は x=0）
+        units = force.units
+        for target in units[1:]:
+            attack = Attack(target.x, Side.ENEMY, UnitType.MIDDLE, 1)
+            force.take_damage([attack])
+            self.assertFalse(attack.is_alive)
+            self.assertTrue(target.is_damaged)
+        for _ in range(Unit.DAMAGED_FRAMES):
+            force.update()
+        self.assertEqual([UnitType.BASE], [unit.unit_type for unit in force.units])
+        attack = Attack(0, Side.ENEMY, UnitType.MIDDLE, 1)
+        force.take_damage([attack])
+        self.assertFalse(attack.is_alive)
+
     def test_update_unit_killed(self):
         """軍のユニットが攻撃を受けて死亡する"""
         force = Force(Side.PLAYER)
@@ -489,3 +564,68 @@ class TestForce(unittest.TestCase):
         for _ in range(Unit.DAMAGED_FRAMES + 1):
             force.update()
         self.assertAlmostEqual(force.base_hp_ratio, 0.0)
+
+    def test_head_and_base_tracking(self):
+        """移動・スポーン・撃破を重ねても最前列と拠点の追跡が全走査と一致する"""
+        for side in Side:
+            with self.subTest(side=side):
+                rand = random.Random(side.value)
+                force = Force(side, strategy=EnemyStrategy.CYCLE)
+                force._fund = 10000  # pylint: disable=W0212
+                opponent_head_x = 75
+                for frame in range(600):
+                    if rand.random() < 0.1:
+                        force.put_unit(
+                            rand.choice(
+                                [UnitType.LOWER, UnitType.MIDDLE, UnitType.UPPER]
+                            )
+                        )
+                    force.set_opponent_head_x(opponent_head_x)
+                    force.take_damage(
+                        [
+                            Attack(
+                                rand.randint(0, 150),
+                                Side(1 - side.value),
+                                UnitType.MIDDLE,
+                                8,
+                            )
+                            for _ in range(3)
+                        ]
+                    )
+                    force.update()
+                    x_list = [unit.x for unit in force.units]
+                    expected_head_x = (
+                        None
+                        if not x_list
+                        else max(x_list) if side == Side.PLAYER else min(x_list)
+                    )
+                    base = next(
+                        (u for u in force.units if u.unit_type == UnitType.BASE), None
+                    )
+                    self.assertEqual(expected_head_x, force.get_head_x(), frame)
+                    self.assertEqual(base is None, force.is_base_destroyed, frame)
+                    self.assertEqual(
+                        0.0 if base is None else base.hp / 20, force.base_hp_ratio
+                    )
+                self.assertTrue(force.is_base_destroyed)
+
+    def test_opponent_head_is_shared(self):
+        """相手の最前列の位置は 1 回の設定で後からスポーン・追加したユニットにも届く"""
+        force = Force(Side.PLAYER)
+        force._fund = 100  # pylint: disable=W0212
+        force.put_unit(UnitType.LOWER)
+        unit = Unit(Side.PLAYER, UnitType.MIDDLE)
+        unit._x = 50  # pylint: disable=W0212
+        force._units.append(unit)  # pylint: disable=W0212
+        force.set_opponent_head_x(60)
+        force.put_unit(UnitType.LOWER)
+        force.update()
+        self.assertEqual(Direct.NEUTRAL, unit.direct)
+        self.assertEqual(
+            [Direct.RIGHT] * 2,
+            [u.direct for u in force.units if u.unit_type == UnitType.LOWER],
+        )
+        self.assertEqual(50, force.get_head_x())
+        force.set_opponent_head_x(None)
+        force.update()
+        self.assertEqual(Direct.RIGHT, unit.direct)
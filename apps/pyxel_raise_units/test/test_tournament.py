@@ -0,0 +1,170 @@
+import sys
+import os
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/")))
+from battle import BattleEngine  # pylint: disable=C0413
+from force import Force, EnemyStrategy  # pylint: disable=C0413
+from movable import Side, UnitType  # pylint: disable=C0413
+from tournament import (  # pylint: disable=C0413
+    MatchRunner,
+    SpawnPolicy,
+    aggregate,
+    format_report,
+    run_tournament,
+)
+
+
+class TestSpawnPolicy(unittest.TestCase):
+    def test_build_order(self):
+        """ビルドオーダーの順に出撃し、資金不足なら同じユニットを待つ"""
+        policy = SpawnPolicy("test", [UnitType.LOWER, UnitType.MIDDLE])
+        player = policy.create_player(0)
+        engine = BattleEngine(enemy_strategy=EnemyStrategy.LOWER_ONLY)
+        spawned = []
+        for _ in range(600):
+            unit_num = engine.get_unit_num(Side.PLAYER)
+            player.act(engine)
+            if engine.get_unit_num(Side.PLAYER) > unit_num:
+                spawned.append(engine.get_units(Side.PLAYER)[-1][1])
+            engine.update()
+        self.assertEqual([UnitType.LOWER, UnitType.MIDDLE] * 2, spawned[:4])
+
+    def test_reaction_frames(self):
+        """出撃後は 0〜reaction_frames フレーム待ち、同じシードなら同じ待ち方になる"""
+
+        def get_spawn_frames(reaction_frames, seed):
+            policy = SpawnPolicy("test", [UnitType.LOWER], reaction_frames)
+            player = policy.create_player(seed)
+            engine = BattleEngine(enemy_strategy=EnemyStrategy.LOWER_ONLY)
+            spawn_frames = []
+            for frame in range(600):
+                unit_num = engine.get_unit_num(Side.PLAYER)
+                player.act(engine)
+                if engine.get_unit_num(Side.PLAYER) > unit_num:
+                    spawn_frames.append(frame)
+                engine.update()
+            return spawn_frames
+
+        # 待たなければ資金が貯まるたびに出撃する
+        interval = Force.SPAWN_COST[UnitType.LOWER] * Force.FUND_INTERVAL
+        no_wait = get_spawn_frames(0, 0)
+        self.assertEqual(
+            [b - a for a, b in zip(no_wait, no_wait[1:])],
+            [interval] * (len(no_wait) - 1),
+        )
+        self.assertEqual(no_wait, get_spawn_frames(0, 1))
+        wait = get_spawn_frames(200, 0)
+        self.assertEqual(wait, get_spawn_frames(200, 0))
+        self.assertNotEqual(wait, no_wait)
+        self.assertNotEqual(wait, get_spawn_frames(200, 1))
+
+
+class TestMatchRunner(unittest.TestCase):
+    def test_run(self):
+        """決着した試合は勝者・フレーム数・残り拠点 HP を返し、同じシードなら同じ結果になる"""
+        policy = SpawnPolicy("upper", [UnitType.UPPER])
+        runner = MatchRunner(policy, EnemyStrategy.UPPER_ONLY)
+        result = runner.run(0)
+        self.assertEqual(result, runner.run(0))
+        self.assertEqual(Side.PLAYER.name, result["winner"])
+        self.assertLess(result["frames"], MatchRunner.MAX_FRAMES)
+        self.assertEqual(0.0, result["enemy_base_hp"])
+        self.assertGreater(result["player_base_hp"], 0.0)
+
+    def test_draw(self):
+        """max_frames までに決着しなければ引き分け"""
+        policy = SpawnPolicy("lower", [UnitType.LOWER])
+        result = MatchRunner(policy, EnemyStrategy.LOWER_ONLY, max_frames=100).run(0)
+        self.assertIsNone(result["winner"])
+        self.assertEqual(100, result["frames"])
+        self.assertEqual(1.0, result["player_base_hp"])
+
+
+class TestTournament(unittest.TestCase):
+    def test_aggregate(self):
+        results = [
+            {
+                "winner": "PLAYER",
+                "frames": 100,
+                "player_base_hp": 1.0,
+                "enemy_base_hp": 0.0,
+            },
+            {
+                "winner": "ENEMY",
+                "frames": 200,
+                "player_base_hp": 0.0,
+                "enemy_base_hp": 0.5,
+            },
+            {
+                "winner": None,
+                "frames": 300,
+                "player_base_hp": 0.5,
+                "enemy_base_hp": 1.0,
+            },
+            {
+                "winner": "PLAYER",
+                "frames": 400,
+                "player_base_hp": 0.5,
+                "enemy_base_hp": 0.0,
+            },
+        ]
+        summary = aggregate(results)
+        self.assertEqual(4, summary["matches"])
+        self.assertEqual(0.5, summary["win_rate"])
+        self.assertEqual(0.25, summary["loss_rate"])
+        self.assertEqual(0.25, summary["draw_rate"])
+        self.assertEqual(250, summary["frames_mean"])
+        self.assertEqual(0.5, summary["player_base_hp_mean"])
+        self.assertEqual(0.375, summary["enemy_base_hp_mean"])
+
+    def test_run_tournament(self):
+        """方針 × 戦略の行列を返し、プロセス数によらず同じ結果になる"""
+        policies = [
+            SpawnPolicy("lower", [UnitType.LOWER], reaction_frames=10),
+            SpawnPolicy("upper", [UnitType.UPPER], reaction_frames=10),
+        ]
+        strategies = [EnemyStrategy.LOWER_ONLY, EnemyStrategy.CYCLE]
+        matrix = run_tournament(
+            policies, strategies, match_num=3, processes=1, max_frames=300
+        )
+        self.assertEqual(["lower", "upper"], list(matrix))
+        for strategy_map in matrix.values():
+            self.assertEqual(["LOWER_ONLY", "CYCLE"], list(strategy_map))
+            for summary in strategy_map.values():
+                self.assertEqual(3, summary["matches"])
+        self.assertEqual(
+            matrix,
+            run_tournament(
+                policies, strategies, match_num=3, processes=2, max_frames=300
+            ),
+        )
+        report = format_report(matrix)
+        for name in ["lower", "upper", "LOWER_ONLY", "CYCLE"]:
+            self.assertIn(name, report)
+
+    def test_format_report(self):
+        """セルに勝率・敗率・引き分け率・平均フレーム数・残り拠点 HP を並べる"""
+        summary = {
+            "matches": 4,
+            "win_rate": 0.5,
+            "loss_rate": 0.25,
+            "draw_rate": 0.25,
+            "frames_mean": 250,
+            "player_base_hp_mean": 0.5,
+            "enemy_base_hp_mean": 0.375,
+        }
+        lines = format_report({"lower": {"CYCLE": summary}}).splitlines()
+        self.assertEqual(
+            "win rate / loss rate / draw rate / mean frames"
+            " / player base hp / enemy base hp",
+            lines[0],
+        )
+        self.assertEqual(
+            ["lower", "0.50/0.25/0.25/250/0.50/0.38"],
+            [cell.strip() for cell in lines[3].split("|")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()